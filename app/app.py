@@ -1,10 +1,37 @@
 # app/app.py (Definitive Final Version)
 import streamlit as st
-import sys, os, tempfile
+import sys, os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from src.pipeline import run_text_verification_pipeline, run_image_verification_pipeline
+from src.pipeline import (
+    iter_text_verification_pipeline,
+    iter_image_verification_pipeline,
+    EVENT_CLAIMS_EXTRACTED,
+    EVENT_CLAIMS_SKIPPED,
+    EVENT_CLAIM_VERDICT,
+    EVENT_CAPTION_READY,
+    EVENT_OCR_READY,
+    EVENT_AUTHENTICITY_READY,
+    EVENT_REVERSE_SEARCH_READY,
+    EVENT_FINAL_VERDICT,
+)
+from src.utils.model_registry import preload_models
+from src.utils.logging import start_metrics_server
 
 st.set_page_config(page_title="Fact-Checker AI", page_icon="🔎", layout="wide")
+
+@st.cache_resource
+def _preload_models() -> dict:
+    # Runs once per process; which models are loaded is controlled by MODEL_PRELOAD_ROLE.
+    return preload_models()
+
+@st.cache_resource
+def _start_metrics_server():
+    # Exposes /metrics when METRICS_PORT is set; Streamlit reruns must not bind the port twice.
+    return start_metrics_server()
+
+_preload_models()
+_start_metrics_server()
+
 st.title("🔎 Multimodal Fact-Checker Engine")
 st.write("This tool leverages a sophisticated pipeline of AI models to verify factual claims. Select a verification mode below to begin.")
 text_tab, image_tab = st.tabs(["📝 Text-based Fact-Checker", "🖼️ Image-based Fact-Checker"])
@@ -17,20 +44,45 @@ with text_tab:
         submitted_text = st.form_submit_button("Verify Text")
     if submitted_text:
         if text_input:
-            with st.spinner("Analyzing text..."):
-                text_report = run_text_verification_pipeline(text_input)
+            # Results are rendered as they stream in, so the first verdicts show up
+            # while the remaining claims are still being checked.
             st.subheader("Text Verification Report")
-            if not text_report:
-                st.warning("No factual claims were found.")
-            else:
-                for result in text_report:
-                    st.markdown(f"#### Claim: \"{result.get('claim', 'N/A')}\"")
-                    verdict = result.get("verdict", "UNCERTAIN")
-                    if verdict == "REFUTED": st.error(f"**Verdict: {verdict}**")
-                    elif verdict == "SUPPORTED": st.success(f"**Verdict: {verdict}**")
-                    else: st.warning(f"**Verdict: {verdict}**")
-                    st.info(f"**Explanation:** {result.get('explanation')}")
-                    st.divider()
+            status = st.empty()
+            status.info("Extracting claims...")
+            claim_slots = []
+            for event in iter_text_verification_pipeline(text_input):
+                if event["event"] == EVENT_CLAIMS_EXTRACTED:
+                    if event.get("error"):
+                        status.error(event["error"])
+                        continue
+                    if not event["claims"]:
+                        status.warning("No factual claims were found.")
+                        continue
+                    status.info(f"Found {len(event['claims'])} claims. Verifying...")
+                    claim_slots = [st.empty() for _ in event["claims"]]
+                    for slot, claim in zip(claim_slots, event["claims"]):
+                        with slot.container():
+                            st.markdown(f"#### Claim: \"{claim}\"")
+                            st.caption("Verifying...")
+                elif event["event"] == EVENT_CLAIMS_SKIPPED:
+                    for skipped in event["skipped"]:
+                        result = skipped["result"]
+                        with claim_slots[skipped["index"]].container():
+                            st.markdown(f"#### Claim: \"{result.get('claim', 'N/A')}\"")
+                            st.caption(f"**Skipped:** {result.get('explanation')}")
+                            st.divider()
+                elif event["event"] == EVENT_CLAIM_VERDICT:
+                    result = event["result"]
+                    with claim_slots[event["index"]].container():
+                        st.markdown(f"#### Claim: \"{result.get('claim', 'N/A')}\"")
+                        verdict = result.get("verdict", "UNCERTAIN")
+                        if verdict in ("REFUTED", "ERROR"): st.error(f"**Verdict: {verdict}**")
+                        elif verdict == "SUPPORTED": st.success(f"**Verdict: {verdict}**")
+                        else: st.warning(f"**Verdict: {verdict}**")
+                        st.info(f"**Explanation:** {result.get('explanation')}")
+                        st.divider()
+            if claim_slots:
+                status.empty()
         else:
             st.error("Please enter some text to verify.")
 
@@ -44,51 +96,61 @@ with image_tab:
     
     if submitted_image:
         if image_file and user_query:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(image_file.name)[1]) as tmp_file:
-                tmp_file.write(image_file.getbuffer())
-                image_path = tmp_file.name
-            with st.spinner("Performing deep analysis... This is the final version."):
-                image_report = run_image_verification_pipeline(image_path, user_query)
-            os.unlink(image_path)
-
             st.subheader("Image Verification Report")
-            final_verdict_data = image_report.get("final_verdict", {})
-            st.markdown(f"#### Your Question: \"{image_report.get('user_query')}\"")
-
-            verdict_map = {"SUPPORTED": st.success, "REFUTED": st.error, "MISLEADING": st.error, "UNCERTAIN": st.warning, "ERROR": st.error}
-            overall_verdict = final_verdict_data.get("final_verdict", "UNCERTAIN").upper()
-            display_function = verdict_map.get(overall_verdict, st.warning)
-            display_function(f"**Overall Conclusion: {overall_verdict}**")
-
-            # --- ✅ Polished side-by-side display ---
-            col1, col2 = st.columns(2)
-            with col1:
-                st.metric(label="Event Truthfulness", value=final_verdict_data.get("event_truthfulness", "N/A"))
-            with col2:
-                st.metric(label="Image Context", value=final_verdict_data.get("image_context", "N/A"))
-            
-            st.info(f"**Analyst's Explanation:**\n\n{final_verdict_data.get('explanation')}")
+            st.markdown(f"#### Your Question: \"{user_query}\"")
+            verdict_slot = st.empty()
+            verdict_slot.info("Analyzing the image... partial results appear below as each check completes.")
+            metrics_slot = st.empty()
+            explanation_slot = st.empty()
             st.divider()
 
             col1, col2 = st.columns(2)
             with col1:
                 st.markdown("#### Raw Image Analysis")
-                analysis = image_report.get("image_analysis", {})
-                auth = analysis.get('authenticity', {})
-                st.write(f"**Caption:** *{analysis.get('caption')}*")
-                st.write(f"**Text in image (OCR):** *\"{analysis.get('ocr_text') if analysis.get('ocr_text') else 'None'}\"*")
-                st.write(f"**Authenticity Check:** {auth.get('verdict')} (Confidence: {auth.get('confidence')})")
+                caption_slot, ocr_slot, auth_slot = st.empty(), st.empty(), st.empty()
+                caption_slot.write("**Caption:** *generating...*")
+                ocr_slot.write("**Text in image (OCR):** *reading...*")
+                auth_slot.write("**Authenticity Check:** *analyzing...*")
             with col2:
                 st.markdown("#### Raw Online History")
-                history = image_report.get("online_history", {})
-                sources = history.get("source_results", [])
-                if isinstance(sources, list) and len(sources) > 0:
-                    for source in sources[:5]:
-                        title = source.get("title")
-                        link = source.get("link")
-                        if title and link: st.markdown(f"- [{title}]({link})")
-                        elif title: st.write(f"- {title}")
-                else:
-                    st.write("No online history found.")
+                history_slot = st.empty()
+                history_slot.write("*Searching for this image online...*")
+
+            # The uploaded bytes are passed straight through; the pipeline decodes them once in memory.
+            for event in iter_image_verification_pipeline(image_file.getvalue(), user_query):
+                if event["event"] == EVENT_CAPTION_READY:
+                    caption_slot.write(f"**Caption:** *{event['caption']}*")
+                elif event["event"] == EVENT_OCR_READY:
+                    ocr_slot.write(f"**Text in image (OCR):** *\"{event['ocr_text'] if event['ocr_text'] else 'None'}\"*")
+                elif event["event"] == EVENT_AUTHENTICITY_READY:
+                    auth = event["authenticity"]
+                    auth_slot.write(f"**Authenticity Check:** {auth.get('verdict')} (Confidence: {auth.get('confidence')})")
+                elif event["event"] == EVENT_REVERSE_SEARCH_READY:
+                    sources = event["online_history"].get("source_results", [])
+                    with history_slot.container():
+                        if isinstance(sources, list) and len(sources) > 0:
+                            for source in sources[:5]:
+                                title = source.get("title")
+                                link = source.get("link")
+                                if title and link: st.markdown(f"- [{title}]({link})")
+                                elif title: st.write(f"- {title}")
+                        else:
+                            st.write("No online history found.")
+                elif event["event"] == EVENT_FINAL_VERDICT:
+                    final_verdict_data = event["report"].get("final_verdict", {})
+                    verdict_map = {"SUPPORTED": st.success, "REFUTED": st.error, "MISLEADING": st.error, "UNCERTAIN": st.warning, "ERROR": st.error}
+                    overall_verdict = final_verdict_data.get("final_verdict", "UNCERTAIN").upper()
+                    with verdict_slot.container():
+                        display_function = verdict_map.get(overall_verdict, st.warning)
+                        display_function(f"**Overall Conclusion: {overall_verdict}**")
+
+                    # --- ✅ Polished side-by-side display ---
+                    with metrics_slot.container():
+                        m1, m2 = st.columns(2)
+                        with m1:
+                            st.metric(label="Event Truthfulness", value=final_verdict_data.get("event_truthfulness", "N/A"))
+                        with m2:
+                            st.metric(label="Image Context", value=final_verdict_data.get("image_context", "N/A"))
+                    explanation_slot.info(f"**Analyst's Explanation:**\n\n{final_verdict_data.get('explanation')}")
         else:
             st.error("Please upload an image and provide a question to verify.")
\ No newline at end of file
@@ -0,0 +1,252 @@
+# scripts/benchmark_models.py
+"""
+Offline microbenchmark for the CPU model stages.
+
+Runs captioning, OCR, authenticity detection, NLI stance classification and OCR text cleaning
+against the images in data/ and synthetic claim/snippet sets, then reports latency percentiles,
+throughput, RSS and model load times. Results are written as JSON and can be compared against a
+saved baseline; the script exits with status 1 if any stage regressed beyond the tolerance.
+
+No external API is called. The Hugging Face models must already be in the local cache,
+since the hub is forced into offline mode.
+
+Usage:
+    python scripts/benchmark_models.py
+    python scripts/benchmark_models.py --stages nli clean_ocr_text --sizes 4 16 64 --batch-sizes 8 32
+    python scripts/benchmark_models.py --baseline benchmarks/baseline.json
+    python scripts/benchmark_models.py --save-baseline benchmarks/baseline.json
+    INFERENCE_BACKEND=onnx python scripts/benchmark_models.py --stages nli authenticity --baseline benchmarks/baseline.json
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import resource
+import sys
+import time
+from datetime import datetime, timezone
+
+# Must be set before transformers is imported by the model loaders.
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from src.utils.config import INFERENCE_BACKEND
+from src.utils.model_registry import get_model, model_status
+from src.utils.logging import memory_snapshot
+from src.vision.image_input import LoadedImage
+from src.vision.preprocessing import clean_ocr_text
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data'))
+ALL_STAGES = ["caption", "ocr", "authenticity", "nli", "clean_ocr_text"]
+# Registry model each stage needs; the load time is measured separately from the first call.
+STAGE_MODELS = {"caption": "captioner", "ocr": "ocr_reader", "authenticity": "authenticity_detector", "nli": "nli"}
+
+SUBJECTS = ["The Eiffel Tower", "The Amazon river", "Mount Everest", "The Great Wall of China", "Albert Einstein"]
+FACTS = ["is located in Paris", "flows through Brazil", "is the tallest mountain on Earth",
+         "is visible from space", "won the Nobel Prize in Physics in 1921"]
+NOISY_OCR_LINE = "BREAKING!!  N3WS• | @user_123 ~~ Share if you agree >>> www.example.com/post?id=42 © 2024 "
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (2**20 if sys.platform == "darwin" else 2**10), 1)
+
+
+def synthetic_claims(count: int) -> list[str]:
+    return [f"{SUBJECTS[i % len(SUBJECTS)]} {FACTS[(i * 3) % len(FACTS)]}." for i in range(count)]
+
+
+def synthetic_snippets(count: int) -> list[str]:
+    return [
+        f"According to several sources, {SUBJECTS[i % len(SUBJECTS)].lower()} {FACTS[i % len(FACTS)]}, "
+        f"a fact reported in article number {i} of the archive." for i in range(count)
+    ]
+
+
+def measure(fn, items_per_call: int, repeats: int, warmup: int) -> dict:
+    """
+    Calls fn repeatedly and summarizes the per-call latency.
+    """
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    timings_ms = np.array(timings) * 1000
+    total_seconds = float(np.sum(timings))
+    return {
+        "calls": repeats,
+        "items_per_call": items_per_call,
+        "mean_ms": round(float(timings_ms.mean()), 3),
+        "p50_ms": round(float(np.percentile(timings_ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(timings_ms, 95)), 3),
+        "p99_ms": round(float(np.percentile(timings_ms, 99)), 3),
+        "throughput_items_per_s": round(items_per_call * repeats / total_seconds, 3) if total_seconds else None,
+        "rss_mb": memory_snapshot()["rss_mb"],
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _image_cases(images, batch_sizes, single_fn, batch_fn):
+    """Yields (variant, items_per_call, fn) for per-image calls and for each batch size."""
+    for image in images:
+        yield f"single:{image.name}", 1, lambda image=image: single_fn(image)
+    if batch_fn is not None:
+        for batch_size in batch_sizes:
+            yield f"batch:{len(images)}x{batch_size}", len(images), lambda b=batch_size: batch_fn(images, batch_size=b)
+
+
+def stage_cases(stage: str, images: list, sizes: list[int], batch_sizes: list[int]):
+    """
+    Yields (variant, items_per_call, fn) for every benchmark case of a stage.
+    """
+    if stage == "caption":
+        from src.vision.captioning import generate_image_caption, generate_image_captions
+        yield from _image_cases(images, batch_sizes, generate_image_caption, generate_image_captions)
+    elif stage == "ocr":
+        from src.vision.ocr import extract_text_from_image
+        yield from _image_cases(images, batch_sizes, extract_text_from_image, None)
+    elif stage == "authenticity":
+        from src.vision.manipulation_detector import classify_image_authenticity, classify_images_authenticity
+        yield from _image_cases(images, batch_sizes, classify_image_authenticity, classify_images_authenticity)
+    elif stage == "nli":
+        from src.text.ml_verifier import classify_evidence_stance, classify_stance_pairs
+        claim = synthetic_claims(1)[0]
+        for size in sizes:
+            snippets = synthetic_snippets(size)
+            yield f"claim:{size}_snippets", size, lambda s=snippets: classify_evidence_stance(claim, s)
+            pairs = list(zip(synthetic_claims(size), snippets))
+            for batch_size in batch_sizes:
+                yield f"pairs:{size}x{batch_size}", size, lambda p=pairs, b=batch_size: classify_stance_pairs(p, batch_size=b)
+    elif stage == "clean_ocr_text":
+        for size in sizes:
+            text = NOISY_OCR_LINE * size
+            yield f"lines:{size}", size, lambda t=text: clean_ocr_text(t)
+
+
+def get_model_for_stage(stage: str):
+    # Importing the stage module registers its model; get_model then times the load once.
+    stage_modules = {
+        "caption": "src.vision.captioning",
+        "ocr": "src.vision.ocr",
+        "authenticity": "src.vision.manipulation_detector",
+        "nli": "src.text.ml_verifier",
+    }
+    __import__(stage_modules[stage])
+    return get_model(STAGE_MODELS[stage])
+
+
+def run_benchmarks(stages, sizes, batch_sizes, repeats, warmup) -> dict:
+    image_paths = sorted(glob.glob(os.path.join(DATA_DIR, "*.png")) + glob.glob(os.path.join(DATA_DIR, "*.jpg")))
+    images = []
+    for path in image_paths:
+        with open(path, "rb") as f:
+            images.append(LoadedImage(f.read(), name=os.path.basename(path)))
+
+    results, skipped = [], {}
+    for stage in stages:
+        model_name = STAGE_MODELS.get(stage)
+        if model_name and get_model_for_stage(stage) is None:
+            skipped[stage] = f"model '{model_name}' could not be loaded: {model_status()[model_name]['error']}"
+            print(f"Skipping {stage}: {skipped[stage]}")
+            continue
+        for variant, items_per_call, fn in stage_cases(stage, images, sizes, batch_sizes):
+            print(f"Benchmarking {stage} [{variant}]...")
+            results.append({"stage": stage, "variant": variant, **measure(fn, items_per_call, repeats, warmup)})
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "inference_backend": INFERENCE_BACKEND,
+            "repeats": repeats,
+            "warmup": warmup,
+        },
+        "model_load_seconds": {
+            name: status["load_seconds"] for name, status in model_status().items() if status["loaded"]
+        },
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def compare_to_baseline(report: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Returns a description of every case that is slower (p50/p95) or has lower throughput
+    than the baseline by more than `tolerance` (a fraction, e.g. 0.2 for 20%).
+    """
+    baseline_cases = {(r["stage"], r["variant"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for result in report["results"]:
+        previous = baseline_cases.get((result["stage"], result["variant"]))
+        if previous is None:
+            continue
+        case = f"{result['stage']} [{result['variant']}]"
+        for metric in ("p50_ms", "p95_ms"):
+            if previous[metric] and result[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(f"{case}: {metric} {previous[metric]} -> {result[metric]}")
+        before, after = previous.get("throughput_items_per_s"), result.get("throughput_items_per_s")
+        if before and after is not None and after < before * (1 - tolerance):
+            regressions.append(f"{case}: throughput {before} -> {after} items/s")
+    for name, seconds in report["model_load_seconds"].items():
+        before = baseline.get("model_load_seconds", {}).get(name)
+        if before and seconds > before * (1 + tolerance):
+            regressions.append(f"model load {name}: {before}s -> {seconds}s")
+    return regressions
+
+
+def print_table(report: dict) -> None:
+    print(f"\n{'stage':<16}{'variant':<34}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'items/s':>12}{'peak MB':>10}")
+    for r in report["results"]:
+        print(f"{r['stage']:<16}{r['variant']:<34}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}"
+              f"{r['throughput_items_per_s'] or 0:>12.1f}{r['peak_rss_mb']:>10.1f}")
+    for name, seconds in report["model_load_seconds"].items():
+        print(f"Model '{name}' loaded in {seconds}s")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline microbenchmark for the CPU model stages.")
+    parser.add_argument("--stages", nargs="+", choices=ALL_STAGES, default=ALL_STAGES)
+    parser.add_argument("--sizes", nargs="+", type=int, default=[4, 16, 64],
+                        help="Synthetic set sizes: snippets per claim for NLI, lines for clean_ocr_text.")
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 8, 32])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before flagging, e.g. 0.2 = 20%%.")
+    parser.add_argument("--save-baseline", help="Also write the results to this baseline path.")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.stages, args.sizes, args.batch_sizes, args.repeats, args.warmup)
+    print_table(report)
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {path}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare_to_baseline(report, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            return 1
+        print(f"\nNo regressions against {args.baseline} (tolerance {args.tolerance:.0%}).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
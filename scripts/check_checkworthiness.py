@@ -0,0 +1,83 @@
+# scripts/check_checkworthiness.py
+"""
+Regression check of the check-worthiness scorer on labeled claim sets.
+
+Scores every claim with score_claims (the built-in linear model, or CHECKWORTHINESS_MODEL when
+one is configured) and reports accuracy, how many check-worthy claims would be skipped and how
+much chatter would be filtered out at the threshold. Two sets are scored:
+data/checkworthiness_claims.json, which the linear model's weights are tuned on, and
+data/checkworthiness_heldout.json, which they are not, so its numbers estimate how the scorer
+does on new claims. Both sets include short, well-known false claims ("Vaccines cause autism")
+that must never be skipped.
+
+Exits with status 1 if a check-worthy claim would be skipped: in either set for a transformer
+model, in the tuning set for the linear model. The linear model only ranks claims in the
+pipeline and never skips any, so its held-out misses are reported but don't fail the check.
+
+Usage:
+    python scripts/check_checkworthiness.py
+    python scripts/check_checkworthiness.py --threshold 0.6 --claims my_claims.json
+"""
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.utils.config import CHECKWORTHINESS_THRESHOLD
+from src.text.checkworthiness import score_claims
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data'))
+CLAIM_SET_PATH = os.path.join(DATA_DIR, "checkworthiness_claims.json")
+HELDOUT_SET_PATH = os.path.join(DATA_DIR, "checkworthiness_heldout.json")
+
+
+def check_claim_set(name: str, path: str, threshold: float) -> tuple[int, bool]:
+    """
+    Scores one labeled claim set and prints the results.
+
+    Returns:
+        (number of check-worthy claims that would be skipped, whether the transformer model scored them).
+    """
+    with open(path, encoding="utf-8") as f:
+        items = json.load(f)
+    scores, from_model = score_claims([item["claim"] for item in items])
+
+    worthy = [(item, score) for item, score in zip(items, scores) if item["checkworthy"]]
+    chatter = [(item, score) for item, score in zip(items, scores) if not item["checkworthy"]]
+    skipped = [(item, score) for item, score in worthy if score < threshold]
+    filtered = [(item, score) for item, score in chatter if score < threshold]
+    correct = len(worthy) - len(skipped) + len(filtered)
+
+    scorer = "model" if from_model else "linear model"
+    print(f"{name} ({scorer}): {len(items)} claims, threshold {threshold}: accuracy {correct / len(items):.1%}, "
+          f"{len(skipped)} of {len(worthy)} check-worthy claims skipped, "
+          f"{len(filtered)} of {len(chatter)} other claims filtered out.")
+    for item, score in chatter:
+        if score >= threshold:
+            print(f"  would verify ({score:.2f}): {item['claim']}")
+    for item, score in skipped:
+        print(f"  would skip ({score:.2f}): {item['claim']}")
+    return len(skipped), from_model
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check that no check-worthy claim would be skipped.")
+    parser.add_argument("--claims", default=CLAIM_SET_PATH, help="JSON list of {\"claim\", \"checkworthy\"} items.")
+    parser.add_argument("--heldout", default=HELDOUT_SET_PATH, help="Claim set the weights were not tuned on.")
+    parser.add_argument("--threshold", type=float, default=CHECKWORTHINESS_THRESHOLD)
+    args = parser.parse_args()
+
+    tuning_skipped, from_model = check_claim_set("Tuning set", args.claims, args.threshold)
+    heldout_skipped, _ = check_claim_set("Held-out set", args.heldout, args.threshold)
+
+    failed = tuning_skipped + (heldout_skipped if from_model else 0)
+    if failed:
+        print(f"\n{failed} check-worthy claim(s) would be skipped.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
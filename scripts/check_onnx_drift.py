@@ -0,0 +1,158 @@
+# scripts/check_onnx_drift.py
+"""
+Accuracy-drift check of the ONNX Runtime backend against the PyTorch models.
+
+Builds the NLI and authenticity pipelines on both backends, runs the claim set in
+data/nli_claim_set.json and the images in data/ through each, and compares labels and scores.
+Reports label agreement, the largest and mean probability difference, the authenticity verdicts
+that flip, accuracy against the claim set's expected stances, and per-backend latency.
+Exits with status 1 if agreement or score drift is outside the thresholds.
+
+Needs optimum[onnxruntime]; the ONNX models are exported and quantized on first run.
+
+Usage:
+    python scripts/check_onnx_drift.py
+    python scripts/check_onnx_drift.py --models nli --max-delta 0.02
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from src.utils.config import NLI_MODEL, ONNX_QUANTIZE
+from src.utils.inference_backend import load_pipeline
+from src.text.ml_verifier import run_stance_model
+from src.vision.image_input import load_image
+from src.vision.manipulation_detector import MODEL_NAME as DETECTOR_MODEL, _interpret_scores
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data'))
+CLAIM_SET_PATH = os.path.join(DATA_DIR, "nli_claim_set.json")
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, round((time.perf_counter() - start) * 1000, 1)
+
+
+def _compare(reference: list[dict], candidate: list[dict]) -> dict:
+    """
+    Agreement and probability drift between two lists of {"label", "scores"} outputs.
+    """
+    deltas = [
+        abs(ref["scores"][label] - cand["scores"].get(label, 0.0))
+        for ref, cand in zip(reference, candidate) for label in ref["scores"]
+    ]
+    agreeing = sum(ref["label"] == cand["label"] for ref, cand in zip(reference, candidate))
+    return {
+        "items": len(reference),
+        "label_agreement": round(agreeing / len(reference), 4) if reference else None,
+        "max_score_delta": round(max(deltas), 4) if deltas else 0.0,
+        "mean_score_delta": round(float(np.mean(deltas)), 4) if deltas else 0.0,
+        "disagreements": [i for i, (ref, cand) in enumerate(zip(reference, candidate)) if ref["label"] != cand["label"]],
+    }
+
+
+def check_nli(backends: dict) -> dict:
+    with open(CLAIM_SET_PATH, encoding="utf-8") as f:
+        claim_set = json.load(f)
+    pairs = [(item["claim"], item["evidence"]) for item in claim_set]
+
+    outputs, report = {}, {"latency_ms": {}, "accuracy": {}}
+    for backend, nli_pipeline in backends.items():
+        # Warm up before timing, so the first session run doesn't count.
+        run_stance_model(nli_pipeline, pairs[:2])
+        results, report["latency_ms"][backend] = _timed(lambda: run_stance_model(nli_pipeline, pairs))
+        outputs[backend] = [{"label": r["stance"], "scores": r["probabilities"]} for r in results]
+        correct = sum(r["stance"] == item["expected"] for r, item in zip(results, claim_set))
+        report["accuracy"][backend] = round(correct / len(claim_set), 4)
+
+    report.update(_compare(outputs["pytorch"], outputs["onnx"]))
+    return report
+
+
+def check_authenticity(backends: dict) -> dict:
+    paths = sorted(glob.glob(os.path.join(DATA_DIR, "*.png")) + glob.glob(os.path.join(DATA_DIR, "*.jpg")))
+    images = []
+    for path in paths:
+        with open(path, "rb") as f:
+            images.append(load_image(f.read()).detector_image)
+
+    outputs, verdicts, report = {}, {}, {"latency_ms": {}}
+    for backend, detector in backends.items():
+        detector(images[:1])
+        results, report["latency_ms"][backend] = _timed(lambda: [detector(image) for image in images])
+        outputs[backend] = [
+            {"label": max(r, key=lambda item: item["score"])["label"], "scores": {item["label"]: item["score"] for item in r}}
+            for r in results
+        ]
+        verdicts[backend] = [_interpret_scores(r)["verdict"] for r in results]
+
+    report.update(_compare(outputs["pytorch"], outputs["onnx"]))
+    report["verdict_flips"] = [
+        {"image": os.path.basename(path), "pytorch": before, "onnx": after}
+        for path, before, after in zip(paths, verdicts["pytorch"], verdicts["onnx"]) if before != after
+    ]
+    return report
+
+
+CHECKS = {
+    "nli": ("text-classification", NLI_MODEL, check_nli),
+    "authenticity": ("image-classification", DETECTOR_MODEL, check_authenticity),
+}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare the ONNX Runtime backend against the PyTorch models.")
+    parser.add_argument("--models", nargs="+", choices=list(CHECKS), default=list(CHECKS))
+    # Any flipped label changes a verdict, so by default every label must agree.
+    parser.add_argument("--min-agreement", type=float, default=1.0, help="Minimum share of identical top labels.")
+    parser.add_argument("--max-delta", type=float, default=0.05, help="Maximum absolute difference of any label score.")
+    parser.add_argument("--output", help="Write the report as JSON to this path.")
+    args = parser.parse_args()
+
+    report, failures = {"quantized": ONNX_QUANTIZE, "models": {}}, []
+    for name in args.models:
+        task, model_id, check = CHECKS[name]
+        print(f"Loading '{model_id}' on both backends...")
+        backends = {backend: load_pipeline(task, model_id, backend=backend, fallback=False) for backend in ("pytorch", "onnx")}
+        result = report["models"][name] = check(backends)
+        del backends
+
+        latency = result["latency_ms"]
+        speedup = latency["pytorch"] / latency["onnx"] if latency["onnx"] else float("nan")
+        print(f"{name}: agreement {result['label_agreement']:.1%} over {result['items']} items, "
+              f"max delta {result['max_score_delta']}, mean delta {result['mean_score_delta']}, "
+              f"latency {latency['pytorch']} ms -> {latency['onnx']} ms ({speedup:.2f}x)")
+        if "accuracy" in result:
+            print(f"  accuracy on the claim set: {result['accuracy']}")
+        for flip in result.get("verdict_flips", []):
+            print(f"  verdict flip on {flip['image']}: {flip['pytorch']} -> {flip['onnx']}")
+
+        if result["label_agreement"] is not None and result["label_agreement"] < args.min_agreement:
+            failures.append(f"{name}: label agreement {result['label_agreement']} < {args.min_agreement}")
+        if result["max_score_delta"] > args.max_delta:
+            failures.append(f"{name}: max score delta {result['max_score_delta']} > {args.max_delta}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+    if failures:
+        print(f"\n{len(failures)} drift check(s) failed:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    print("\nONNX backend is within the drift thresholds.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+# scripts/load_test.py
+"""
+End-to-end load test of the text and image pipelines against local API stand-ins.
+
+Starts the Groq, SerpAPI and imgbb stand-ins from stand_in_servers.py, points the pipelines at
+them, then drives N concurrent simulated users through run_text_verification_pipeline and
+run_image_verification_pipeline. Each concurrency level runs for a fixed duration and reports
+throughput, p50/p95/p99 latency and error rates, plus what the stand-ins and the API clients saw
+(429s, 500s, retries). Running several levels shows where throughput stops scaling.
+
+The persistent caches are disabled by default, so every request does the full work.
+The local models (NLI, captioning, OCR, authenticity detection) still run for real.
+
+Usage:
+    python scripts/load_test.py --users 1 4 16 --duration 60 --workload text
+    python scripts/load_test.py --users 8 --workload mixed --groq-rate-limit 30 --serpapi-error-rate 0.05
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from stand_in_servers import start_stand_ins, stand_in_environment, add_profile_arguments, profiles_from_arguments
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data'))
+
+TEXT_SAMPLES = [
+    "The Eiffel Tower is located in Berlin. It was completed in 1889 for the World's Fair.",
+    "Water boils at 100 degrees Celsius at sea level. The Great Wall of China is visible from the Moon.",
+    "Albert Einstein won the Nobel Prize in Physics in 1921. He was born in Ulm, Germany.",
+    "The Amazon is the longest river in the world. It flows through Brazil, Peru and Colombia.",
+]
+IMAGE_QUERIES = [
+    "Is this photo real?",
+    "Was this picture taken at the event described in the post?",
+    "Is this image AI-generated?",
+]
+
+
+def _nli_available() -> bool:
+    """Whether stance classification is working; without it verdicts come back with no evidence stances."""
+    from src.serving import inference_client
+    from src.utils.model_registry import model_status
+    if inference_client.enabled():
+        # The NLI model lives in the inference server; its failures show up as request errors there.
+        return True
+    return bool(model_status().get("nli", {}).get("loaded"))
+
+
+def _text_status(results: list[dict]) -> str:
+    if not results:
+        return "error"
+    if any(r["verdict"] == "ERROR" for r in results):
+        return "error"
+    if any("failed" in r.get("explanation", "") for r in results):
+        return "degraded"
+    if not _nli_available():
+        return "degraded"
+    return "ok"
+
+
+def _image_status(report: dict) -> str:
+    from src.vision.analysis_cache import is_error_text
+    if report.get("final_verdict", {}).get("final_verdict") == "ERROR":
+        return "error"
+    if isinstance(report.get("online_history"), dict) and "error" in report["online_history"]:
+        return "degraded"
+    # The vision modules report a missing model or a failed stage in place of their result.
+    analysis = report.get("image_analysis", {})
+    if "error" in analysis.get("authenticity", {}):
+        return "degraded"
+    if is_error_text(analysis.get("caption")) or is_error_text(analysis.get("ocr_text")):
+        return "degraded"
+    return "ok"
+
+
+def simulated_user(deadline: float, workload: str, image_share: float, images: list, think_time: float, records: list):
+    """
+    Issues requests back to back (plus think time) until the deadline and records each one.
+    """
+    from src.pipeline import run_text_verification_pipeline, run_image_verification_pipeline
+
+    while time.monotonic() < deadline:
+        kind = workload
+        if workload == "mixed":
+            kind = "image" if random.random() < image_share else "text"
+        start = time.perf_counter()
+        try:
+            if kind == "text":
+                status = _text_status(run_text_verification_pipeline(random.choice(TEXT_SAMPLES)))
+            else:
+                status = _image_status(run_image_verification_pipeline(random.choice(images), random.choice(IMAGE_QUERIES)))
+        except Exception as e:
+            status = "error"
+            print(f"[LoadTest] {kind} request raised: {e}")
+        records.append({"kind": kind, "latency": time.perf_counter() - start, "status": status})
+        if think_time:
+            time.sleep(random.expovariate(1 / think_time))
+
+
+def summarize(records: list[dict], elapsed: float) -> dict:
+    """
+    Throughput, latency percentiles and status rates for a list of request records.
+    """
+    if not records:
+        return {"requests": 0}
+    latencies = np.array([r["latency"] for r in records]) * 1000
+    statuses = [r["status"] for r in records]
+    return {
+        "requests": len(records),
+        "throughput_rps": round(len(records) / elapsed, 3),
+        "p50_ms": round(float(np.percentile(latencies, 50)), 1),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 1),
+        "p99_ms": round(float(np.percentile(latencies, 99)), 1),
+        "max_ms": round(float(latencies.max()), 1),
+        "error_rate": round(statuses.count("error") / len(records), 4),
+        "degraded_rate": round(statuses.count("degraded") / len(records), 4),
+    }
+
+
+def client_call_stats(snapshot: dict) -> dict:
+    """
+    Groups the external_calls_total and external_retries_total counters by service.
+    """
+    stats = {}
+    for counter in snapshot["counters"]:
+        service = counter["labels"].get("service")
+        if counter["name"] == "external_calls_total":
+            stats.setdefault(service, {})[counter["labels"]["outcome"]] = counter["value"]
+        elif counter["name"] == "external_retries_total":
+            stats.setdefault(service, {})["retries"] = counter["value"]
+    return stats
+
+
+def run_level(users: int, duration: float, args, images: list, servers: dict) -> dict:
+    from src.utils.logging import metrics_snapshot, reset_metrics
+
+    reset_metrics()
+    for server in servers.values():
+        server.reset_stats()
+
+    records = []
+    deadline = time.monotonic() + duration
+    threads = [
+        threading.Thread(
+            target=simulated_user,
+            args=(deadline, args.workload, args.image_share, images, args.think_time_ms / 1000, records),
+            name=f"user-{i}", daemon=True
+        )
+        for i in range(users)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Requests still in flight at the deadline finish and count, so divide by the real elapsed time.
+    elapsed = time.perf_counter() - start
+
+    return {
+        "users": users,
+        "elapsed_seconds": round(elapsed, 1),
+        "overall": summarize(records, elapsed),
+        "by_kind": {
+            kind: summarize([r for r in records if r["kind"] == kind], elapsed)
+            for kind in sorted({r["kind"] for r in records})
+        },
+        "stand_in_responses": {name: server.reset_stats() for name, server in servers.items()},
+        "client_calls": client_call_stats(metrics_snapshot()),
+    }
+
+
+def find_saturation(levels: list[dict], min_gain: float = 0.1) -> int | None:
+    """
+    Returns the first concurrency level after which adding users raised throughput by less than
+    min_gain (a fraction), or None if throughput kept scaling.
+    """
+    for previous, current in zip(levels, levels[1:]):
+        before = previous["overall"].get("throughput_rps") or 0
+        after = current["overall"].get("throughput_rps") or 0
+        if before and after < before * (1 + min_gain):
+            return previous["users"]
+    return None
+
+
+def print_level(level: dict) -> None:
+    o = level["overall"]
+    if not o["requests"]:
+        print(f"\n{level['users']} users: no request completed.")
+        return
+    print(f"\n{level['users']} users, {level['elapsed_seconds']}s: {o['requests']} requests, "
+          f"{o['throughput_rps']} req/s, p50 {o['p50_ms']} ms, p95 {o['p95_ms']} ms, p99 {o['p99_ms']} ms, "
+          f"errors {o['error_rate']:.1%}, degraded {o['degraded_rate']:.1%}")
+    for kind, s in level["by_kind"].items():
+        print(f"  {kind:<6} {s['requests']} requests, p50 {s['p50_ms']} ms, p95 {s['p95_ms']} ms, "
+              f"p99 {s['p99_ms']} ms, errors {s['error_rate']:.1%}")
+    for name, responses in level["stand_in_responses"].items():
+        print(f"  stand-in {name:<8} responses by status: {responses}  client: {level['client_calls'].get(name, {})}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Concurrent load test of the pipelines against local API stand-ins.")
+    parser.add_argument("--users", nargs="+", type=int, default=[1, 4, 16], help="Concurrency levels to run, in order.")
+    parser.add_argument("--duration", type=float, default=60, help="Seconds per concurrency level.")
+    parser.add_argument("--workload", choices=["text", "image", "mixed"], default="text")
+    parser.add_argument("--image-share", type=float, default=0.3, help="Share of image requests in the mixed workload.")
+    parser.add_argument("--think-time-ms", type=float, default=0, help="Mean pause between a user's requests.")
+    parser.add_argument("--use-caches", action="store_true", help="Keep the search/image/claim caches enabled.")
+    parser.add_argument("--output", help="Write the full report as JSON to this path.")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    servers = start_stand_ins(profiles_from_arguments(args))
+    # Configuration is read at import time, so the environment must be in place before src is imported.
+    os.environ.update(stand_in_environment(servers))
+    os.environ["FACTCHECK_CACHE_DIR"] = tempfile.mkdtemp(prefix="factcheck-load-")
+    # Per-step pipeline logs would drown the report at any useful concurrency.
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    if not args.use_caches:
+        for flag in ("SEARCH_CACHE_ENABLED", "IMAGE_CACHE_ENABLED", "NEAR_DUPLICATE_ENABLED", "CLAIM_STORE_ENABLED"):
+            os.environ[flag] = "false"
+
+    # Importing the pipeline registers every model it uses, so they can be preloaded.
+    import src.pipeline  # noqa: F401
+    from src.utils.model_registry import preload_models
+    role = {"text": "text", "image": "image"}.get(args.workload, "all")
+    print(f"Loading '{role}' models before the first level...")
+    preload_models(role)
+
+    images = []
+    for path in sorted(glob.glob(os.path.join(DATA_DIR, "*.jpg")) + glob.glob(os.path.join(DATA_DIR, "*.png"))):
+        with open(path, "rb") as f:
+            images.append(f.read())
+
+    levels = []
+    for users in args.users:
+        print(f"\nRunning {users} concurrent users for {args.duration}s ({args.workload} workload)...")
+        levels.append(run_level(users, args.duration, args, images, servers))
+        print_level(levels[-1])
+
+    saturation = find_saturation(levels)
+    if saturation is not None:
+        print(f"\nThroughput stopped scaling beyond {saturation} concurrent users.")
+    elif len(levels) > 1:
+        print("\nThroughput kept scaling across all levels; try higher concurrency.")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"config": vars(args), "levels": levels, "saturation_users": saturation}, f, indent=2)
+        print(f"Report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+# scripts/stand_in_servers.py
+"""
+Local stand-ins for the Groq, SerpAPI and imgbb HTTP APIs, for load testing without paid quota.
+
+Each stand-in has a configurable latency distribution, error rate and rate limit (429 responses
+with a Retry-After header). The pipelines are pointed at them through GROQ_API_URL,
+SERPAPI_BASE_URL and IMGBB_UPLOAD_URL; stand_in_environment() builds those settings.
+
+Run standalone to use them with the Streamlit app:
+    python scripts/stand_in_servers.py --groq-latency-ms 400 --groq-rate-limit 30
+and export the printed environment variables before starting the app.
+"""
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+DEFAULT_PROFILES = {
+    # Median latency and log-normal spread roughly matching the real services.
+    "groq": {"latency_ms": 400, "latency_sigma": 0.5, "error_rate": 0.0, "rate_limit": 0, "burst": 10,
+             "throttle_rate": 0.0, "retry_after": 1},
+    "serpapi": {"latency_ms": 900, "latency_sigma": 0.4, "error_rate": 0.0, "rate_limit": 0, "burst": 10,
+                "throttle_rate": 0.0, "retry_after": 1},
+    "imgbb": {"latency_ms": 600, "latency_sigma": 0.4, "error_rate": 0.0, "rate_limit": 0, "burst": 10,
+              "throttle_rate": 0.0, "retry_after": 1},
+}
+
+# --- Canned responses ---
+
+VERDICTS = ["SUPPORTED", "REFUTED", "NOT ENOUGH INFO"]
+
+
+def _groq_reply(system_prompt: str, user_prompt: str) -> str:
+    """
+    Produces a reply in the format each caller parses, chosen from its system prompt.
+    """
+    body = user_prompt.split("---")[1] if user_prompt.count("---") >= 2 else user_prompt
+    if "JSON" in system_prompt and "queries" in system_prompt:
+        claims = re.findall(r"^(\d+)\. (.+)$", body, re.MULTILINE)
+        return json.dumps({"results": [
+            {"id": int(i), "queries": [f"Is it true that {c.rstrip('.')}?", f"{c.rstrip('.')} facts", f"{c.rstrip('.')} evidence"]}
+            for i, c in claims
+        ]})
+    if "JSON" in system_prompt and "verdict" in system_prompt:
+        claim_ids = re.findall(r"^Claim (\d+): ", user_prompt, re.MULTILINE)
+        return json.dumps({"results": [
+            {"id": int(i), "verdict": random.choice(VERDICTS), "explanation": "Stand-in verdict."} for i in claim_ids
+        ]})
+    if "extract" in system_prompt and "claims" in system_prompt:
+        sentences = [s.strip() for s in re.split(r"(?<=[.!?])\s+", body.strip()) if len(s.strip()) > 10]
+        return "\n".join(sentences or [body.strip()])
+    if "search query" in system_prompt:
+        claim = body.strip().rstrip(".")
+        return f"Is it true that {claim}?\n{' '.join(claim.split()[:6])} facts\n{claim} evidence"
+    if "EVENT TRUTHFULNESS" in user_prompt or "CASE FILE" in user_prompt:
+        return (
+            "EVENT TRUTHFULNESS: Event is Unverified\n"
+            "IMAGE CONTEXT: Uncertain\n"
+            "ANALYST'S EXPLANATION: Stand-in analysis of the case file.\n"
+            f"OVERALL CONCLUSION: {random.choice(['SUPPORTED', 'REFUTED', 'UNCERTAIN'])}"
+        )
+    if "VERDICT" in system_prompt:
+        return f"VERDICT: {random.choice(VERDICTS)}\nEXPLANATION: Stand-in verdict based on {body.count('- ')} snippets."
+    return "Stand-in response."
+
+
+def groq_service(method: str, path: str, query: dict, body: bytes) -> tuple[int, dict]:
+    if method != "POST" or not path.endswith("/chat/completions"):
+        return 404, {"error": {"message": f"Unknown route {method} {path}"}}
+    payload = json.loads(body or b"{}")
+    messages = payload.get("messages", [])
+    system_prompt = next((m["content"] for m in messages if m.get("role") == "system"), "")
+    user_prompt = messages[-1]["content"] if messages else ""
+    content = _groq_reply(system_prompt, user_prompt)
+    return 200, {
+        "id": "stand-in",
+        "model": payload.get("model"),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+    }
+
+
+def serpapi_service(method: str, path: str, query: dict, body: bytes) -> tuple[int, dict]:
+    if path != "/search":
+        return 404, {"error": f"Unknown route {path}"}
+    engine = query.get("engine", ["google"])[0]
+    if engine == "google_lens":
+        return 200, {"visual_matches": [
+            {"title": f"Stand-in visual match {i}", "link": f"https://example.com/match/{i}",
+             "source_icon": "https://example.com/icon.png"} for i in range(5)
+        ]}
+    q = query.get("q", [""])[0]
+    return 200, {"organic_results": [
+        {"position": i + 1, "title": f"Result {i + 1}", "link": f"https://example.com/{i}",
+         "snippet": f"Stand-in evidence {i + 1} about {q}."} for i in range(5)
+    ]}
+
+
+def imgbb_service(method: str, path: str, query: dict, body: bytes) -> tuple[int, dict]:
+    if method != "POST" or not path.endswith("/upload"):
+        return 404, {"success": False, "error": {"message": f"Unknown route {method} {path}"}}
+    image_id = random.getrandbits(48)
+    return 200, {"success": True, "status": 200, "data": {"url": f"https://i.example.com/{image_id:x}.jpg"}}
+
+
+SERVICES = {"groq": groq_service, "serpapi": serpapi_service, "imgbb": imgbb_service}
+
+# --- Server ---
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate, self.capacity = rate, max(1, burst)
+        self.tokens, self.updated = float(self.capacity), time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def _handle(self, method: str):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        parsed = urlparse(self.path)
+        profile = server.profile
+
+        # Rate limiting is decided before any work, like the real APIs do.
+        if (server.bucket and not server.bucket.take()) or random.random() < profile["throttle_rate"]:
+            server.record(429)
+            self._send(429, {"error": {"message": "Rate limit exceeded (stand-in)."}},
+                       {"Retry-After": str(profile["retry_after"])})
+            return
+
+        median = profile["latency_ms"] / 1000
+        if median > 0:
+            time.sleep(median * math.exp(profile["latency_sigma"] * random.gauss(0, 1)))
+
+        if random.random() < profile["error_rate"]:
+            status, payload = 500, {"error": {"message": "Internal error (stand-in)."}}
+        else:
+            try:
+                status, payload = server.service(method, parsed.path, parse_qs(parsed.query), body)
+            except Exception as e:
+                status, payload = 400, {"error": {"message": f"Bad request: {e}"}}
+        server.record(status)
+        self._send(status, payload)
+
+    def _send(self, status: int, payload: dict, headers: dict | None = None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    """
+    One stand-in API on its own port. `stats` counts the responses sent per status code.
+    """
+    daemon_threads = True
+
+    def __init__(self, name: str, profile: dict | None = None, host: str = "127.0.0.1", port: int = 0):
+        super().__init__((host, port), _StandInHandler)
+        self.name = name
+        self.service = SERVICES[name]
+        self.profile = {**DEFAULT_PROFILES[name], **(profile or {})}
+        rate = self.profile["rate_limit"]
+        self.bucket = _TokenBucket(rate, self.profile["burst"]) if rate else None
+        self.stats, self._stats_lock = {}, threading.Lock()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record(self, status: int) -> None:
+        with self._stats_lock:
+            self.stats[status] = self.stats.get(status, 0) + 1
+
+    def reset_stats(self) -> dict:
+        with self._stats_lock:
+            stats, self.stats = self.stats, {}
+        return stats
+
+    def start(self) -> "StandInServer":
+        threading.Thread(target=self.serve_forever, name=f"stand-in-{self.name}", daemon=True).start()
+        return self
+
+
+def start_stand_ins(profiles: dict | None = None, host: str = "127.0.0.1", ports: dict | None = None) -> dict:
+    """
+    Starts the three stand-ins and returns them keyed by service name.
+    """
+    profiles, ports = profiles or {}, ports or {}
+    return {
+        name: StandInServer(name, profiles.get(name), host, ports.get(name, 0)).start()
+        for name in SERVICES
+    }
+
+
+def stand_in_environment(servers: dict) -> dict:
+    """
+    Environment variables that point the pipelines at the stand-ins, with dummy API keys so
+    no real key can be used by accident.
+    """
+    return {
+        "GROQ_API_URL": f"{servers['groq'].url}/openai/v1/chat/completions",
+        "SERPAPI_BASE_URL": servers["serpapi"].url,
+        "IMGBB_UPLOAD_URL": f"{servers['imgbb'].url}/1/upload",
+        "GROQ_API_KEY": "stand-in",
+        "SERPAPI_API_KEY": "stand-in",
+        "IMGBB_API_KEY": "stand-in",
+    }
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Adds --<service>-latency-ms, -latency-sigma, -error-rate, -rate-limit, -burst,
+    -throttle-rate and -retry-after options for every stand-in.
+    """
+    for name, defaults in DEFAULT_PROFILES.items():
+        group = parser.add_argument_group(f"{name} stand-in")
+        group.add_argument(f"--{name}-latency-ms", type=float, default=defaults["latency_ms"], help="Median latency.")
+        group.add_argument(f"--{name}-latency-sigma", type=float, default=defaults["latency_sigma"],
+                           help="Log-normal spread of the latency (0 = constant).")
+        group.add_argument(f"--{name}-error-rate", type=float, default=defaults["error_rate"],
+                           help="Fraction of requests answered with HTTP 500.")
+        group.add_argument(f"--{name}-rate-limit", type=float, default=defaults["rate_limit"],
+                           help="Sustained requests/s before answering 429 (0 = unlimited).")
+        group.add_argument(f"--{name}-burst", type=int, default=defaults["burst"], help="Rate limit burst size.")
+        group.add_argument(f"--{name}-throttle-rate", type=float, default=defaults["throttle_rate"],
+                           help="Fraction of requests answered with 429 regardless of load.")
+        group.add_argument(f"--{name}-retry-after", type=float, default=defaults["retry_after"],
+                           help="Retry-After seconds sent with 429 responses.")
+
+
+def profiles_from_arguments(args: argparse.Namespace) -> dict:
+    return {
+        name: {key: getattr(args, f"{name}_{key}") for key in defaults}
+        for name, defaults in DEFAULT_PROFILES.items()
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run local stand-ins for the Groq, SerpAPI and imgbb APIs.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--groq-port", type=int, default=8701)
+    parser.add_argument("--serpapi-port", type=int, default=8702)
+    parser.add_argument("--imgbb-port", type=int, default=8703)
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    ports = {"groq": args.groq_port, "serpapi": args.serpapi_port, "imgbb": args.imgbb_port}
+    servers = start_stand_ins(profiles_from_arguments(args), args.host, ports)
+    print("Stand-ins running. Point the app at them with:")
+    for key, value in stand_in_environment(servers).items():
+        print(f"export {key}={value}")
+    try:
+        while True:
+            time.sleep(10)
+            print(" | ".join(f"{name}: {server.stats}" for name, server in servers.items()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
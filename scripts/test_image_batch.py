@@ -0,0 +1,21 @@
+# scripts/test_image_batch.py
+import sys
+import os
+import json
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.pipeline import run_image_verification_batch
+
+# A small moderation-queue style batch: several images, each with its own question.
+BATCH = [
+    ("data/ai_image.png", "Is this a real photo of Bill Gates giving away $5,000?"),
+    ("data/real_photo1.jpg", "Is this photo real?"),
+    ("data/mona_lisa.jpg", "Is this the original Mona Lisa painting?"),
+]
+
+reports = run_image_verification_batch(BATCH)
+
+for (image_path, _), report in zip(BATCH, reports):
+    print(f"\n--- REPORT FOR {image_path} ---")
+    print(json.dumps(report, indent=4))
@@ -1,17 +1,60 @@
 # src/pipeline.py (Definitive Final Version)
 import sys
 import os
-from src.text.claim_extractor import extract_atomic_claims
-from src.text.query_generator import generate_search_queries
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from src.text.claim_extractor import extract_atomic_claims, ClaimExtractionError
+from src.text.query_generator import generate_search_queries, generate_search_queries_batch
 from src.text.fetch_web_results import get_evidence_snippets
-from src.text.ml_verifier import classify_evidence_stance
-from src.text.llm_verifier import verify_claim_with_llm
-from src.vision.captioning import generate_image_caption
+from src.text.ml_verifier import classify_evidence_stance, classify_evidence_stance_batch
+from src.text.llm_verifier import verify_claim_chunk, plan_verification_batches, ERROR_VERDICT
+from src.text.claim_store import lookup_verified_claims, remember_verified_claims
+from src.text.checkworthiness import assess_checkworthiness
+from src.text.evidence_ranker import rank_evidence
+from src.vision.captioning import generate_image_caption, generate_image_captions
 from src.vision.ocr import extract_text_from_image
 from src.vision.reverse_image_search import find_image_source
-from src.vision.manipulation_detector import classify_image_authenticity
+from src.vision.manipulation_detector import classify_image_authenticity, classify_images_authenticity
 from src.reasoning_engine import synthesize_image_evidence
-from src.vision.preprocessing import clean_ocr_text
+from src.vision.preprocessing import clean_ocr_text, compute_phash
+from src.vision.image_input import ImageSource, LoadedImage, load_image
+from src.vision.analysis_cache import (
+    CACHED_SECTIONS,
+    NEAR_DUPLICATE_SECTIONS,
+    load_cached_sections,
+    store_sections,
+    find_near_duplicate,
+    remember_image,
+    is_error_text,
+)
+from src.utils.config import TEXT_PIPELINE_MAX_WORKERS, IMAGE_BATCH_SIZE, IMAGE_BATCH_MAX_WORKERS, LLM_BATCHING_ENABLED
+from src.utils.logging import get_logger, span, traced, submit_with_context, increment
+
+logger = get_logger("Pipeline")
+
+# --- Streaming events ---
+# The iter_* pipeline variants yield these as each piece of work completes.
+EVENT_CLAIMS_EXTRACTED = "claims_extracted"
+EVENT_CLAIMS_SKIPPED = "claims_skipped"
+EVENT_CLAIM_VERDICT = "claim_verdict"
+EVENT_TEXT_COMPLETE = "text_complete"
+EVENT_CAPTION_READY = "caption_ready"
+EVENT_OCR_READY = "ocr_ready"
+EVENT_AUTHENTICITY_READY = "authenticity_ready"
+EVENT_REVERSE_SEARCH_READY = "reverse_search_ready"
+EVENT_THEMATIC_SEARCH_READY = "thematic_search_ready"
+EVENT_FINAL_VERDICT = "final_verdict"
+
+def _event(event_type: str, **data) -> dict:
+    return {"event": event_type, **data}
+
+def _final_event_payload(events, final_event_type: str) -> dict:
+    """Drains an event stream and returns its final event."""
+    final = None
+    for event in events:
+        if event["event"] == final_event_type:
+            final = event
+    return final
+
 
 def calculate_credibility_score(stance_results: list[dict]) -> float:
     """
@@ -29,94 +72,576 @@ def calculate_credibility_score(stance_results: list[dict]) -> float:
     return (supports - refutes) / total_relevant
 
 
-def run_text_verification_pipeline(raw_text: str) -> list[dict]:
+def _gather_claim_evidence(claim: str, queries: list[str] | None = None) -> list[str]:
     """
-    Runs the full end-to-end pipeline for verifying claims in a raw text.
+    Fetches the web evidence for one claim, generating its search queries first unless they are given.
+    Near-duplicate snippets are collapsed and only the most relevant ones are kept for NLI and the LLM.
     """
-    final_results = []
-    
-    print("Step 1: Extracting claims...")
-    atomic_claims = extract_atomic_claims(raw_text)
+    with span("claim", claim=claim):
+        logger.info(f"Verifying claim: \"{claim}\"")
+
+        if queries is None:
+            logger.info("Step 2: Generating search queries...")
+            queries = generate_search_queries(claim)
+
+        logger.info("Step 3: Fetching web evidence...")
+        return rank_evidence(claim, get_evidence_snippets(queries))
+
+
+def _error_result(claim: str, error: Exception) -> dict:
+    """
+    Builds the result reported for a claim whose verification raised an exception.
+    """
+    logger.error(f"Error while verifying claim '{claim}': {error}")
+    increment("failed_results_total", pipeline="text")
+    return {
+        "claim": claim,
+        "verdict": "ERROR",
+        "explanation": f"Verification failed for this claim: {error}",
+        "credibility_score": 0.0,
+        "evidence": []
+    }
+
+
+def _skipped_result(claim: str, assessment: dict) -> dict:
+    """
+    Builds the result reported for a claim the check-worthiness filter did not send to verification.
+    """
+    return {
+        "claim": claim,
+        "verdict": "SKIPPED",
+        "explanation": f"Not verified: {assessment['reason']}",
+        "credibility_score": 0.0,
+        "evidence": [],
+        "checkworthiness": assessment["score"]
+    }
+
+
+def _generate_all_queries(claims: list[str]) -> list[list[str] | None]:
+    """
+    Generates the search queries of every claim with batched LLM calls. None for a claim means its
+    queries are generated on its own evidence worker instead (batching off, one claim, or a failure).
+    """
+    if not LLM_BATCHING_ENABLED or len(claims) < 2:
+        return [None] * len(claims)
+    logger.info("Step 2: Generating search queries for all claims...")
+    try:
+        return generate_search_queries_batch(claims)
+    except Exception as e:
+        logger.warning(f"Batched query generation failed, generating per claim: {e}")
+        return [None] * len(claims)
+
+
+def _classify_all_stances(claims_with_evidence: list[tuple[str, list[str]]]) -> list[list[dict]]:
+    """
+    Runs one batched NLI pass over every (claim, snippet) pair of the request.
+    If the batch fails, each claim is retried on its own so one bad input only affects its claim.
+    """
+    try:
+        return classify_evidence_stance_batch(claims_with_evidence)
+    except Exception as e:
+        logger.warning(f"Batched stance classification failed, retrying per claim: {e}")
+
+    stance_results = []
+    for claim, snippets in claims_with_evidence:
+        try:
+            stance_results.append(classify_evidence_stance(claim, snippets))
+        except Exception as e:
+            logger.error(f"Stance classification failed for claim '{claim}': {e}")
+            stance_results.append([])
+    return stance_results
+
+
+def _text_verification_events(raw_text: str, max_workers: int | None):
+    logger.info("Step 1: Extracting claims...")
+    try:
+        atomic_claims = extract_atomic_claims(raw_text)
+    except ClaimExtractionError as e:
+        # Reported as a failure, not as a text without claims.
+        error = f"Claim extraction failed: {e}"
+        increment("failed_results_total", pipeline="text")
+        yield _event(EVENT_CLAIMS_EXTRACTED, claims=[], error=error)
+        yield _event(EVENT_TEXT_COMPLETE, results=[], error=error)
+        return
     if not atomic_claims:
-        print("No factual claims were extracted.")
-        return []
-    print(f"Found {len(atomic_claims)} claims.")
+        logger.info("No factual claims were extracted.")
+        yield _event(EVENT_CLAIMS_EXTRACTED, claims=[])
+        yield _event(EVENT_TEXT_COMPLETE, results=[])
+        return
+    logger.info(f"Found {len(atomic_claims)} claims.")
+    yield _event(EVENT_CLAIMS_EXTRACTED, claims=atomic_claims)
 
-    for claim in atomic_claims:
-        print(f"\n--- Verifying Claim: \"{claim}\" ---")
-        
-        print("Step 2: Generating search queries...")
-        queries = generate_search_queries(claim)
-        
-        print("Step 3: Fetching web evidence...")
-        evidence_snippets = get_evidence_snippets(queries)
-        
-        if not evidence_snippets:
-            result = {
-                "claim": claim,
-                "verdict": "NOT ENOUGH INFO",
-                "explanation": "No relevant evidence was found online to verify this claim.",
-                "credibility_score": 0.0,
-                "evidence": []
-            }
-            final_results.append(result)
-            continue
+    # Trivial or unverifiable claims are dropped before any external call is made for them.
+    assessments = assess_checkworthiness(atomic_claims)
+    final_results = [None] * len(atomic_claims)
+    selected = [i for i, assessment in enumerate(assessments) if assessment["selected"]]
+    skipped = [i for i, assessment in enumerate(assessments) if not assessment["selected"]]
+    if skipped:
+        logger.info(f"Skipping {len(skipped)} claims that are not check-worthy.")
+        for i in skipped:
+            final_results[i] = _skipped_result(atomic_claims[i], assessments[i])
+        increment("claims_total", len(skipped), source="skipped")
+        yield _event(EVENT_CLAIMS_SKIPPED, skipped=[{"index": i, "result": final_results[i]} for i in skipped])
 
-        print("Step 4: Classifying evidence stance with ML model...")
-        stance_results = classify_evidence_stance(claim, evidence_snippets)
-        
-        print("Step 5: Generating final verdict with LLM...")
-        llm_result = verify_claim_with_llm(claim, evidence_snippets)
-        
-        final_verdict = {
-            "claim": claim,
-            "verdict": llm_result["verdict"],
-            "explanation": llm_result["explanation"],
-            "credibility_score": calculate_credibility_score(stance_results),
-            "evidence": stance_results
+    # Claims that were already verified (possibly phrased differently) reuse the stored verdict
+    # and skip query generation, search, NLI and the LLM call entirely.
+    stored_results, claim_embeddings = lookup_verified_claims([atomic_claims[i] for i in selected])
+    embedding_row = {i: row for row, i in enumerate(selected)}
+    for i, result in zip(selected, stored_results):
+        final_results[i] = result
+    pending = [i for i in selected if final_results[i] is None]
+    if len(pending) < len(selected):
+        logger.info(f"Reusing stored verdicts for {len(selected) - len(pending)} previously verified claims.")
+    increment("claims_total", len(selected) - len(pending), source="claim_store")
+    increment("claims_total", len(pending), source="pipeline")
+    for i in selected:
+        if final_results[i] is not None:
+            yield _event(EVENT_CLAIM_VERDICT, index=i, result=final_results[i])
+    if not pending:
+        yield _event(EVENT_TEXT_COMPLETE, results=final_results)
+        return
+
+    workers = max(1, min(max_workers or TEXT_PIPELINE_MAX_WORKERS, len(pending)))
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="claim") as executor:
+        pending_queries = _generate_all_queries([atomic_claims[i] for i in pending])
+        evidence_futures = {
+            submit_with_context(executor, _gather_claim_evidence, atomic_claims[i], queries): i
+            for i, queries in zip(pending, pending_queries)
         }
-        final_results.append(final_verdict)
-        
-    return final_results
 
+        evidence_by_index = {}
+        for future in as_completed(evidence_futures):
+            i = evidence_futures[future]
+            claim = atomic_claims[i]
+            try:
+                evidence_snippets = future.result()
+            except Exception as e:
+                final_results[i] = _error_result(claim, e)
+                yield _event(EVENT_CLAIM_VERDICT, index=i, result=final_results[i])
+                continue
+
+            if not evidence_snippets:
+                final_results[i] = {
+                    "claim": claim,
+                    "verdict": "NOT ENOUGH INFO",
+                    "explanation": "No relevant evidence was found online to verify this claim.",
+                    "credibility_score": 0.0,
+                    "evidence": []
+                }
+                yield _event(EVENT_CLAIM_VERDICT, index=i, result=final_results[i])
+                continue
+            evidence_by_index[i] = evidence_snippets
+        # Keep the claim order for the batched NLI call.
+        evidence_by_index = dict(sorted(evidence_by_index.items()))
 
-def run_image_verification_pipeline(image_path: str, user_query: str) -> dict:
+        # The LLM verdict does not depend on the NLI output, so the verdict calls are
+        # already in flight while the stance model runs on this thread. With batching, each
+        # future covers a chunk of claims sized to fit one call.
+        logger.info("Step 5: Generating final verdicts with LLM...")
+        verify_items = [(atomic_claims[i], snippets) for i, snippets in evidence_by_index.items()]
+        verify_indices = list(evidence_by_index)
+        if LLM_BATCHING_ENABLED and len(verify_items) > 1:
+            verify_chunks = plan_verification_batches(verify_items)
+        else:
+            verify_chunks = [[k] for k in range(len(verify_items))]
+        verdict_futures = {
+            submit_with_context(executor, verify_claim_chunk, [verify_items[k] for k in chunk]): [verify_indices[k] for k in chunk]
+            for chunk in verify_chunks
+        }
+
+        logger.info("Step 4: Classifying evidence stance with ML model...")
+        stance_results = dict(zip(evidence_by_index, _classify_all_stances(
+            [(atomic_claims[i], snippets) for i, snippets in evidence_by_index.items()]
+        )))
+
+        for future in as_completed(verdict_futures):
+            chunk_indices = verdict_futures[future]
+            try:
+                llm_results, error = future.result(), None
+            except Exception as e:
+                llm_results, error = None, e
+            for position, i in enumerate(chunk_indices):
+                claim = atomic_claims[i]
+                if error is not None:
+                    final_results[i] = _error_result(claim, error)
+                else:
+                    if llm_results[position]["verdict"] == ERROR_VERDICT:
+                        increment("failed_results_total", pipeline="text")
+                    final_results[i] = {
+                        "claim": claim,
+                        "verdict": llm_results[position]["verdict"],
+                        "explanation": llm_results[position]["explanation"],
+                        "credibility_score": calculate_credibility_score(stance_results[i]),
+                        "evidence": stance_results[i]
+                    }
+                yield _event(EVENT_CLAIM_VERDICT, index=i, result=final_results[i])
+
+    if claim_embeddings is not None:
+        remember_verified_claims(
+            [atomic_claims[i] for i in pending],
+            [final_results[i] for i in pending],
+            claim_embeddings[[embedding_row[i] for i in pending]]
+        )
+    yield _event(EVENT_TEXT_COMPLETE, results=final_results)
+
+
+def iter_text_verification_pipeline(raw_text: str, max_workers: int | None = None):
     """
-    Runs the full end-to-end pipeline for verifying an image using the definitive "Guided Analyst Report" engine.
+    Streaming variant of run_text_verification_pipeline: yields events as work completes.
+
+    Events (dictionaries with an "event" key):
+        claims_extracted: {"claims": [...]} once claim extraction is done; if it failed, the
+                          claims are empty and "error" says why (also set on text_complete).
+        claims_skipped:   {"skipped": [{"index": i, "result": {...}}, ...]} for claims the
+                          check-worthiness filter left out, with verdict SKIPPED.
+        claim_verdict:    {"index": i, "result": {...}} for each claim, in completion order.
+        text_complete:    {"results": [...]} with every result in the original claim order.
+
+    Args:
+        raw_text: The text containing the claims to verify.
+        max_workers: Maximum number of claims processed in parallel.
+                     Defaults to TEXT_PIPELINE_MAX_WORKERS; 1 processes the claims serially.
+    """
+    # The request span is the root of the trace; every claim and stage span nests under it.
+    with span("text_request", text_length=len(raw_text)):
+        yield from _text_verification_events(raw_text, max_workers)
+
+
+def run_text_verification_pipeline(raw_text: str, max_workers: int | None = None) -> list[dict]:
+    """
+    Runs the full end-to-end pipeline for verifying claims in a raw text.
+
+    Claims are first ranked by check-worthiness; those left out are reported with a SKIPPED
+    verdict. Claims that match a previously verified claim reuse its stored verdict. For the rest,
+    search queries and LLM verdicts are requested with batched JSON calls covering many claims,
+    evidence gathering runs concurrently across claims, and stance classification runs as a
+    single batched NLI pass over all claims. Results are returned
+    in the original claim order, and a failure in one claim does not affect the others.
+
+    Args:
+        raw_text: The text containing the claims to verify.
+        max_workers: Maximum number of claims processed in parallel.
+                     Defaults to TEXT_PIPELINE_MAX_WORKERS; 1 processes the claims serially.
+
+    Returns:
+        A list with one result dictionary per extracted claim.
+        Raises ClaimExtractionError if the claims could not be extracted.
+    """
+    final = _final_event_payload(iter_text_verification_pipeline(raw_text, max_workers), EVENT_TEXT_COMPLETE)
+    if final.get("error"):
+        raise ClaimExtractionError(final["error"])
+    return final["results"]
+
+
+def _run_thematic_search(cleaned_ocr_text: str) -> list[str]:
+    """
+    Runs a thematic web search on the text found in an image, if there is any.
+    A failed OCR stage's error message is not searched for.
+    """
+    if not cleaned_ocr_text or is_error_text(cleaned_ocr_text):
+        return []
+    logger.info("Step 2: Performing thematic web search based on OCR text...")
+    return get_evidence_snippets([cleaned_ocr_text])
+
+
+def _run_ocr(image: LoadedImage) -> str:
+    """
+    Extracts the text in an image and cleans it.
     """
-    print("\n--- Starting Image Verification Pipeline ---")
+    return clean_ocr_text(extract_text_from_image(image))
+
 
-    # Step 1: Run all base analysis modules
-    print("Step 1: Running base image analysis modules...")
-    caption = generate_image_caption(image_path)
-    ocr_text = extract_text_from_image(image_path)
-    cleaned_ocr_text = clean_ocr_text(ocr_text)
-    authenticity_report = classify_image_authenticity(image_path)
-    reverse_search_results = find_image_source(image_path)
+def _run_ocr_and_thematic_search(image: LoadedImage, run_thematic_search: bool = True) -> tuple[str, list[str] | None]:
+    """
+    Extracts and cleans the text in an image, then immediately runs the thematic web search on it.
+    """
+    cleaned_ocr_text = _run_ocr(image)
+    if not run_thematic_search:
+        return cleaned_ocr_text, None
+    return cleaned_ocr_text, _run_thematic_search(cleaned_ocr_text)
+
+
+def _compute_perceptual_hash(image: LoadedImage) -> int | None:
+    """
+    Computes the perceptual hash used for near-duplicate lookup, or None if it fails.
+    """
+    try:
+        # The hash only looks at a 32x32 reduction, so the small detector copy gives the same result faster.
+        return compute_phash(image.detector_image)
+    except Exception as e:
+        logger.warning(f"Could not compute perceptual hash: {e}")
+        return None
 
-    # Step 2: Perform thematic web search if OCR text exists
-    thematic_search_results = []
-    if cleaned_ocr_text:
-        print("Step 2: Performing thematic web search based on OCR text...")
-        thematic_search_results = get_evidence_snippets([cleaned_ocr_text])
 
-    # Assemble a complete report of all raw data
-    full_analysis_report = {
+def _lookup_image_sections(image: LoadedImage) -> tuple[str, int | None, dict]:
+    """
+    Finds the report sections already computed for this image or a near-duplicate of it.
+
+    Returns:
+        (fingerprint, perceptual hash or None, cached sections keyed by section name).
+    """
+    fingerprint = image.fingerprint
+    sections = load_cached_sections(fingerprint)
+    if sections:
+        logger.info(f"Reusing cached sections for this image: {', '.join(sections)}")
+
+    # Reposts are rarely byte-identical, so fall back to a perceptually similar image seen before
+    # for the sections that don't depend on the text in the image.
+    phash = None
+    if len(sections) < len(CACHED_SECTIONS):
+        phash = _compute_perceptual_hash(image)
+        near_match = find_near_duplicate(phash, exclude=fingerprint) if phash is not None else None
+        if near_match:
+            near_fingerprint, distance = near_match
+            near_sections = {
+                section: value for section, value in load_cached_sections(near_fingerprint).items()
+                if section in NEAR_DUPLICATE_SECTIONS and section not in sections
+            }
+            if near_sections:
+                logger.info(f"Reusing sections of a near-duplicate image (distance {distance}): {', '.join(near_sections)}")
+                sections.update(near_sections)
+    return fingerprint, phash, sections
+
+
+def _store_image_sections(fingerprint: str, phash: int | None, fresh_sections: dict) -> None:
+    """
+    Caches freshly computed sections and indexes the image for near-duplicate lookup.
+    """
+    stored = store_sections(fingerprint, fresh_sections)
+    if "image_analysis" in stored and phash is not None:
+        remember_image(phash, fingerprint)
+
+
+def _assemble_image_report(user_query: str, sections: dict) -> dict:
+    """
+    Assembles a complete report of all raw data.
+    """
+    return {
+        "user_query": user_query,
+        "image_analysis": sections["image_analysis"],
+        "online_history": sections["online_history"],
+        "thematic_search": sections["thematic_search"]
+    }
+
+
+def _image_error_report(user_query: str, error: Exception) -> dict:
+    """
+    Builds the report returned for an image whose verification raised an exception.
+    """
+    logger.error(f"Error while verifying image for query '{user_query}': {error}")
+    increment("failed_results_total", pipeline="image")
+    return {
         "user_query": user_query,
-        "image_analysis": {
-            "caption": caption,
-            "ocr_text": cleaned_ocr_text,
-            "authenticity": authenticity_report
-        },
-        "online_history": reverse_search_results,
-        "thematic_search": thematic_search_results
+        "image_analysis": {},
+        "online_history": {"error": str(error)},
+        "thematic_search": [],
+        "final_verdict": {"final_verdict": "ERROR", "explanation": f"Image verification failed: {error}"}
     }
+
+
+# Stage name -> (event emitted when it completes, value reported if the stage raises).
+_IMAGE_STAGE_EVENTS = {
+    "caption": (EVENT_CAPTION_READY, lambda e: f"An error occurred during captioning: {e}"),
+    "ocr_text": (EVENT_OCR_READY, lambda e: ""),
+    "authenticity": (EVENT_AUTHENTICITY_READY, lambda e: {"error": f"An error occurred during image authenticity classification: {e}"}),
+    "online_history": (EVENT_REVERSE_SEARCH_READY, lambda e: {"error": f"An error occurred during reverse image search: {e}"}),
+    "thematic_search": (EVENT_THEMATIC_SEARCH_READY, lambda e: []),
+}
+
+
+def _image_verification_events(image: ImageSource, user_query: str):
+    logger.info("Starting Image Verification Pipeline")
+
+    try:
+        image = load_image(image)
+    except Exception as e:
+        yield _event(EVENT_FINAL_VERDICT, report=_image_error_report(user_query, e))
+        return
+    fingerprint, phash, sections = _lookup_image_sections(image)
+
+    for section, value in sections.items():
+        stage_values = value.items() if section == "image_analysis" else [(section, value)]
+        for stage, stage_value in stage_values:
+            yield _event(_IMAGE_STAGE_EVENTS[stage][0], cached=True, **{stage: stage_value})
+
+    # Step 1: Run the missing analysis modules concurrently. None of them depends on another,
+    # so the model stages run on worker threads while the reverse search is in flight.
+    # The thematic search is submitted the moment OCR finishes.
+    logger.info("Step 1: Running base image analysis modules...")
+    fresh_sections, analysis = {}, {}
+    with ThreadPoolExecutor(max_workers=4, thread_name_prefix="image-stage") as executor:
+        stages = {}
+        if "online_history" not in sections:
+            stages[submit_with_context(executor, find_image_source, image)] = "online_history"
+        if "image_analysis" not in sections:
+            stages[submit_with_context(executor, _run_ocr, image)] = "ocr_text"
+            stages[submit_with_context(executor, generate_image_caption, image)] = "caption"
+            stages[submit_with_context(executor, classify_image_authenticity, image)] = "authenticity"
+        elif "thematic_search" not in sections:
+            ocr_text = sections["image_analysis"].get("ocr_text", "")
+            stages[submit_with_context(executor, _run_thematic_search, ocr_text)] = "thematic_search"
+
+        while stages:
+            done, _ = wait(stages, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = stages.pop(future)
+                event_type, on_error = _IMAGE_STAGE_EVENTS[stage]
+                try:
+                    value = future.result()
+                except Exception as e:
+                    logger.error(f"Image stage '{stage}' failed: {e}")
+                    value = on_error(e)
+
+                if stage in ("caption", "ocr_text", "authenticity"):
+                    analysis[stage] = value
+                else:
+                    fresh_sections[stage] = value
+                if stage == "ocr_text" and "thematic_search" not in sections:
+                    stages[submit_with_context(executor, _run_thematic_search, value)] = "thematic_search"
+                yield _event(event_type, **{stage: value})
+
+    if analysis:
+        fresh_sections["image_analysis"] = {
+            "caption": analysis["caption"],
+            "ocr_text": analysis["ocr_text"],
+            "authenticity": analysis["authenticity"]
+        }
+    _store_image_sections(fingerprint, phash, fresh_sections)
+    sections.update(fresh_sections)
+
+    full_analysis_report = _assemble_image_report(user_query, sections)
     
     # Step 3: Call the central reasoning engine to get the final verdict
-    print("Step 3: Synthesizing all data with the final Reasoning Engine...")
+    logger.info("Step 3: Synthesizing all data with the final Reasoning Engine...")
     final_verdict = synthesize_image_evidence(user_query, full_analysis_report)
     
     full_analysis_report["final_verdict"] = final_verdict
     
-    print("--- Image Verification Pipeline Complete ---")
-    return full_analysis_report
\ No newline at end of file
+    logger.info("Image Verification Pipeline Complete")
+    yield _event(EVENT_FINAL_VERDICT, report=full_analysis_report)
+
+
+def iter_image_verification_pipeline(image: ImageSource, user_query: str):
+    """
+    Streaming variant of run_image_verification_pipeline: yields events as each stage completes.
+
+    Events (dictionaries with an "event" key, plus "cached": True when served from the cache):
+        caption_ready:         {"caption": str}
+        ocr_ready:             {"ocr_text": str}
+        authenticity_ready:    {"authenticity": {...}}
+        reverse_search_ready:  {"online_history": {...}}
+        thematic_search_ready: {"thematic_search": [...]}
+        final_verdict:         {"report": {...}} with the complete report, always last.
+    """
+    with span("image_request"):
+        yield from _image_verification_events(image, user_query)
+
+
+def run_image_verification_pipeline(image: ImageSource, user_query: str) -> dict:
+    """
+    Runs the full end-to-end pipeline for verifying an image using the definitive "Guided Analyst Report" engine.
+
+    The image may be a file path, the raw uploaded bytes, a PIL image or a LoadedImage. It is read
+    and decoded exactly once, and every stage works on that shared in-memory copy.
+    The image bytes are hashed first, and any report section already computed for the same image
+    (image analysis, online history, thematic search) is served from the persistent image cache.
+    Only the missing sections and the query-dependent final synthesis are computed.
+    """
+    return _final_event_payload(iter_image_verification_pipeline(image, user_query), EVENT_FINAL_VERDICT)["report"]
+
+
+@traced("image_batch_request")
+def run_image_verification_batch(
+    items: list[tuple[ImageSource, str]],
+    batch_size: int = IMAGE_BATCH_SIZE,
+    max_workers: int = IMAGE_BATCH_MAX_WORKERS
+) -> list[dict]:
+    """
+    Verifies many images at once, e.g. a moderation queue.
+
+    Captioning and authenticity detection run as true batched forward passes over every image
+    that needs them, while OCR, the thematic searches, the reverse image searches and the final
+    LLM syntheses of all images overlap on a shared thread pool. Cached sections are reused
+    exactly as in run_image_verification_pipeline.
+
+    Args:
+        items: (image, user_query) pairs; each image may be a path, bytes, PIL image or LoadedImage.
+        batch_size: Number of images per model forward pass.
+        max_workers: Worker threads for the per-image OCR and network stages.
+
+    Returns:
+        One report per item, in input order. An item that fails gets an ERROR verdict
+        without affecting the others.
+    """
+    logger.info(f"Starting Batch Image Verification for {len(items)} images")
+    reports = [None] * len(items)
+
+    lookups, images = {}, {}
+    for i, (image, user_query) in enumerate(items):
+        try:
+            images[i] = load_image(image)
+            lookups[i] = _lookup_image_sections(images[i])
+        except Exception as e:
+            reports[i] = _image_error_report(user_query, e)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="image-batch") as executor:
+        # Network and OCR stages for every image are submitted first so they run during the model batches.
+        reverse_search_futures, ocr_futures, thematic_futures = {}, {}, {}
+        for i, (_, _, sections) in lookups.items():
+            image = images[i]
+            if "online_history" not in sections:
+                reverse_search_futures[i] = submit_with_context(executor, find_image_source, image)
+            if "image_analysis" not in sections:
+                ocr_futures[i] = submit_with_context(
+                    executor, _run_ocr_and_thematic_search, image, "thematic_search" not in sections
+                )
+            elif "thematic_search" not in sections:
+                thematic_futures[i] = submit_with_context(
+                    executor, _run_thematic_search, sections["image_analysis"].get("ocr_text", "")
+                )
+
+        needs_analysis = list(ocr_futures)
+        analysis_position = {i: position for position, i in enumerate(needs_analysis)}
+        captions, authenticity_reports = [], []
+        if needs_analysis:
+            logger.info(f"Running batched captioning and authenticity detection on {len(needs_analysis)} images...")
+            analysis_images = [images[i] for i in needs_analysis]
+            captions = generate_image_captions(analysis_images, batch_size=batch_size)
+            authenticity_reports = classify_images_authenticity(analysis_images, batch_size=batch_size)
+
+        synthesis_futures = {}
+        for i, (fingerprint, phash, sections) in lookups.items():
+            user_query = items[i][1]
+            try:
+                fresh_sections = {}
+                if i in ocr_futures:
+                    position = analysis_position[i]
+                    cleaned_ocr_text, thematic_search_results = ocr_futures[i].result()
+                    fresh_sections["image_analysis"] = {
+                        "caption": captions[position],
+                        "ocr_text": cleaned_ocr_text,
+                        "authenticity": authenticity_reports[position]
+                    }
+                    if thematic_search_results is not None:
+                        fresh_sections["thematic_search"] = thematic_search_results
+                if i in thematic_futures:
+                    fresh_sections["thematic_search"] = thematic_futures[i].result()
+                if i in reverse_search_futures:
+                    fresh_sections["online_history"] = reverse_search_futures[i].result()
+
+                _store_image_sections(fingerprint, phash, fresh_sections)
+                sections.update(fresh_sections)
+                reports[i] = _assemble_image_report(user_query, sections)
+                synthesis_futures[i] = submit_with_context(executor, synthesize_image_evidence, user_query, reports[i])
+            except Exception as e:
+                reports[i] = _image_error_report(user_query, e)
+
+        for i, future in synthesis_futures.items():
+            try:
+                reports[i]["final_verdict"] = future.result()
+            except Exception as e:
+                reports[i] = _image_error_report(items[i][1], e)
+
+    logger.info("Batch Image Verification Complete")
+    return reports
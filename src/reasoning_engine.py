@@ -1,21 +1,30 @@
 # src/reasoning_engine.py (Definitive Final Version)
-import requests
 import json
 import re
-from src.utils.config import GROQ_API_KEY, LLM_VERIFIER_MODEL
+from src.utils.config import (
+    LLM_VERIFIER_MODEL,
+    DETERMINISTIC_FAST_PATH_ENABLED,
+    DEBUNK_KEYWORD_WEIGHTS,
+    DEBUNK_SECTION_WEIGHTS,
+    DETERMINISTIC_RULES,
+    PROMPT_TITLE_MAX_TOKENS,
+    PROMPT_SNIPPET_MAX_TOKENS,
+    PROMPT_OCR_MAX_TOKENS,
+)
+from src.utils.groq_client import chat_completion
+from src.utils.prompt_builder import prompt_section, fit_prompt
+from src.utils.logging import get_logger, traced, increment
+
+logger = get_logger("ReasoningEngine")
 
 def _call_groq_api(system_prompt: str, user_prompt: str) -> str:
     """Helper function to make a call to the Groq API."""
-    url = "https://api.groq.com/openai/v1/chat/completions"
-    headers = {"Authorization": f"Bearer {GROQ_API_KEY}", "Content-Type": "application/json"}
-    payload = {"model": LLM_VERIFIER_MODEL, "messages": [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}], "temperature": 0.0, "top_p": 0.1}
-    try:
-        response = requests.post(url, headers=headers, json=payload, timeout=60)
-        response.raise_for_status()
-        return response.json()["choices"][0]["message"]["content"].strip()
-    except Exception as e:
-        print(f"[ReasoningEngine] API Error: {e}")
+    messages = [{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}]
+    result = chat_completion(LLM_VERIFIER_MODEL, messages, temperature=0.0, top_p=0.1)
+    if not result["ok"]:
+        logger.error(f"API Error: {result['error']}")
         return "ERROR: The AI model failed to respond."
+    return result["content"]
 
 def _parse_final_report(report_text: str) -> dict:
     """
@@ -46,9 +55,90 @@ def _parse_final_report(report_text: str) -> dict:
 
         return verdict_data
     except Exception as e:
-        print(f"Error parsing final response: {e}")
+        logger.error(f"Error parsing final response: {e}")
         return {"final_verdict": "ERROR", "explanation": "Failed to parse the AI's report."}
 
+def _keyword_pattern(keyword: str) -> re.Pattern:
+    return re.compile(rf"\b{re.escape(keyword)}\b", re.IGNORECASE)
+
+def _debunk_pattern(keyword: str) -> re.Pattern:
+    # Skips negated mentions such as "not a hoax", "no doctored images" or "isn't photoshopped".
+    negations = "".join(rf"(?<!{n} )" for n in (r"\bnot", r"\bnot a", r"\bno", "n't", r"\bnever", r"\bnever a"))
+    return re.compile(rf"\b{negations}{re.escape(keyword)}\b", re.IGNORECASE)
+
+_DEBUNK_PATTERNS = {keyword: _debunk_pattern(keyword) for keyword in DEBUNK_KEYWORD_WEIGHTS}
+
+def _score_debunk_signals(sources, thematic_search) -> dict:
+    """
+    Scores the web evidence for debunking red flags.
+
+    Returns:
+        A dictionary with the total 'debunk_score', the number of 'debunk_documents'
+        and the 'matches' (section, text and keywords) that contributed.
+    """
+    documents = []
+    if isinstance(sources, list):
+        documents += [("online_history", r.get("title") or "") for r in sources if isinstance(r, dict)]
+    if isinstance(thematic_search, list):
+        documents += [("thematic_search", snippet) for snippet in thematic_search if isinstance(snippet, str)]
+
+    score, matches = 0.0, []
+    for section, text in documents:
+        keywords = [k for k, pattern in _DEBUNK_PATTERNS.items() if pattern.search(text)]
+        if not keywords:
+            continue
+        document_score = min(1.0, sum(DEBUNK_KEYWORD_WEIGHTS[k] for k in keywords))
+        score += document_score * DEBUNK_SECTION_WEIGHTS.get(section, 1.0)
+        matches.append({"section": section, "text": text, "keywords": keywords})
+    return {"debunk_score": round(score, 2), "debunk_documents": len(matches), "matches": matches}
+
+def _rule_matches(rule: dict, intent: str, user_query: str, signals: dict, authenticity: dict) -> bool:
+    """Checks every condition present in a rule; absent conditions are ignored."""
+    query = user_query.lower()
+    if "intent" in rule and rule["intent"] != intent:
+        return False
+    if signals["debunk_score"] < rule.get("min_debunk_score", 0):
+        return False
+    if signals["debunk_documents"] < rule.get("min_debunk_documents", 0):
+        return False
+    if "detector_verdict" in rule and authenticity.get("verdict") != rule["detector_verdict"]:
+        return False
+    if (authenticity.get("confidence") or 0) < rule.get("min_detector_confidence", 0):
+        return False
+    if "query_keywords_any" in rule and not any(_keyword_pattern(k).search(query) for k in rule["query_keywords_any"]):
+        return False
+    if any(_keyword_pattern(k).search(query) for k in rule.get("query_keywords_none", [])):
+        return False
+    return True
+
+def _apply_deterministic_rules(intent: str, user_query: str, signals: dict, authenticity: dict) -> dict | None:
+    """
+    Returns the verdict of the first rule in DETERMINISTIC_RULES that fires, or None if the case is ambiguous.
+    """
+    for rule in DETERMINISTIC_RULES:
+        if not _rule_matches(rule, intent, user_query, signals, authenticity):
+            continue
+        reasons = []
+        if signals["debunk_documents"]:
+            examples = "; ".join(f"'{m['text'][:120]}'" for m in signals["matches"][:3])
+            reasons.append(
+                f"{signals['debunk_documents']} web sources contain debunking language "
+                f"(score {signals['debunk_score']}), e.g. {examples}."
+            )
+        if "detector_verdict" in rule:
+            reasons.append(
+                f"The pixel-level detector classified the image as '{authenticity.get('verdict')}' "
+                f"with {authenticity.get('confidence')} confidence."
+            )
+        return {
+            **rule["verdict"],
+            "explanation": f"Decided by deterministic rule '{rule['name']}' without AI synthesis. " + " ".join(reasons),
+            "decided_by": "deterministic",
+            "rule": rule["name"],
+        }
+    return None
+
+@traced("image_synthesis")
 def synthesize_image_evidence(user_query: str, analysis_report: dict) -> dict:
     """
     Uses a definitive "Deterministic-Guided Synthesis" architecture for maximum reliability.
@@ -60,24 +150,65 @@ def synthesize_image_evidence(user_query: str, analysis_report: dict) -> dict:
     sources = analysis_report.get("online_history", {}).get("source_results", [])
     thematic_search = analysis_report.get("thematic_search", [])
 
-    online_history_summary = "No significant online history found."
-    if isinstance(sources, list) and len(sources) > 0:
-        online_history_summary = "\n- ".join([f"'{r.get('title', '')}'" for r in sources])
+    titles = [f"'{r.get('title', '')}'" for r in sources] if isinstance(sources, list) else []
+    snippets = thematic_search if isinstance(thematic_search, list) else []
 
-    thematic_search_summary = "No thematic search results found for the text in the image."
-    if isinstance(thematic_search, list) and len(thematic_search) > 0:
-        thematic_search_summary = "\n- ".join(thematic_search)
-    
     # --- STAGE 1: INTENT RECOGNITION (DETERMINISTIC) ---
     intent = "NEWS_CONTENT"
     authenticity_keywords = ["photo", "image", "real", "ai", "fake", "photoshop", "generated", "doctored", "is this photo real"]
     if any(keyword in user_query.lower() for keyword in authenticity_keywords):
         intent = "IMAGE_AUTHENTICITY"
     
-    # --- STAGE 2: GUIDED REASONING (SINGLE, POWERFUL PROMPT) ---
+    # --- STAGE 2: DETERMINISTIC FAST PATH ---
+    # Conclusive red flags (widely debunked, unmistakably AI-generated) are decided without the LLM.
+    signals = _score_debunk_signals(sources, thematic_search)
+    if DETERMINISTIC_FAST_PATH_ENABLED:
+        fast_verdict = _apply_deterministic_rules(intent, user_query, signals, authenticity)
+        if fast_verdict:
+            logger.info(f"Deterministic rule '{fast_verdict['rule']}' fired; skipping the LLM call.")
+            increment("deterministic_verdicts_total", rule=fast_verdict["rule"])
+            return fast_verdict
+
+    # --- STAGE 3: GUIDED REASONING (SINGLE, POWERFUL PROMPT) ---
     system_prompt = "You are a world-class multimodal fact-checking analyst. You must follow all instructions and the output format precisely."
+
+    # The OCR text is what the user is asking about, then the reverse-search hits, then the
+    # thematic snippets; whatever doesn't fit the model's budget is truncated or left out.
+    skeleton = _case_file_prompt(user_query, intent, "", "", authenticity, "")
+    fitted = fit_prompt("image_synthesis", LLM_VERIFIER_MODEL, system_prompt + skeleton, [
+        prompt_section("ocr_text", [str(ocr_text)], priority=0, max_item_tokens=PROMPT_OCR_MAX_TOKENS),
+        prompt_section("online_history", titles, priority=1, max_item_tokens=PROMPT_TITLE_MAX_TOKENS),
+        prompt_section("thematic_search", snippets, priority=2, max_item_tokens=PROMPT_SNIPPET_MAX_TOKENS),
+    ])
+    kept = fitted["sections"]
+
+    online_history_summary = "No significant online history found."
+    if kept["online_history"]:
+        online_history_summary = "\n- ".join(kept["online_history"]) + _omitted_note(len(titles) - len(kept["online_history"]))
+
+    thematic_search_summary = "No thematic search results found for the text in the image."
+    if kept["thematic_search"]:
+        thematic_search_summary = "\n- ".join(kept["thematic_search"]) + _omitted_note(len(snippets) - len(kept["thematic_search"]))
+
+    user_prompt = _case_file_prompt(
+        user_query, intent, online_history_summary, thematic_search_summary, authenticity,
+        kept["ocr_text"][0] if kept["ocr_text"] else ""
+    )
+
+    response_text = _call_groq_api(system_prompt, user_prompt)
     
-    user_prompt = f"""
+    if "ERROR:" in response_text:
+        return {"final_verdict": "ERROR", "explanation": response_text}
+        
+    return {**_parse_final_report(response_text), "decided_by": "llm", "rule": None}
+
+def _omitted_note(count: int) -> str:
+    return f"\n- ({count} more results omitted)" if count > 0 else ""
+
+def _case_file_prompt(user_query: str, intent: str, online_history_summary: str, thematic_search_summary: str,
+                      authenticity: dict, ocr_text: str) -> str:
+    """Renders the CASE FILE prompt for the synthesis call."""
+    return f"""
     **CASE FILE:**
     - **User's Question:** "{user_query}"
     - **Detected User Intent:** {intent}
@@ -99,11 +230,4 @@ def synthesize_image_evidence(user_query: str, analysis_report: dict) -> dict:
     [Your full, step-by-step reasoning and explanation for your conclusion.]
     
     OVERALL CONCLUSION: [One of: SUPPORTED, REFUTED, UNCERTAIN, MISLEADING]
-    """
-    
-    response_text = _call_groq_api(system_prompt, user_prompt)
-    
-    if "ERROR:" in response_text:
-        return {"final_verdict": "ERROR", "explanation": response_text}
-        
-    return _parse_final_report(response_text)
\ No newline at end of file
+    """
\ No newline at end of file
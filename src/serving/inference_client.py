@@ -0,0 +1,117 @@
+# src/serving/inference_client.py
+import base64
+import http.client
+import json
+import socket
+import threading
+from urllib.parse import urlparse
+import numpy as np
+from PIL import Image
+from src.utils.config import INFERENCE_SERVER_URL, INFERENCE_SERVER_TIMEOUT_SECONDS
+from src.utils.logging import external_call
+
+# Cleared by the inference server itself, which must run the models rather than call itself.
+_server_url = INFERENCE_SERVER_URL
+_local = threading.local()
+
+
+def enabled() -> bool:
+    """Whether model inference goes to the inference server instead of in-process models."""
+    return bool(_server_url)
+
+
+def disable() -> None:
+    """Makes this process run the models itself, whatever INFERENCE_SERVER_URL says."""
+    global _server_url
+    _server_url = ""
+
+
+def parse_server_url(url: str) -> tuple[str, str | tuple[str, int]]:
+    """
+    Splits an inference server URL into ("unix", socket_path) or ("tcp", (host, port)).
+    """
+    parsed = urlparse(url)
+    if parsed.scheme == "unix":
+        return "unix", parsed.path
+    return "tcp", (parsed.hostname or "127.0.0.1", parsed.port or 8765)
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self._path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._path)
+
+
+def _connection() -> http.client.HTTPConnection:
+    # One keep-alive connection per thread; http.client connections are not thread-safe.
+    connection = getattr(_local, "connection", None)
+    if connection is None:
+        kind, address = parse_server_url(_server_url)
+        if kind == "unix":
+            connection = _UnixHTTPConnection(address, INFERENCE_SERVER_TIMEOUT_SECONDS)
+        else:
+            connection = http.client.HTTPConnection(*address, timeout=INFERENCE_SERVER_TIMEOUT_SECONDS)
+        _local.connection = connection
+    return connection
+
+
+def _post(endpoint: str, payload: dict) -> list:
+    """
+    Sends one request to the inference server and returns its "results" list.
+    Raises RuntimeError if the server can't be reached or reports an error.
+    """
+    body = json.dumps(payload).encode("utf-8")
+    with external_call("inference_server") as call:
+        # A kept-alive connection the server has since closed fails on first use; reconnect once.
+        for attempt in range(2):
+            connection = _connection()
+            try:
+                connection.request("POST", f"/{endpoint}", body=body, headers={"Content-Type": "application/json"})
+                response = connection.getresponse()
+                data = json.loads(response.read() or b"{}")
+                break
+            except (http.client.HTTPException, ConnectionError, OSError, ValueError) as e:
+                connection.close()
+                _local.connection = None
+                if attempt == 1 or isinstance(e, (TimeoutError, ValueError)):
+                    call["outcome"] = "error"
+                    raise RuntimeError(f"Inference server at {_server_url} is unreachable: {e}") from e
+        if response.status != 200:
+            call["outcome"] = "error"
+            raise RuntimeError(f"Inference server error on /{endpoint} ({response.status}): {data.get('error')}")
+    return data["results"]
+
+
+def encode_image(image: Image.Image | np.ndarray) -> dict:
+    """Packs a decoded RGB image as raw pixels, so the server sees exactly what the client decoded."""
+    array = np.ascontiguousarray(np.asarray(image, dtype=np.uint8))
+    return {"shape": list(array.shape), "data": base64.b64encode(array.tobytes()).decode("ascii")}
+
+
+def decode_image(payload: dict) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(payload["data"]), dtype=np.uint8).reshape(payload["shape"])
+
+
+def generate_captions(images: list[Image.Image]) -> list[str]:
+    """Captions for images already downscaled for the captioner (LoadedImage.caption_image)."""
+    return _post("caption", {"images": [encode_image(image) for image in images]})
+
+
+def extract_text(arrays: list[np.ndarray]) -> list[str]:
+    """OCR text for OCR-sized RGB arrays (LoadedImage.ocr_array)."""
+    return _post("ocr", {"images": [encode_image(array) for array in arrays]})
+
+
+def classify_authenticity(images: list[Image.Image]) -> list[dict]:
+    """Authenticity reports for images downscaled for the detector (LoadedImage.detector_image)."""
+    return _post("authenticity", {"images": [encode_image(image) for image in images]})
+
+
+def classify_stance_pairs(pairs: list[tuple[str, str]]) -> list[dict]:
+    """NLI stance results for (claim, snippet) pairs, as classify_stance_pairs returns them."""
+    return _post("nli", {"pairs": [list(pair) for pair in pairs]})
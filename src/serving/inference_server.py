@@ -0,0 +1,226 @@
+# src/serving/inference_server.py
+"""
+Local inference server: one process owns the captioning, OCR, authenticity and NLI models and
+serves every app process on the machine.
+
+Each endpoint has a MicroBatcher, so concurrent requests from different sessions are coalesced
+into one batched model call. OCR is the exception: EasyOCR reads one image at a time, so its
+endpoint only serializes requests. Clients reach it through src/serving/inference_client.py, which
+the vision and NLI modules use automatically when INFERENCE_SERVER_URL is set.
+
+Usage:
+    python -m src.serving.inference_server --url unix:///tmp/factcheck-inference.sock
+    INFERENCE_SERVER_URL=http://127.0.0.1:8765 python -m src.serving.inference_server
+"""
+import argparse
+import json
+import os
+import socketserver
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from PIL import Image
+from src.utils.config import (
+    INFERENCE_SERVER_URL,
+    INFERENCE_SERVER_MODELS,
+    INFERENCE_SERVER_MAX_BATCH,
+    INFERENCE_SERVER_MAX_WAIT_MS,
+    INFERENCE_SERVER_TIMEOUT_SECONDS,
+    MODEL_WARMUP,
+)
+from src.serving import inference_client
+from src.serving.micro_batcher import MicroBatcher
+from src.utils.model_registry import warmup_models, get_model, model_status
+from src.utils.logging import get_logger, render_prometheus
+
+logger = get_logger("InferenceServer")
+
+DEFAULT_URL = "http://127.0.0.1:8765"
+
+
+# The batch functions get the pixels exactly as the client decoded and sized them, so they call
+# the models directly instead of going back through load_image (which would re-encode each
+# image just to hash it).
+
+def _require_model(name: str):
+    model = get_model(name)
+    if model is None:
+        raise RuntimeError(f"Model '{name}' is not available.")
+    return model
+
+
+def _caption_batch(arrays: list) -> list[str]:
+    from src.vision.captioning import run_captioner
+    return run_captioner(_require_model("captioner"), [Image.fromarray(array) for array in arrays])
+
+
+def _ocr_batch(arrays: list) -> list[str]:
+    # OCR is sequential: EasyOCR has no batched recognizer for images of different sizes, so the
+    # "batch" only serializes access to the reader. Its batcher doesn't wait for more items.
+    from src.vision.ocr import read_text
+    reader = _require_model("ocr_reader")
+    texts = []
+    for array in arrays:
+        try:
+            texts.append(read_text(reader, array))
+        except Exception as e:
+            texts.append(f"An error occurred during OCR processing: {e}")
+    return texts
+
+
+def _authenticity_batch(arrays: list) -> list[dict]:
+    from src.vision.manipulation_detector import run_detector
+    return run_detector(_require_model("authenticity_detector"), [Image.fromarray(array) for array in arrays])
+
+
+def _nli_batch(pairs: list) -> list[dict]:
+    from src.text.ml_verifier import run_stance_model
+    return run_stance_model(_require_model("nli"), [tuple(pair) for pair in pairs])
+
+
+# endpoint -> (request field, decoder for one item, batch function)
+ENDPOINTS = {
+    "caption": ("images", inference_client.decode_image, _caption_batch),
+    "ocr": ("images", inference_client.decode_image, _ocr_batch),
+    "authenticity": ("images", inference_client.decode_image, _authenticity_batch),
+    "nli": ("pairs", tuple, _nli_batch),
+}
+# Endpoints whose batch function runs item by item, so holding a batch open only adds latency.
+SEQUENTIAL_ENDPOINTS = {"ocr"}
+
+_batchers = {}
+
+
+class _InferenceHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        if path == "/health":
+            self._send_json(200, {
+                "models": model_status(),
+                "batchers": {name: batcher.stats() for name, batcher in _batchers.items()},
+            })
+        elif path == "/metrics":
+            body = render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._send_json(404, {"error": f"Unknown path '{path}'."})
+
+    def do_POST(self):
+        endpoint = self.path.split("?")[0].strip("/")
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        except ValueError as e:
+            self._send_json(400, {"error": f"Invalid JSON: {e}"})
+            return
+        if endpoint not in ENDPOINTS:
+            self._send_json(404, {"error": f"Unknown endpoint '{endpoint}'. Expected one of {list(ENDPOINTS)}."})
+            return
+
+        field, decode, _ = ENDPOINTS[endpoint]
+        try:
+            items = [decode(item) for item in payload.get(field, [])]
+        except Exception as e:
+            self._send_json(400, {"error": f"Invalid '{field}': {e}"})
+            return
+        # Every item joins the endpoint's queue on its own, so it can share a batch with other sessions' items.
+        futures = [_batchers[endpoint].submit(item) for item in items]
+        try:
+            results = [future.result(timeout=INFERENCE_SERVER_TIMEOUT_SECONDS) for future in futures]
+        except Exception as e:
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+            return
+        self._send_json(200, {"results": results})
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _UnixInferenceServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        # BaseHTTPRequestHandler expects a (host, port) client address.
+        request, _ = super().get_request()
+        return request, ("unix", 0)
+
+
+def start_inference_server(url: str = INFERENCE_SERVER_URL or DEFAULT_URL,
+                           max_batch_size: int = INFERENCE_SERVER_MAX_BATCH,
+                           max_wait_ms: float = INFERENCE_SERVER_MAX_WAIT_MS,
+                           warmup: bool = MODEL_WARMUP):
+    """
+    Loads the served models and starts serving them from a daemon thread.
+
+    Args:
+        url: "http://host:port" or "unix:///path/to/socket".
+        max_batch_size: Maximum items per micro-batch.
+        max_wait_ms: How long a micro-batch waits for more items after its first one.
+        warmup: Whether to run a dummy inference on each model before accepting requests.
+
+    Returns:
+        The running server; call shutdown() on it to stop.
+    """
+    # This process is the server: the modules must use their own models, not call back into it.
+    inference_client.disable()
+    for module in ("src.vision.captioning", "src.vision.ocr", "src.vision.manipulation_detector", "src.text.ml_verifier"):
+        __import__(module)
+    if warmup:
+        status = warmup_models(INFERENCE_SERVER_MODELS)
+    else:
+        status = {name: get_model(name) is not None for name in INFERENCE_SERVER_MODELS}
+    for name, loaded in status.items():
+        if not loaded:
+            logger.warning(f"Model '{name}' failed to load; its endpoint will return errors until it does.")
+
+    for endpoint, (_, _, batch_fn) in ENDPOINTS.items():
+        if endpoint not in _batchers:
+            max_wait_seconds = 0 if endpoint in SEQUENTIAL_ENDPOINTS else max_wait_ms / 1000
+            _batchers[endpoint] = MicroBatcher(endpoint, batch_fn, max_batch_size, max_wait_seconds)
+
+    kind, address = inference_client.parse_server_url(url)
+    if kind == "unix":
+        if os.path.exists(address):
+            os.unlink(address)
+        server = _UnixInferenceServer(address, _InferenceHandler)
+    else:
+        server = ThreadingHTTPServer(address, _InferenceHandler)
+        server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="inference-server", daemon=True).start()
+    logger.info(f"Serving {list(ENDPOINTS)} on {url} (micro-batches of up to {max_batch_size}, {max_wait_ms} ms window).")
+    return server
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Serve the local models to every app process on this machine.")
+    parser.add_argument("--url", default=INFERENCE_SERVER_URL or DEFAULT_URL,
+                        help="http://host:port or unix:///path/to/socket (default: INFERENCE_SERVER_URL).")
+    parser.add_argument("--max-batch-size", type=int, default=INFERENCE_SERVER_MAX_BATCH)
+    parser.add_argument("--max-wait-ms", type=float, default=INFERENCE_SERVER_MAX_WAIT_MS)
+    parser.add_argument("--no-warmup", action="store_true")
+    args = parser.parse_args()
+
+    server = start_inference_server(args.url, args.max_batch_size, args.max_wait_ms, warmup=not args.no_warmup)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        logger.info("Shutting down.")
+        server.shutdown()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
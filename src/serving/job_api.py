@@ -0,0 +1,314 @@
+# src/serving/job_api.py
+"""
+Headless job API for text and image checks.
+
+A check is submitted as a job and answered at once with a job id; per-type worker pools run the
+pipelines in the background and the client polls for the result. Jobs are queued in SQLite, so
+queued work survives a restart, and finished results are kept for JOB_RESULT_TTL_SECONDS.
+
+Endpoints:
+    POST /jobs/text    {"text": "..."}                               -> 202 {"job_id", "status_url", ...}
+    POST /jobs/image   {"image_base64": "...", "query": "..."}        -> 202
+                       or the raw image bytes with ?query=... and an image/* Content-Type
+    GET  /jobs/<id>    -> status ("queued", "running", "succeeded", "failed") and, when done, the result
+    GET  /health       -> queue counts and worker pool sizes
+    GET  /metrics      -> Prometheus metrics
+
+A full queue answers 429 with a Retry-After estimate. With JOB_API_TOKEN set, every request
+needs an "Authorization: Bearer <token>" header.
+
+Usage:
+    python -m src.serving.job_api --port 8080
+"""
+import argparse
+import base64
+import binascii
+import hmac
+import json
+import math
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+from src.utils.config import (
+    JOB_API_HOST,
+    JOB_API_PORT,
+    JOB_API_TOKEN,
+    JOB_QUEUE_PATH,
+    JOB_WORKERS,
+    JOB_MAX_PENDING,
+    JOB_RESULT_TTL_SECONDS,
+    JOB_MAX_RUN_SECONDS,
+    JOB_MAX_ATTEMPTS,
+    JOB_POLL_INTERVAL_SECONDS,
+    JOB_MAX_REQUEST_BYTES,
+)
+from src.serving.job_queue import JobQueue
+from src.utils.logging import get_logger, span, increment, observe, set_gauge, render_prometheus
+
+logger = get_logger("JobAPI")
+
+# Seconds between expiry/stale-job sweeps.
+MAINTENANCE_INTERVAL_SECONDS = 60
+
+
+def _run_text_job(payload: dict):
+    from src.pipeline import run_text_verification_pipeline
+    return {"results": run_text_verification_pipeline(payload["text"])}
+
+
+def _run_image_job(payload: dict):
+    from src.pipeline import run_image_verification_pipeline
+    return {"report": run_image_verification_pipeline(base64.b64decode(payload["image_base64"]), payload["query"])}
+
+
+JOB_RUNNERS = {"text": _run_text_job, "image": _run_image_job}
+
+
+class JobService:
+    """
+    The queue plus its worker pools: JOB_WORKERS[type] threads per job type, so slow image checks
+    can't starve text checks. Workers are woken as soon as a job is submitted to this process and
+    otherwise poll the shared queue every JOB_POLL_INTERVAL_SECONDS.
+    """
+
+    def __init__(self, queue: JobQueue, workers: dict = JOB_WORKERS, max_pending: dict = JOB_MAX_PENDING):
+        self.queue = queue
+        self.workers = workers
+        self.max_pending = max_pending
+        self._wakeups = {job_type: threading.Condition() for job_type in JOB_RUNNERS}
+        # Moving average of run time per type, for the Retry-After estimate.
+        self._average_run_seconds = {job_type: None for job_type in JOB_RUNNERS}
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        self.queue.maintain()
+        for job_type, count in self.workers.items():
+            for i in range(count):
+                threading.Thread(target=self._work, args=(job_type,), name=f"job-{job_type}-{i}", daemon=True).start()
+        threading.Thread(target=self._maintain, name="job-maintenance", daemon=True).start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        for condition in self._wakeups.values():
+            with condition:
+                condition.notify_all()
+
+    def submit(self, job_type: str, payload: dict) -> str | None:
+        """Queues a job and wakes a worker. Returns the job id, or None if the queue is full."""
+        job_id = self.queue.submit(job_type, payload, self.max_pending[job_type])
+        if job_id is None:
+            increment("jobs_rejected_total", type=job_type)
+            return None
+        increment("jobs_submitted_total", type=job_type)
+        with self._wakeups[job_type]:
+            self._wakeups[job_type].notify()
+        return job_id
+
+    def retry_after(self, job_type: str) -> int:
+        """Rough seconds until a queue slot frees up: one job's run time spread across the pool."""
+        average = self._average_run_seconds[job_type] or 10
+        return max(1, math.ceil(average / max(1, self.workers.get(job_type, 1))))
+
+    def _work(self, job_type: str) -> None:
+        while not self._stop.is_set():
+            try:
+                job = self.queue.claim(job_type)
+            except Exception as e:
+                logger.error(f"Could not claim a {job_type} job: {e}")
+                job = None
+            if job is None:
+                with self._wakeups[job_type]:
+                    self._wakeups[job_type].wait(JOB_POLL_INTERVAL_SECONDS)
+                continue
+            self._run(job)
+
+    def _run(self, job: dict) -> None:
+        job_type = job["type"]
+        observe("job_queue_wait_seconds", job["started_at"] - job["created_at"], type=job_type)
+        start = time.perf_counter()
+        try:
+            with span("job", type=job_type, job_id=job["id"]):
+                result = JOB_RUNNERS[job_type](job["payload"])
+            recorded = self.queue.complete(job["id"], job["lease"], result)
+            outcome = "succeeded"
+        except Exception as e:
+            logger.error(f"{job_type} job {job['id']} failed: {e}")
+            recorded = self.queue.fail(job["id"], job["lease"], f"{type(e).__name__}: {e}")
+            outcome = "failed"
+        if not recorded:
+            # The run outlived JOB_MAX_RUN_SECONDS and the job was handed to another worker or failed.
+            logger.warning(f"{job_type} job {job['id']} finished after its lease expired; its outcome was discarded.")
+            outcome = "superseded"
+        elapsed = time.perf_counter() - start
+        previous = self._average_run_seconds[job_type]
+        self._average_run_seconds[job_type] = elapsed if previous is None else 0.8 * previous + 0.2 * elapsed
+        observe("job_run_seconds", elapsed, type=job_type)
+        increment("jobs_finished_total", type=job_type, outcome=outcome)
+
+    def _maintain(self) -> None:
+        while not self._stop.wait(MAINTENANCE_INTERVAL_SECONDS):
+            self.queue.maintain()
+            for job_type, statuses in self.queue.counts().items():
+                set_gauge("jobs_queued", statuses.get("queued", 0), type=job_type)
+
+
+def _parse_text_job(body: bytes, content_type: str, params: dict) -> dict:
+    payload = json.loads(body or b"{}")
+    text = payload.get("text") if isinstance(payload, dict) else None
+    if not isinstance(text, str) or not text.strip():
+        raise ValueError("Expected a JSON body with a non-empty 'text'.")
+    return {"text": text}
+
+
+def _parse_image_job(body: bytes, content_type: str, params: dict) -> dict:
+    if content_type.startswith("image/") or content_type == "application/octet-stream":
+        if not body:
+            raise ValueError("The request body is empty.")
+        image_base64, query = base64.b64encode(body).decode("ascii"), params.get("query", [""])[0]
+    else:
+        payload = json.loads(body or b"{}")
+        if not isinstance(payload, dict) or not isinstance(payload.get("image_base64"), str):
+            raise ValueError("Expected raw image bytes or a JSON body with 'image_base64' and 'query'.")
+        image_base64, query = payload["image_base64"], payload.get("query", "")
+        try:
+            base64.b64decode(image_base64, validate=True)
+        except binascii.Error as e:
+            raise ValueError(f"'image_base64' is not valid base64: {e}")
+    if not isinstance(query, str) or not query.strip():
+        raise ValueError("A non-empty 'query' about the image is required.")
+    return {"image_base64": image_base64, "query": query}
+
+
+JOB_PARSERS = {"text": _parse_text_job, "image": _parse_image_job}
+
+
+def _make_handler(service: JobService):
+    class _JobHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send_json(self, status: int, payload: dict, headers: dict | None = None) -> None:
+            body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _authorized(self) -> bool:
+            if not JOB_API_TOKEN:
+                return True
+            supplied = self.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+            if hmac.compare_digest(supplied.encode("utf-8"), JOB_API_TOKEN.encode("utf-8")):
+                return True
+            self._send_json(401, {"error": "Missing or invalid bearer token."})
+            return False
+
+        def do_GET(self):
+            if not self._authorized():
+                return
+            path = urlparse(self.path).path.rstrip("/")
+            if path == "/health":
+                self._send_json(200, {"queue": service.queue.counts(), "workers": service.workers})
+            elif path == "/metrics":
+                body = render_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            elif path.startswith("/jobs/"):
+                job = service.queue.get(path.removeprefix("/jobs/"))
+                if job is None:
+                    self._send_json(404, {"error": "Unknown or expired job."})
+                else:
+                    self._send_json(200, job)
+            else:
+                self._send_json(404, {"error": f"Unknown path '{path}'."})
+
+        def do_POST(self):
+            if not self._authorized():
+                return
+            url = urlparse(self.path)
+            job_type = url.path.rstrip("/").removeprefix("/jobs/")
+            if job_type not in JOB_PARSERS:
+                self._send_json(404, {"error": f"Unknown job type. Expected one of {list(JOB_PARSERS)}."})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+            except ValueError:
+                length = -1
+            if length < 0:
+                self.close_connection = True
+                self._send_json(400, {"error": "Invalid Content-Length header."})
+                return
+            if length > JOB_MAX_REQUEST_BYTES:
+                self.close_connection = True
+                self._send_json(413, {"error": f"Request body exceeds {JOB_MAX_REQUEST_BYTES} bytes."})
+                return
+            body = self.rfile.read(length)
+            content_type = self.headers.get("Content-Type", "application/json").split(";")[0].strip().lower()
+            try:
+                payload = JOB_PARSERS[job_type](body, content_type, parse_qs(url.query))
+            except ValueError as e:
+                self._send_json(400, {"error": str(e)})
+                return
+
+            job_id = service.submit(job_type, payload)
+            if job_id is None:
+                retry_after = service.retry_after(job_type)
+                self._send_json(429, {"error": f"The {job_type} queue is full; retry later.", "retry_after": retry_after},
+                                headers={"Retry-After": str(retry_after)})
+                return
+            self._send_json(202, {"job_id": job_id, "status": "queued", "status_url": f"/jobs/{job_id}"},
+                            headers={"Location": f"/jobs/{job_id}"})
+
+        def log_message(self, format, *args):
+            pass
+
+    return _JobHandler
+
+
+def start_job_api(host: str = JOB_API_HOST, port: int = JOB_API_PORT, queue_path: str = JOB_QUEUE_PATH):
+    """
+    Starts the worker pools and serves the job API from a daemon thread.
+
+    Returns:
+        (server, service); call server.shutdown() and service.stop() to stop.
+    """
+    service = JobService(JobQueue(queue_path, JOB_RESULT_TTL_SECONDS, JOB_MAX_RUN_SECONDS, JOB_MAX_ATTEMPTS))
+    service.start()
+    server = ThreadingHTTPServer((host, port), _make_handler(service))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="job-api", daemon=True).start()
+    logger.info(f"Job API listening on http://{host}:{port} with workers {service.workers}.")
+    return server, service
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Headless job API for text and image checks.")
+    parser.add_argument("--host", default=JOB_API_HOST)
+    parser.add_argument("--port", type=int, default=JOB_API_PORT)
+    parser.add_argument("--preload", action="store_true", help="Load the models before accepting jobs.")
+    args = parser.parse_args()
+
+    if args.preload:
+        # Importing the pipeline registers every model it uses.
+        import src.pipeline  # noqa: F401
+        from src.utils.model_registry import preload_models
+        preload_models("all")
+    server, service = start_job_api(args.host, args.port)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        logger.info("Shutting down.")
+        server.shutdown()
+        service.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+# src/serving/job_queue.py
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from src.utils.logging import get_logger
+
+logger = get_logger("JobQueue")
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+
+
+class JobQueue:
+    """
+    A persistent job queue stored in a single SQLite file.
+
+    Jobs move from queued to running (claimed by exactly one worker) to succeeded or failed.
+    Finished jobs keep their result until their expiry time. Claims run in IMMEDIATE
+    transactions and the database uses WAL mode, so several API processes can share one file.
+    A job left running by a crashed process is queued again after max_run_seconds, up to
+    max_attempts times. Each claim gets a new lease token, and a result is only stored under the
+    lease that is still current, so a slow run that was requeued can't overwrite the newer one.
+    """
+
+    def __init__(self, path: str, result_ttl: float, max_run_seconds: float, max_attempts: int):
+        self.path = path
+        self.result_ttl = result_ttl
+        self.max_run_seconds = max_run_seconds
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, type TEXT NOT NULL, status TEXT NOT NULL, payload TEXT, "
+                "result TEXT, error TEXT, attempts INTEGER NOT NULL DEFAULT 0, created_at REAL NOT NULL, "
+                "started_at REAL, finished_at REAL, expires_at REAL, lease TEXT)"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(jobs)")}
+            if "lease" not in columns:
+                # Queue files created before leases existed.
+                conn.execute("ALTER TABLE jobs ADD COLUMN lease TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_pending ON jobs (type, status, created_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_expiry ON jobs (expires_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads, so each thread keeps its own.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self, work):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = work(conn)
+            conn.execute("COMMIT")
+            return result
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def submit(self, job_type: str, payload: dict, max_pending: int) -> str | None:
+        """
+        Queues a job unless max_pending jobs of its type are already waiting.
+
+        Returns:
+            The new job id, or None if the queue for this type is full.
+        """
+        def insert(conn):
+            (pending,) = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE type = ? AND status = ?", (job_type, QUEUED)
+            ).fetchone()
+            if pending >= max_pending:
+                return None
+            job_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO jobs (id, type, status, payload, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, job_type, QUEUED, json.dumps(payload, ensure_ascii=False), time.time())
+            )
+            return job_id
+        return self._transaction(insert)
+
+    def claim(self, job_type: str) -> dict | None:
+        """
+        Marks the oldest queued job of a type as running and returns it with its payload and
+        lease token, or None if there is nothing to do.
+        """
+        def take(conn):
+            row = conn.execute(
+                "SELECT id, payload, created_at, attempts FROM jobs WHERE type = ? AND status = ? "
+                "ORDER BY created_at LIMIT 1", (job_type, QUEUED)
+            ).fetchone()
+            if row is None:
+                return None
+            job_id, payload, created_at, attempts = row
+            now, lease = time.time(), uuid.uuid4().hex
+            conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, attempts = ?, lease = ? WHERE id = ?",
+                (RUNNING, now, attempts + 1, lease, job_id)
+            )
+            return {
+                "id": job_id, "type": job_type, "payload": json.loads(payload),
+                "created_at": created_at, "started_at": now, "lease": lease,
+            }
+        return self._transaction(take)
+
+    def _finish(self, job_id: str, lease: str, status: str, result=None, error: str | None = None) -> bool:
+        now = time.time()
+        return self._connection().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, payload = NULL, finished_at = ?, expires_at = ?, "
+            "lease = NULL WHERE id = ? AND status = ? AND lease = ?",
+            (status, None if result is None else json.dumps(result, ensure_ascii=False, default=str),
+             error, now, now + self.result_ttl, job_id, RUNNING, lease)
+        ).rowcount == 1
+
+    def complete(self, job_id: str, lease: str, result) -> bool:
+        """
+        Stores a job's result. The payload (e.g. image bytes) is dropped, since it's no longer needed.
+
+        Returns:
+            False if the lease is no longer current (the job was requeued or failed as stale),
+            in which case nothing is stored.
+        """
+        return self._finish(job_id, lease, SUCCEEDED, result=result)
+
+    def fail(self, job_id: str, lease: str, error: str) -> bool:
+        """Marks a job as failed; like complete, only under its current lease."""
+        return self._finish(job_id, lease, FAILED, error=error)
+
+    def get(self, job_id: str) -> dict | None:
+        """
+        Returns a job's status, timestamps and (once finished) result or error,
+        or None if the job doesn't exist or has expired. Queued jobs report their queue position.
+        """
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT type, status, result, error, attempts, created_at, started_at, finished_at, expires_at "
+            "FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        job_type, status, result, error, attempts, created_at, started_at, finished_at, expires_at = row
+        if expires_at is not None and expires_at < time.time():
+            return None
+        job = {
+            "job_id": job_id, "type": job_type, "status": status, "attempts": attempts,
+            "created_at": created_at, "started_at": started_at, "finished_at": finished_at, "expires_at": expires_at,
+        }
+        if status == QUEUED:
+            (ahead,) = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE type = ? AND status = ? AND created_at < ?",
+                (job_type, QUEUED, created_at)
+            ).fetchone()
+            job["queue_position"] = ahead + 1
+        if status == SUCCEEDED:
+            job["result"] = json.loads(result)
+        if status == FAILED:
+            job["error"] = error
+        return job
+
+    def counts(self) -> dict:
+        """Number of live jobs per type and status."""
+        counts = {}
+        rows = self._connection().execute(
+            "SELECT type, status, COUNT(*) FROM jobs WHERE expires_at IS NULL OR expires_at >= ? GROUP BY type, status",
+            (time.time(),)
+        ).fetchall()
+        for job_type, status, count in rows:
+            counts.setdefault(job_type, {})[status] = count
+        return counts
+
+    def maintain(self) -> dict:
+        """
+        Deletes expired jobs and recovers jobs whose worker has been gone for more than
+        max_run_seconds: they are queued again, or failed once they've used max_attempts.
+
+        Returns:
+            How many jobs were purged, requeued and failed.
+        """
+        now = time.time()
+
+        def sweep(conn):
+            purged = conn.execute("DELETE FROM jobs WHERE expires_at < ?", (now,)).rowcount
+            stale = now - self.max_run_seconds
+            requeued = conn.execute(
+                "UPDATE jobs SET status = ?, started_at = NULL, lease = NULL "
+                "WHERE status = ? AND started_at < ? AND attempts < ?",
+                (QUEUED, RUNNING, stale, self.max_attempts)
+            ).rowcount
+            failed = conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, payload = NULL, finished_at = ?, expires_at = ?, lease = NULL "
+                "WHERE status = ? AND started_at < ?",
+                (FAILED, "The job did not finish in time.", now, now + self.result_ttl, RUNNING, stale)
+            ).rowcount
+            return {"purged": purged, "requeued": requeued, "failed": failed}
+
+        try:
+            swept = self._transaction(sweep)
+        except sqlite3.Error as e:
+            logger.warning(f"Maintenance failed for '{self.path}': {e}")
+            return {"purged": 0, "requeued": 0, "failed": 0}
+        if swept["requeued"] or swept["failed"]:
+            logger.warning(f"Recovered stale jobs: {swept['requeued']} requeued, {swept['failed']} failed.")
+        return swept
@@ -0,0 +1,88 @@
+# src/serving/micro_batcher.py
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from src.utils.logging import get_logger, span, increment, observe, set_gauge
+
+logger = get_logger("MicroBatcher")
+
+
+class MicroBatcher:
+    """
+    Coalesces items submitted from many threads into batches for one batch function.
+
+    A single worker thread takes the first waiting item, then keeps collecting until the batch
+    holds max_batch_size items or max_wait_seconds have passed since it started, and calls
+    batch_fn once for the whole batch. Under load batches fill immediately; an item arriving
+    alone waits at most max_wait_seconds. Calls to batch_fn never overlap, so the model behind it
+    is only ever used from the worker thread.
+    """
+
+    def __init__(self, name: str, batch_fn, max_batch_size: int, max_wait_seconds: float):
+        """
+        Args:
+            name: Endpoint name, used for the thread, spans and metric labels.
+            batch_fn: Callable taking a list of items and returning one result per item, in order.
+            max_batch_size: Maximum number of items per batch_fn call.
+            max_wait_seconds: How long a batch stays open for more items after its first one.
+        """
+        self.name = name
+        self._batch_fn = batch_fn
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_wait_seconds = max_wait_seconds
+        self._queue = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._stats = {"batches": 0, "items": 0, "largest_batch": 0}
+        threading.Thread(target=self._run, name=f"batcher-{name}", daemon=True).start()
+
+    def submit(self, item) -> Future:
+        """
+        Queues one item; the returned future resolves to its result (or the batch's exception).
+        """
+        future = Future()
+        self._queue.put((item, future, time.perf_counter()))
+        set_gauge("inference_queue_depth", self._queue.qsize(), endpoint=self.name)
+        return future
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            return {**self._stats, "queued": self._queue.qsize()}
+
+    def _collect(self) -> list:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self._max_wait_seconds
+        while len(batch) < self._max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+            for _, _, enqueued in batch:
+                observe("inference_queue_wait_seconds", started - enqueued, endpoint=self.name)
+            increment("inference_batches_total", endpoint=self.name)
+            increment("inference_batch_items_total", len(batch), endpoint=self.name)
+            set_gauge("inference_queue_depth", self._queue.qsize(), endpoint=self.name)
+            with self._stats_lock:
+                self._stats["batches"] += 1
+                self._stats["items"] += len(batch)
+                self._stats["largest_batch"] = max(self._stats["largest_batch"], len(batch))
+
+            try:
+                with span(f"{self.name}_micro_batch", batch_size=len(batch)):
+                    results = self._batch_fn([item for item, _, _ in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError(f"Batch function returned {len(results)} results for {len(batch)} items.")
+            except Exception as e:
+                logger.error(f"{self.name} batch of {len(batch)} failed: {e}")
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future, _), result in zip(batch, results):
+                future.set_result(result)
@@ -0,0 +1,199 @@
+# src/text/checkworthiness.py
+import math
+import re
+from src.utils.config import (
+    CHECKWORTHINESS_ENABLED,
+    CHECKWORTHINESS_THRESHOLD,
+    CHECKWORTHINESS_TOP_K,
+    CHECKWORTHINESS_MIN_KEEP,
+    CHECKWORTHINESS_MODEL,
+    CHECKWORTHINESS_POSITIVE_LABEL,
+)
+from src.utils.model_registry import register_model, get_model
+from src.utils.logging import get_logger, traced
+
+logger = get_logger("CheckWorthiness")
+
+# --- Built-in linear model ---
+# Check-worthy claims name specific entities, quantities and dates, or make a causal,
+# evaluative or "is/was" assertion; opinions, questions and chatter about the writer do not.
+# Each feature is in [0, 1] and the weighted sum goes through a sigmoid, so the score reads
+# like a probability. The weights are tuned on data/checkworthiness_claims.json and checked on
+# the held-out data/checkworthiness_heldout.json (scripts/check_checkworthiness.py): short,
+# well-known false claims ("Vaccines cause autism") must score above the default threshold.
+FEATURE_WEIGHTS = {
+    "has_number": 1.2,
+    "has_date": 0.6,
+    "has_quantity": 0.6,
+    "proper_noun_ratio": 2.0,
+    "factual_verb": 1.2,
+    "contested": 1.0,
+    "causal": 1.2,
+    "evaluative": 1.0,
+    "superlative": 0.5,
+    "opinion": -1.5,
+    "personal": -1.0,
+    "question": -2.0,
+    "too_short": -1.5,
+    "too_long": -0.5,
+}
+BIAS = -0.6
+
+_NUMBER = re.compile(r"\d")
+_DATE = re.compile(
+    r"\b(1[5-9]\d{2}|20\d{2}|january|february|march|april|may|june|july|august|september|october|november|december)\b",
+    re.IGNORECASE
+)
+_QUANTITY = re.compile(r"%|\b(percent|million|billion|trillion|thousand|dozens?|hundreds?|km|miles|kg|tons?)\b", re.IGNORECASE)
+_FACTUAL_VERB = re.compile(
+    r"\b(is|are|was|were|has|have|had|won|wins|killed|kills|died|dies|born|founded|located|"
+    r"causes?|caused|cures?|cured|prevents?|prevented|spreads?|contains?|contained|leads?|led|"
+    r"increased|increases|decreased|decreases|reduces?|reduced|grew|grows|fell|falls|rose|rises|left|joined|"
+    r"announced|signed|banned|approved|launched|reported|elected|built|invented|discovered|happened|plans?|planned)\b",
+    re.IGNORECASE
+)
+# Wording typical of conspiracy theories and hoaxes, which are worth checking however short they are.
+_CONTESTED = re.compile(r"\b(hoax|fake|faked|fraud|myth|conspiracy|cover-?up|never happened|staged)\b", re.IGNORECASE)
+# Generic cause and effect ("X makes you Y", "X raises Y"), the shape of most health and science claims.
+_CAUSAL = re.compile(
+    r"\b(makes?|made|causes?|caused|leads? to|led to|linked to|results? in|triggers?|boosts?|improves?|"
+    r"damages?|harms?|destroys?|kills?|raises?|lowers?|weakens?|strengthens?|cures?|prevents?|protects?)\b",
+    re.IGNORECASE
+)
+# Evaluative predicates about a thing ("is good for", "is safer than", "is toxic") rather than about the writer.
+_EVALUATIVE = re.compile(
+    r"\b(good|bad|safe|healthy|harmful|dangerous|toxic|deadly|effective|better|worse)\s+(for|to|than|against)\b|"
+    r"\b(more|less|fewer)\s+\w+\s+than\b|\b\w+er\s+than\b|"
+    r"\b(is|are|was|were)\s+(safe|unsafe|healthy|unhealthy|harmful|dangerous|toxic|deadly|poisonous|effective|ineffective)\b",
+    re.IGNORECASE
+)
+_SUPERLATIVE = re.compile(r"\b(first|last|only|largest|biggest|smallest|highest|lowest|longest|tallest|most|least|record)\b", re.IGNORECASE)
+_OPINION = re.compile(
+    r"\b(i think|i believe|i feel|in my opinion|maybe|perhaps|probably|might|should|beautiful|amazing|"
+    r"awesome|awful|terrible|love|hate|lol|wow)\b",
+    re.IGNORECASE
+)
+# First person only: "you" is usually generic in a claim ("Coffee is good for you").
+# Case-sensitive: "US" (the country) is not the pronoun "us".
+_PERSONAL = re.compile(r"\b(I|[Mm]e|[Mm]y|[Ww]e|[Oo]ur|us)\b")
+_WORD = re.compile(r"[A-Za-z][\w'’-]*")
+
+
+def _claim_features(claim: str) -> dict:
+    """
+    Computes the features of the linear check-worthiness model for one claim.
+    """
+    words = _WORD.findall(claim)
+    # The first word is capitalized anyway, so it doesn't count as a proper noun.
+    proper_nouns = sum(1 for word in words[1:] if word[0].isupper())
+    return {
+        "has_number": float(bool(_NUMBER.search(claim))),
+        "has_date": float(bool(_DATE.search(claim))),
+        "has_quantity": float(bool(_QUANTITY.search(claim))),
+        "proper_noun_ratio": min(1.0, proper_nouns / max(1, len(words) - 1)),
+        "factual_verb": float(bool(_FACTUAL_VERB.search(claim))),
+        "contested": float(bool(_CONTESTED.search(claim))),
+        "causal": float(bool(_CAUSAL.search(claim))),
+        "evaluative": float(bool(_EVALUATIVE.search(claim))),
+        "superlative": float(bool(_SUPERLATIVE.search(claim))),
+        "opinion": float(bool(_OPINION.search(claim))),
+        "personal": float(bool(_PERSONAL.search(claim))),
+        "question": float(claim.rstrip().endswith("?")),
+        # Fragments such as "So true." or "Lol same."; short assertions like "Vaccines cause autism" are fine.
+        "too_short": float(len(words) < 3),
+        "too_long": float(len(words) > 40),
+    }
+
+
+def _linear_score(claim: str) -> float:
+    features = _claim_features(claim)
+    logit = BIAS + sum(FEATURE_WEIGHTS[name] * value for name, value in features.items())
+    return 1 / (1 + math.exp(-logit))
+
+# --- Optional transformer model ---
+
+def _load_classifier():
+    """Loads the text-classification model configured in CHECKWORTHINESS_MODEL."""
+    if not CHECKWORTHINESS_MODEL:
+        raise RuntimeError("CHECKWORTHINESS_MODEL is not set.")
+    from transformers import pipeline
+    return pipeline("text-classification", model=CHECKWORTHINESS_MODEL, device=-1)
+
+def _warmup_classifier(classifier) -> None:
+    classifier(["The Eiffel Tower is in Paris."], top_k=None)
+
+register_model("checkworthiness", _load_classifier, _warmup_classifier)
+
+
+def _model_scores(classifier, claims: list[str]) -> list[float]:
+    outputs = classifier(claims, top_k=None, truncation=True)
+    return [
+        next((label["score"] for label in output if label["label"] == CHECKWORTHINESS_POSITIVE_LABEL), 0.0)
+        for output in outputs
+    ]
+
+
+def score_claims(claims: list[str]) -> tuple[list[float], bool]:
+    """
+    Scores how worth checking each claim is, from 0 (chatter, opinion) to 1 (specific factual claim).
+
+    Uses the transformer model in CHECKWORTHINESS_MODEL when one is configured and loads,
+    otherwise the built-in linear feature model.
+
+    Returns:
+        (scores, from_model): one score per claim, and whether the transformer model produced them.
+    """
+    if not claims:
+        return [], False
+    if CHECKWORTHINESS_MODEL:
+        classifier = get_model("checkworthiness")
+        if classifier is not None:
+            try:
+                return _model_scores(classifier, claims), True
+            except Exception as e:
+                logger.warning(f"Model scoring failed, falling back to the linear model: {e}")
+    return [_linear_score(claim) for claim in claims], False
+
+
+@traced("checkworthiness")
+def assess_checkworthiness(
+    claims: list[str],
+    threshold: float = CHECKWORTHINESS_THRESHOLD,
+    top_k: int = CHECKWORTHINESS_TOP_K,
+    min_keep: int = CHECKWORTHINESS_MIN_KEEP
+) -> list[dict]:
+    """
+    Ranks claims by check-worthiness and decides which ones to verify.
+
+    A claim is selected if its score reaches the threshold and it ranks within the top_k;
+    the min_keep best claims are always selected. With CHECKWORTHINESS_ENABLED off every claim
+    is selected without scoring. The built-in linear model is not reliable enough to drop claims,
+    so when it is the only scorer available the claims are ranked but all of them are selected.
+
+    Args:
+        claims: The extracted claims.
+        threshold: Minimum score for a claim to be verified.
+        top_k: Maximum number of claims to verify (0 = no limit).
+        min_keep: Number of best-ranked claims verified regardless of the threshold.
+
+    Returns:
+        One dictionary per claim, in input order, with 'score', 'rank' (1 = most check-worthy),
+        'selected' and, for unselected claims, the 'reason' they were skipped.
+    """
+    if not CHECKWORTHINESS_ENABLED:
+        return [{"score": None, "rank": None, "selected": True, "reason": None} for _ in claims]
+
+    scores, from_model = score_claims(claims)
+    if not from_model:
+        logger.debug("No check-worthiness model is available; ranking claims without skipping any.")
+    order = sorted(range(len(claims)), key=lambda i: scores[i], reverse=True)
+    assessments = [None] * len(claims)
+    for rank, i in enumerate(order, start=1):
+        reason = None
+        if from_model and rank > min_keep:
+            if scores[i] < threshold:
+                reason = f"Check-worthiness score {scores[i]:.2f} is below the threshold of {threshold:.2f}."
+            elif top_k and rank > top_k:
+                reason = f"Only the {top_k} most check-worthy claims are verified."
+        assessments[i] = {"score": round(scores[i], 4), "rank": rank, "selected": reason is None, "reason": reason}
+    return assessments
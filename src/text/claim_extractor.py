@@ -1,9 +1,15 @@
 # src/text/claim_extractor.py (Groq version using LLaMA3)
 
-import os
-import requests
-from src.utils.config import GROQ_API_KEY, CLAIM_EXTRACTION_MODEL
+from src.utils.config import CLAIM_EXTRACTION_MODEL
+from src.utils.groq_client import chat_completion
+from src.utils.logging import get_logger, traced
 
+logger = get_logger("ClaimExtractor")
+
+class ClaimExtractionError(RuntimeError):
+    """Raised when the claims can't be extracted because the LLM call failed."""
+
+@traced("claim_extraction")
 def extract_atomic_claims(text: str) -> list[str]:
     """
     Extracts atomic factual claims using Groq LLaMA3 or Mixtral LLMs.
@@ -12,7 +18,8 @@ def extract_atomic_claims(text: str) -> list[str]:
         text: User input text potentially containing multiple claims.
 
     Returns:
-        A list of atomic factual claims as strings.
+        A list of atomic factual claims as strings; empty if the text contains none.
+        Raises ClaimExtractionError if the Groq call fails.
     """
     system_prompt = (
         "You are an expert fact-checking assistant. Your task is to extract all clear, "
@@ -22,31 +29,16 @@ def extract_atomic_claims(text: str) -> list[str]:
         "Do not include any introductory phrases, numbering, or bullet points."
     )
 
-    url = "https://api.groq.com/openai/v1/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {GROQ_API_KEY}",
-        "Content-Type": "application/json"
-    }
-
-    payload = {
-        "model": CLAIM_EXTRACTION_MODEL,
-        "messages": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": f"Text to analyze:\n---\n{text}\n---"}
-        ],
-        "temperature": 0.2
-    }
-
-    try:
-        response = requests.post(url, headers=headers, json=payload)
-        response.raise_for_status()
-        result = response.json()
-        content = result["choices"][0]["message"]["content"]
-
-        # Parse by lines
-        claims = [line.strip() for line in content.split("\n") if line.strip()]
-        return claims
-
-    except Exception as e:
-        print(f"[Groq ClaimExtractor] Error: {e}")
-        return []
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": f"Text to analyze:\n---\n{text}\n---"}
+    ]
+
+    result = chat_completion(CLAIM_EXTRACTION_MODEL, messages, temperature=0.2)
+    if not result["ok"]:
+        logger.error(f"Error: {result['error']}")
+        raise ClaimExtractionError(result["error"])
+
+    # Parse by lines
+    claims = [line.strip() for line in result["content"].split("\n") if line.strip()]
+    return claims
@@ -0,0 +1,296 @@
+# src/text/claim_store.py
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import numpy as np
+from src.utils.config import (
+    CLAIM_STORE_ENABLED,
+    CLAIM_STORE_PATH,
+    CLAIM_EMBEDDING_MODEL,
+    CLAIM_SIMILARITY_THRESHOLD,
+    CLAIM_STORE_MAX_AGE_SECONDS,
+    CLAIM_STORE_CACHEABLE_VERDICTS,
+    CLAIM_STORE_ANN_MIN_SIZE,
+    CLAIM_STORE_MAX_ENTRIES,
+)
+from src.utils.model_registry import register_model, get_model
+from src.utils.logging import get_logger, traced, increment
+
+logger = get_logger("ClaimStore")
+
+# Once the store exceeds CLAIM_STORE_MAX_ENTRIES it is trimmed this far below it, so the next syncs don't trim again.
+TRIM_HEADROOM = 0.1
+
+# Negations and numbers change a claim's meaning while barely moving its embedding.
+_NEGATION_CUES = re.compile(r"\b(?:not|no|never|none|nobody|nothing|neither|nor|without|cannot)\b|n't\b", re.IGNORECASE)
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+
+# Optional dependency: approximate nearest-neighbour search for large stores.
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+def _load_claim_embedder():
+    """Loads the sentence-embedding model (tokenizer + encoder) used to compare claims."""
+    from transformers import AutoTokenizer, AutoModel
+    tokenizer = AutoTokenizer.from_pretrained(CLAIM_EMBEDDING_MODEL)
+    model = AutoModel.from_pretrained(CLAIM_EMBEDDING_MODEL).eval()
+    return tokenizer, model
+
+def _warmup_claim_embedder(embedder) -> None:
+    _encode(embedder, ["The Eiffel Tower is in Paris."])
+
+register_model("claim_embedder", _load_claim_embedder, _warmup_claim_embedder)
+
+def _encode(embedder, texts: list[str]) -> np.ndarray:
+    """Mean-pooled, L2-normalised sentence embeddings, so a dot product is the cosine similarity."""
+    import torch
+
+    tokenizer, model = embedder
+    batch = tokenizer(texts, padding=True, truncation=True, max_length=128, return_tensors="pt")
+    with torch.inference_mode():
+        hidden = model(**batch).last_hidden_state
+    mask = batch["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+    pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+    pooled = torch.nn.functional.normalize(pooled, p=2, dim=1)
+    return pooled.cpu().numpy().astype(np.float32)
+
+def _is_negated(claim: str) -> bool:
+    return _NEGATION_CUES.search(claim) is not None
+
+def _numbers(claim: str) -> list[str]:
+    return sorted(number.replace(",", "") for number in _NUMBER.findall(claim))
+
+def is_same_claim(claim: str, matched_claim: str) -> bool:
+    """
+    Whether a stored claim that is similar enough may stand in for this one: both must be
+    negated or not, and mention the same numbers ("grew by 2.3%" is not "grew by 3.2%").
+    """
+    return _is_negated(claim) == _is_negated(matched_claim) and _numbers(claim) == _numbers(matched_claim)
+
+def embed_claims(claims: list[str]) -> np.ndarray | None:
+    """
+    Embeds claims for similarity search.
+
+    Returns:
+        A (len(claims), dim) float32 array of unit vectors, or None if the model is unavailable.
+    """
+    embedder = get_model("claim_embedder")
+    if embedder is None or not claims:
+        return None
+    return _encode(embedder, claims)
+
+
+class ClaimVerdictStore:
+    """
+    Verified claims with their embeddings, persisted in SQLite and searched in memory.
+
+    The embedding matrix is kept in memory and searched with one vectorised dot product.
+    Rows written by other processes are picked up incrementally before each lookup. When the
+    store grows past CLAIM_STORE_ANN_MIN_SIZE and faiss is installed, an HNSW index is used instead.
+    Expired rows are deleted when the store is opened, and at most CLAIM_STORE_MAX_ENTRIES of the
+    newest claims are kept.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._last_id = 0
+        self._ids = []
+        self._created_at = np.zeros(0, dtype=np.float64)
+        self._matrix = None
+        self._ann_index = None
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS verified_claims ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, claim TEXT NOT NULL, "
+            "embedding BLOB NOT NULL, result TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+        try:
+            self._purge(conn)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _purge(self, conn: sqlite3.Connection) -> None:
+        """Deletes expired rows and all but the newest CLAIM_STORE_MAX_ENTRIES."""
+        conn.execute(
+            "DELETE FROM verified_claims WHERE created_at < ?", (time.time() - CLAIM_STORE_MAX_AGE_SECONDS,)
+        )
+        # The subquery is NULL, and nothing is deleted, while the store holds fewer rows than the cap.
+        conn.execute(
+            "DELETE FROM verified_claims WHERE id <= "
+            "(SELECT id FROM verified_claims ORDER BY id DESC LIMIT 1 OFFSET ?)",
+            (CLAIM_STORE_MAX_ENTRIES,)
+        )
+
+    def _sync(self) -> None:
+        """Loads rows added since the last sync (by this or another process)."""
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT id, embedding, created_at FROM verified_claims WHERE id > ? AND created_at >= ? "
+                "ORDER BY id DESC LIMIT ?",
+                (self._last_id, time.time() - CLAIM_STORE_MAX_AGE_SECONDS, CLAIM_STORE_MAX_ENTRIES)
+            ).fetchall()[::-1]
+        finally:
+            conn.close()
+        if not rows:
+            return
+        vectors = np.stack([np.frombuffer(blob, dtype=np.float32) for _, blob, _ in rows])
+        self._ids.extend(row_id for row_id, _, _ in rows)
+        self._created_at = np.concatenate([self._created_at, np.array([c for _, _, c in rows])])
+        self._matrix = vectors if self._matrix is None else np.vstack([self._matrix, vectors])
+        self._last_id = rows[-1][0]
+        if len(self._ids) > CLAIM_STORE_MAX_ENTRIES:
+            self._trim()
+
+        if faiss is not None and len(self._ids) >= CLAIM_STORE_ANN_MIN_SIZE:
+            if self._ann_index is None:
+                self._ann_index = faiss.IndexHNSWFlat(self._matrix.shape[1], 32, faiss.METRIC_INNER_PRODUCT)
+                self._ann_index.add(self._matrix)
+            else:
+                self._ann_index.add(vectors)
+
+    def _trim(self) -> None:
+        """Drops the oldest claims from memory and from the database."""
+        keep = max(1, int(CLAIM_STORE_MAX_ENTRIES * (1 - TRIM_HEADROOM)))
+        start = len(self._ids) - keep
+        first_kept_id = self._ids[start]
+        self._ids = self._ids[start:]
+        self._created_at = self._created_at[start:]
+        self._matrix = self._matrix[start:]
+        # HNSW indexes can't drop vectors; _sync rebuilds it from the trimmed matrix.
+        self._ann_index = None
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM verified_claims WHERE id < ?", (first_kept_id,))
+        finally:
+            conn.close()
+        logger.info(f"Trimmed the claim store to its {keep} newest claims")
+
+    def _nearest(self, vector: np.ndarray) -> tuple[int, float] | None:
+        """Returns (row id, similarity) of the most similar fresh claim."""
+        fresh = self._created_at >= time.time() - CLAIM_STORE_MAX_AGE_SECONDS
+        if self._ann_index is not None:
+            similarities, positions = self._ann_index.search(vector[None, :], 10)
+            for similarity, position in zip(similarities[0], positions[0]):
+                if position >= 0 and fresh[position]:
+                    return self._ids[position], float(similarity)
+            return None
+        similarities = np.where(fresh, self._matrix @ vector, -1.0)
+        position = int(np.argmax(similarities))
+        return self._ids[position], float(similarities[position])
+
+    def lookup(self, claims: list[str], embeddings: np.ndarray) -> list[dict | None]:
+        """
+        Finds a stored verdict for each claim whose similarity reaches CLAIM_SIMILARITY_THRESHOLD
+        and which passes is_same_claim.
+
+        Returns:
+            For each claim, the stored result (with 'matched_claim' and 'similarity' added) or None.
+        """
+        with self._lock:
+            self._sync()
+            if self._matrix is None:
+                return [None] * len(claims)
+            nearest = [self._nearest(vector) for vector in embeddings]
+
+        matches = []
+        conn = self._connect()
+        try:
+            for claim, hit in zip(claims, nearest):
+                if hit is None or hit[1] < CLAIM_SIMILARITY_THRESHOLD:
+                    matches.append(None)
+                    continue
+                row_id, similarity = hit
+                row = conn.execute("SELECT claim, result FROM verified_claims WHERE id = ?", (row_id,)).fetchone()
+                if row is None or not is_same_claim(claim, row[0]):
+                    matches.append(None)
+                    continue
+                matched_claim, result = row
+                matches.append({
+                    **json.loads(result),
+                    "claim": claim,
+                    "matched_claim": matched_claim,
+                    "similarity": round(similarity, 3)
+                })
+        finally:
+            conn.close()
+        return matches
+
+    def add(self, claim: str, result: dict, embedding: np.ndarray) -> None:
+        """Stores a verified claim with its result and embedding."""
+        conn = self._connect()
+        try:
+            conn.execute(
+                "INSERT INTO verified_claims (claim, embedding, result, created_at) VALUES (?, ?, ?, ?)",
+                (claim, embedding.astype(np.float32).tobytes(), json.dumps(result, ensure_ascii=False), time.time())
+            )
+        finally:
+            conn.close()
+
+
+_claim_store = None
+_claim_store_lock = threading.Lock()
+
+def _get_claim_store() -> ClaimVerdictStore | None:
+    global _claim_store
+    if not CLAIM_STORE_ENABLED:
+        return None
+    with _claim_store_lock:
+        if _claim_store is None:
+            try:
+                _claim_store = ClaimVerdictStore(CLAIM_STORE_PATH)
+            except Exception as e:
+                logger.warning(f"Claim store unavailable, continuing without it: {e}")
+                return None
+    return _claim_store
+
+@traced("claim_store_lookup")
+def lookup_verified_claims(claims: list[str]) -> tuple[list[dict | None], np.ndarray | None]:
+    """
+    Checks each claim against the store of previously verified claims.
+
+    Returns:
+        (matches, embeddings): a stored result or None per claim, and the claim embeddings
+        so they can be reused when the new verdicts are stored.
+    """
+    store = _get_claim_store()
+    if store is None:
+        return [None] * len(claims), None
+    try:
+        embeddings = embed_claims(claims)
+        if embeddings is None:
+            return [None] * len(claims), None
+        matches = store.lookup(claims, embeddings)
+        hits = sum(match is not None for match in matches)
+        increment("cache_events_total", hits, cache="claim_store", event="hits")
+        increment("cache_events_total", len(claims) - hits, cache="claim_store", event="misses")
+        return matches, embeddings
+    except Exception as e:
+        logger.error(f"Lookup failed: {e}")
+        return [None] * len(claims), None
+
+def remember_verified_claims(claims: list[str], results: list[dict], embeddings: np.ndarray | None) -> None:
+    """
+    Stores newly verified claims whose verdict is in CLAIM_STORE_CACHEABLE_VERDICTS.
+    """
+    store = _get_claim_store()
+    if store is None or embeddings is None:
+        return
+    for claim, result, embedding in zip(claims, results, embeddings):
+        if result and result.get("verdict") in CLAIM_STORE_CACHEABLE_VERDICTS:
+            try:
+                store.add(claim, result, embedding)
+            except Exception as e:
+                logger.warning(f"Could not store claim '{claim}': {e}")
@@ -0,0 +1,120 @@
+# src/text/evidence_ranker.py
+import re
+import zlib
+import numpy as np
+from src.utils.config import (
+    EVIDENCE_RANKING_ENABLED,
+    EVIDENCE_TOP_K,
+    EVIDENCE_DUPLICATE_THRESHOLD,
+    EVIDENCE_SHINGLE_SIZE,
+    EVIDENCE_MINHASH_PERMUTATIONS,
+)
+from src.utils.logging import get_logger, traced, increment
+
+logger = get_logger("EvidenceRanker")
+
+_TOKEN = re.compile(r"\w+")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+# MinHash permutations h(x) = (a * x + b) mod p over 32-bit shingle hashes. p is a prime above 2^32
+# and a < 2^31, so a * x never overflows uint64. Fixed seed: signatures are comparable across calls.
+_PRIME = np.uint64(4294967311)
+_rng = np.random.default_rng(1)
+_PERM_A = _rng.integers(1, 2**31, size=EVIDENCE_MINHASH_PERMUTATIONS, dtype=np.uint64)
+_PERM_B = _rng.integers(0, 4294967311, size=EVIDENCE_MINHASH_PERMUTATIONS, dtype=np.uint64)
+
+
+def _tokenize(text: str) -> list[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def _shingles(tokens: list[str], size: int = EVIDENCE_SHINGLE_SIZE) -> set[str]:
+    """Word shingles of a snippet; a snippet shorter than one shingle is its own single shingle."""
+    if len(tokens) < size:
+        return {" ".join(tokens)}
+    return {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def minhash_signatures(snippets: list[str]) -> np.ndarray:
+    """
+    Returns a (len(snippets), EVIDENCE_MINHASH_PERMUTATIONS) array of MinHash signatures.
+    The fraction of equal positions between two rows estimates the Jaccard similarity of their shingles.
+    """
+    signatures = np.empty((len(snippets), len(_PERM_A)), dtype=np.uint64)
+    for row, snippet in enumerate(snippets):
+        hashes = np.array([zlib.crc32(s.encode("utf-8")) for s in _shingles(_tokenize(snippet))], dtype=np.uint64)
+        signatures[row] = ((np.outer(hashes, _PERM_A) + _PERM_B) % _PRIME).min(axis=0)
+    return signatures
+
+
+def bm25_scores(query: str, documents: list[str], k1: float = 1.5, b: float = 0.75) -> np.ndarray:
+    """
+    Okapi BM25 score of every document for the query, with document frequencies taken from the
+    documents themselves (the evidence of one claim is the whole corpus).
+    """
+    query_terms = list(dict.fromkeys(t for t in _tokenize(query) if t not in STOPWORDS))
+    if not documents or not query_terms:
+        return np.zeros(len(documents))
+    term_index = {term: j for j, term in enumerate(query_terms)}
+    tf = np.zeros((len(documents), len(query_terms)))
+    lengths = np.empty(len(documents))
+    for row, document in enumerate(documents):
+        tokens = _tokenize(document)
+        lengths[row] = len(tokens)
+        for token in tokens:
+            j = term_index.get(token)
+            if j is not None:
+                tf[row, j] += 1
+
+    df = (tf > 0).sum(axis=0)
+    idf = np.log((len(documents) - df + 0.5) / (df + 0.5) + 1)
+    norm = k1 * (1 - b + b * lengths / max(lengths.mean(), 1.0))
+    return ((tf * (k1 + 1)) / (tf + norm[:, None]) * idf).sum(axis=1)
+
+
+@traced("evidence_ranking")
+def rank_evidence(
+    claim: str,
+    snippets: list[str],
+    top_k: int = EVIDENCE_TOP_K,
+    duplicate_threshold: float = EVIDENCE_DUPLICATE_THRESHOLD
+) -> list[str]:
+    """
+    Collapses near-duplicate snippets and keeps the ones most relevant to the claim.
+
+    Snippets are ranked by BM25 against the claim, then taken in rank order, skipping any snippet
+    whose estimated shingle Jaccard similarity with an already kept one reaches duplicate_threshold.
+    So each group of syndicated copies is represented by its most relevant member.
+
+    Args:
+        claim: The claim the evidence is for.
+        snippets: The evidence snippets, e.g. from get_evidence_snippets.
+        top_k: Maximum number of snippets to keep (0 = no limit).
+        duplicate_threshold: Similarity at which two snippets are considered the same evidence.
+
+    Returns:
+        The kept snippets, most relevant first. The input is returned unchanged if ranking is disabled.
+    """
+    if not EVIDENCE_RANKING_ENABLED or len(snippets) < 2:
+        return snippets
+
+    scores = bm25_scores(claim, snippets)
+    signatures = minhash_signatures(snippets)
+    # A stable sort keeps the search order among equally relevant snippets.
+    order = np.argsort(-scores, kind="stable")
+
+    kept = []
+    for i in order:
+        if kept:
+            similarity = (signatures[kept] == signatures[i]).mean(axis=1)
+            if similarity.max() >= duplicate_threshold:
+                continue
+        kept.append(int(i))
+        if top_k and len(kept) >= top_k:
+            break
+
+    increment("evidence_snippets_total", len(snippets), stage="retrieved")
+    increment("evidence_snippets_total", len(kept), stage="kept")
+    return [snippets[i] for i in kept]
@@ -1,45 +1,118 @@
 # src/text/fetch_web_results.py
-from serpapi import GoogleSearch
-from src.utils.config import SERPAPI_API_KEY
+import math
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from src.utils.config import (
+    SERPAPI_API_KEY,
+    SERPAPI_MAX_CONCURRENCY,
+    SERPAPI_TIMEOUT_SECONDS,
+    SEARCH_CACHE_ENABLED,
+    SEARCH_CACHE_PATH,
+    SEARCH_CACHE_TTL_SECONDS,
+    SEARCH_CACHE_MAX_ENTRIES,
+)
+from src.utils.disk_cache import DiskCache, make_cache_key
+from src.utils.serpapi_client import run_search
+from src.utils.logging import get_logger, traced, submit_with_context
 
-def get_evidence_snippets(queries: list[str], num_results_per_query: int = 3) -> list[str]:
+logger = get_logger("SerpAPI")
+
+_search_cache = None
+_search_cache_lock = threading.Lock()
+
+def _get_search_cache() -> DiskCache | None:
+    """Opens the shared on-disk search cache on first use, or returns None if caching is disabled."""
+    global _search_cache
+    if not SEARCH_CACHE_ENABLED:
+        return None
+    with _search_cache_lock:
+        if _search_cache is None:
+            try:
+                _search_cache = DiskCache(SEARCH_CACHE_PATH, SEARCH_CACHE_TTL_SECONDS, SEARCH_CACHE_MAX_ENTRIES, table="serpapi")
+            except Exception as e:
+                logger.warning(f"Search cache unavailable, continuing without it: {e}")
+                return None
+    return _search_cache
+
+def _normalize_query(query: str) -> str:
+    """Lower-cases and collapses whitespace so trivially different queries share a cache entry."""
+    return re.sub(r"\s+", " ", query).strip().lower()
+
+def _search_snippets(query: str, num_results_per_query: int) -> list[str]:
+    """
+    Returns the organic-result snippets for one query, from the cache when possible.
+    Raises if the SerpAPI call fails, so errors are never cached.
+    """
+    params = {
+        "engine": "google",
+        "q": query,
+        "num": num_results_per_query # How many results to fetch
+    }
+    cache = _get_search_cache()
+    cache_key = make_cache_key(_normalize_query(query), {k: v for k, v in params.items() if k != "q"})
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    results = run_search(params)
+
+    # Extract snippets from the organic search results
+    snippets = [result["snippet"] for result in results.get("organic_results", []) if result.get("snippet")]
+    if cache is not None:
+        cache.set(cache_key, snippets)
+    return snippets
+
+@traced("evidence_search")
+def get_evidence_snippets(
+    queries: list[str],
+    num_results_per_query: int = 3,
+    max_concurrency: int = SERPAPI_MAX_CONCURRENCY
+) -> list[str]:
     """
     Fetches evidence snippets from the web using SerpAPI for a list of queries.
+    Queries are issued concurrently, and results are served from the persistent
+    search cache when a fresh entry exists.
 
     Args:
         queries: A list of search query strings.
         num_results_per_query: The number of search results to process for each query.
+        max_concurrency: Maximum number of queries in flight at once.
 
     Returns:
-        A list of unique evidence snippets found from the web search.
+        A list of unique evidence snippets found from the web search, in first-seen query order.
     """
     if not SERPAPI_API_KEY:
-        print("SERPAPI_API_KEY not found in environment variables.")
+        logger.error("SERPAPI_API_KEY not found in environment variables.")
+        return []
+    if not queries:
         return []
 
+    workers = max(1, min(max_concurrency, len(queries)))
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="serpapi")
+    futures = [submit_with_context(executor, _search_snippets, query, num_results_per_query) for query in queries]
+
+    # Each request already has its own timeout; this deadline is a backstop covering
+    # every wave of queries, so a stuck call can never hold up the others indefinitely.
+    deadline = time.monotonic() + SERPAPI_TIMEOUT_SECONDS * math.ceil(len(queries) / workers) + 1
+
     all_snippets = []
-    for query in queries:
-        params = {
-            "engine": "google",
-            "q": query,
-            "api_key": SERPAPI_API_KEY,
-            "num": num_results_per_query # How many results to fetch
-        }
-        
+    for query, future in zip(queries, futures):
         try:
-            search = GoogleSearch(params)
-            results = search.get_dict()
-            
-            # Extract snippets from the organic search results
-            organic_results = results.get("organic_results", [])
-            for result in organic_results:
-                snippet = result.get("snippet")
-                if snippet:
-                    all_snippets.append(snippet)
-                    
+            all_snippets.extend(future.result(timeout=max(0.0, deadline - time.monotonic())))
+        except TimeoutError:
+            logger.warning(f"Query '{query}' timed out.")
         except Exception as e:
-            print(f"[SerpAPI] An error occurred for query '{query}': {e}")
+            logger.error(f"An error occurred for query '{query}': {e}")
             continue # Move to the next query if one fails
+    executor.shutdown(wait=False, cancel_futures=True)
 
     # Return a list of unique snippets to avoid redundancy
-    return list(dict.fromkeys(all_snippets))
\ No newline at end of file
+    return list(dict.fromkeys(all_snippets))
+
+def search_cache_stats() -> dict:
+    """Returns the hit/miss counters of the search cache for this process."""
+    cache = _get_search_cache()
+    return dict(cache.stats) if cache is not None else {}
@@ -1,6 +1,83 @@
 # src/text/llm_verifier.py
-import requests
-from src.utils.config import GROQ_API_KEY, CLAIM_EXTRACTION_MODEL
+import re
+from src.utils.config import (
+    CLAIM_EXTRACTION_MODEL,
+    LLM_BATCH_MAX_CLAIMS,
+    LLM_BATCH_TOKEN_BUDGET,
+    TEXT_PIPELINE_MAX_WORKERS,
+    PROMPT_SNIPPET_MAX_TOKENS,
+)
+from src.utils.groq_client import chat_completion
+from src.utils.llm_batching import chunk_by_token_budget, parse_json_object, results_by_id, map_concurrently
+from src.utils.prompt_builder import estimate_tokens, truncate_to_tokens, prompt_section, fit_prompt
+from src.utils.logging import get_logger, traced, increment
+
+logger = get_logger("LLMVerifier")
+
+VERDICTS = ("SUPPORTED", "REFUTED", "NOT ENOUGH INFO")
+# Reported instead of a verdict when the LLM call itself failed.
+ERROR_VERDICT = "ERROR"
+# Spellings models use for the three verdicts.
+_VERDICT_ALIASES = {
+    "SUPPORTS": "SUPPORTED", "SUPPORT": "SUPPORTED", "TRUE": "SUPPORTED",
+    "REFUTES": "REFUTED", "REFUTE": "REFUTED", "FALSE": "REFUTED",
+    "NOT ENOUGH INFORMATION": "NOT ENOUGH INFO", "NEI": "NOT ENOUGH INFO", "INSUFFICIENT EVIDENCE": "NOT ENOUGH INFO",
+    "UNVERIFIABLE": "NOT ENOUGH INFO", "UNKNOWN": "NOT ENOUGH INFO",
+}
+_LABEL = r"^[\s>*#_-]*{label}[*_]*\s*[:=-]?[*_]*\s*"
+_VERDICT_LINE = re.compile(_LABEL.format(label="VERDICT") + r"(.+)$", re.IGNORECASE | re.MULTILINE)
+_EXPLANATION_BLOCK = re.compile(_LABEL.format(label="EXPLANATION") + r"(.+)", re.IGNORECASE | re.MULTILINE | re.DOTALL)
+
+def normalize_verdict(value) -> str | None:
+    """
+    Maps a verdict as written by the model ("[Supported]", "**REFUTED**", "Not enough information")
+    to one of VERDICTS, or None if it isn't recognisable.
+    """
+    if not isinstance(value, str):
+        return None
+    cleaned = re.sub(r"[^A-Z ]", " ", value.upper())
+    cleaned = re.sub(r"\s+", " ", cleaned).strip()
+    if cleaned in VERDICTS:
+        return cleaned
+    if cleaned in _VERDICT_ALIASES:
+        return _VERDICT_ALIASES[cleaned]
+    # e.g. "REFUTED THE EVIDENCE SHOWS" when the explanation follows on the same line.
+    for candidate in sorted(list(VERDICTS) + list(_VERDICT_ALIASES), key=len, reverse=True):
+        if cleaned.startswith(candidate + " "):
+            return _VERDICT_ALIASES.get(candidate, candidate)
+    return None
+
+def parse_verdict_reply(reply: str) -> dict:
+    """
+    Parses a single-claim verdict reply. Accepts the VERDICT:/EXPLANATION: format with markdown
+    decoration, case differences and multi-line explanations, as well as a JSON object with
+    "verdict" and "explanation" keys. Unrecognised verdicts become NOT ENOUGH INFO.
+    """
+    payload = parse_json_object(reply) if "{" in reply else None
+    if payload and "verdict" in payload:
+        verdict = normalize_verdict(payload.get("verdict"))
+        explanation = payload.get("explanation")
+        return {
+            "verdict": verdict or "NOT ENOUGH INFO",
+            "explanation": explanation.strip() if isinstance(explanation, str) and explanation.strip() else reply.strip()
+        }
+
+    verdict_match = _VERDICT_LINE.search(reply)
+    explanation_match = _EXPLANATION_BLOCK.search(reply)
+    verdict = normalize_verdict(verdict_match.group(1)) if verdict_match else None
+    explanation = explanation_match.group(1).strip() if explanation_match else reply.strip()
+    return {
+        "verdict": verdict or "NOT ENOUGH INFO",
+        "explanation": explanation
+    }
+
+@traced("llm_verdict")
+def _api_error_result(error: str) -> dict:
+    return {
+        "verdict": ERROR_VERDICT,
+        "explanation": f"LLM verification failed due to an API error: {error}",
+        "error": error
+    }
 
 def verify_claim_with_llm(claim: str, evidence_snippets: list[str]) -> dict:
     """
@@ -11,7 +88,8 @@ def verify_claim_with_llm(claim: str, evidence_snippets: list[str]) -> dict:
         evidence_snippets: A list of evidence texts retrieved from the web.
 
     Returns:
-        A dictionary with 'verdict' and 'explanation'.
+        A dictionary with 'verdict' and 'explanation'. If the Groq call fails, the verdict is
+        ERROR_VERDICT and 'error' holds the API error, so it can't be mistaken for NOT ENOUGH INFO.
     """
     system_prompt = (
         "You are a fact-checking assistant. Your job is to verify a factual claim using provided evidence. "
@@ -21,47 +99,113 @@ def verify_claim_with_llm(claim: str, evidence_snippets: list[str]) -> dict:
         "EXPLANATION: <reasoning>"
     )
 
+    # Snippets arrive ranked, so the budget keeps the most relevant ones.
+    fitted = fit_prompt("verification", CLAIM_EXTRACTION_MODEL, f"{system_prompt}\nClaim:\n{claim}\n\nEvidence:", [
+        prompt_section("evidence", evidence_snippets, max_item_tokens=PROMPT_SNIPPET_MAX_TOKENS)
+    ])
     user_prompt = (
         f"Claim:\n{claim}\n\n"
         f"Evidence:\n" +
-        "\n\n".join([f"- {e}" for e in evidence_snippets])
+        "\n\n".join([f"- {e}" for e in fitted["sections"]["evidence"]])
     )
 
-    url = "https://api.groq.com/openai/v1/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {GROQ_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    payload = {
-        "model": CLAIM_EXTRACTION_MODEL,
-        "messages": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ],
-        "temperature": 0.3,
-    }
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
 
-    try:
-        response = requests.post(url, headers=headers, json=payload)
-        response.raise_for_status()
-        result = response.json()
-        reply = result["choices"][0]["message"]["content"]
+    result = chat_completion(CLAIM_EXTRACTION_MODEL, messages, temperature=0.3)
+    if not result["ok"]:
+        logger.error(f"Error: {result['error']}")
+        return _api_error_result(result["error"])
 
-        # Parse VERDICT and EXPLANATION
-        verdict_line = next((line for line in reply.splitlines() if line.startswith("VERDICT:")), None)
-        explanation_line = next((line for line in reply.splitlines() if line.startswith("EXPLANATION:")), None)
+    return parse_verdict_reply(result["content"])
 
-        verdict = verdict_line.replace("VERDICT:", "").strip().upper() if verdict_line else "NOT ENOUGH INFO"
-        explanation = explanation_line.replace("EXPLANATION:", "").strip() if explanation_line else reply.strip()
+BATCH_SYSTEM_PROMPT = (
+    "You are a fact-checking assistant. You will receive several numbered claims, each with its own evidence. "
+    "Verify every claim using only its own evidence. Respond with a JSON object of the form "
+    '{"results": [{"id": <claim number>, "verdict": "SUPPORTED" | "REFUTED" | "NOT ENOUGH INFO", '
+    '"explanation": "<concise reasoning>"}]} with exactly one entry per claim and no other text.'
+)
+# Expected output tokens per claim: a verdict and a few sentences of explanation.
+_OUTPUT_TOKENS_PER_CLAIM = 150
 
-        return {
-            "verdict": verdict,
-            "explanation": explanation
-        }
+def _claim_block(claim_id: int, claim: str, evidence_snippets: list[str]) -> str:
+    evidence = "\n".join(
+        f"- {truncate_to_tokens(e, PROMPT_SNIPPET_MAX_TOKENS)[0]}" for e in evidence_snippets
+    ) or "- (no evidence)"
+    return f"Claim {claim_id}: {claim}\nEvidence for claim {claim_id}:\n{evidence}"
 
-    except Exception as e:
-        print(f"[Groq LLMVerifier] Error: {e}")
-        return {
-            "verdict": "NOT ENOUGH INFO",
-            "explanation": "LLM verification failed due to an API error."
-        }
+def plan_verification_batches(claims_with_evidence: list[tuple[str, list[str]]]) -> list[list[int]]:
+    """
+    Splits (claim, evidence) pairs into chunks that each fit one batched verification call,
+    bounded by LLM_BATCH_MAX_CLAIMS and LLM_BATCH_TOKEN_BUDGET.
+
+    Returns:
+        Lists of indices into claims_with_evidence, in order.
+    """
+    budget = LLM_BATCH_TOKEN_BUDGET - estimate_tokens(BATCH_SYSTEM_PROMPT)
+    costs = [
+        estimate_tokens(_claim_block(i, claim, snippets)) + _OUTPUT_TOKENS_PER_CLAIM
+        for i, (claim, snippets) in enumerate(claims_with_evidence)
+    ]
+    return chunk_by_token_budget(costs, budget, LLM_BATCH_MAX_CLAIMS)
+
+def _verify_chunk(claims_with_evidence: list[tuple[str, list[str]]]) -> list[dict | None]:
+    """
+    One JSON call for a chunk of claims. Claims missing from a malformed reply are None. If the
+    call itself fails every claim gets ERROR_VERDICT: per-claim calls to the same API would fail too.
+    """
+    blocks = "\n\n".join(
+        _claim_block(i, claim, snippets) for i, (claim, snippets) in enumerate(claims_with_evidence)
+    )
+    messages = [
+        {"role": "system", "content": BATCH_SYSTEM_PROMPT},
+        {"role": "user", "content": blocks}
+    ]
+    result = chat_completion(CLAIM_EXTRACTION_MODEL, messages, temperature=0.3, response_format={"type": "json_object"})
+    if not result["ok"]:
+        logger.error(f"Batched verification failed: {result['error']}")
+        return [_api_error_result(result["error"]) for _ in claims_with_evidence]
+
+    entries = results_by_id(parse_json_object(result["content"]), len(claims_with_evidence))
+    verdicts = []
+    for i in range(len(claims_with_evidence)):
+        entry = entries.get(i, {})
+        verdict = normalize_verdict(entry.get("verdict"))
+        explanation = entry.get("explanation")
+        if verdict and isinstance(explanation, str) and explanation.strip():
+            verdicts.append({"verdict": verdict, "explanation": explanation.strip()})
+        else:
+            verdicts.append(None)
+    return verdicts
+
+@traced("llm_verdict_chunk")
+def verify_claim_chunk(claims_with_evidence: list[tuple[str, list[str]]]) -> list[dict]:
+    """
+    Verifies one chunk planned by plan_verification_batches: a single claim gets the plain
+    verify_claim_with_llm call, several share one JSON call. Any claim whose entry is missing or
+    malformed in the reply falls back to its own verify_claim_with_llm call; if the call fails,
+    the whole chunk gets ERROR_VERDICT without retrying each claim.
+
+    Args:
+        claims_with_evidence: The (claim, evidence snippets) pairs of the chunk.
+
+    Returns:
+        One dictionary with 'verdict' and 'explanation' per claim, in input order
+        (verdict ERROR_VERDICT for claims whose LLM calls failed).
+    """
+    if len(claims_with_evidence) == 1:
+        return [verify_claim_with_llm(*claims_with_evidence[0])]
+
+    verdicts = _verify_chunk(claims_with_evidence)
+    missing = [i for i, verdict in enumerate(verdicts) if verdict is None]
+    if missing:
+        logger.warning(f"Falling back to single calls for {len(missing)} of {len(claims_with_evidence)} claims.")
+        increment("llm_batch_fallbacks_total", len(missing), stage="verification")
+    fallback_results = map_concurrently(
+        lambda pair: verify_claim_with_llm(*pair), [claims_with_evidence[i] for i in missing], TEXT_PIPELINE_MAX_WORKERS
+    )
+    for i, verdict in zip(missing, fallback_results):
+        verdicts[i] = verdict
+    return verdicts
@@ -1,46 +1,129 @@
 # src/text/ml_verifier.py
-from transformers import pipeline
-from src.utils.config import NLI_MODEL
-
-# Initialize the NLI pipeline from Hugging Face.
-try:
-    # Using device=0 will try to use the GPU (M-series Mac, CUDA) if available.
-    # It will fall back to CPU if no compatible GPU is found.
-    nli_pipeline = pipeline("text-classification", model=NLI_MODEL)
-    print(f"NLI model '{NLI_MODEL}' loaded successfully on device: {nli_pipeline.device}")
-except Exception as e:
-    print(f"Failed to load NLI model. Please check model name and internet connection. Error: {e}")
-    nli_pipeline = None
+from src.utils.config import NLI_MODEL, NLI_BATCH_SIZE, NLI_MAX_LENGTH
+from src.utils.model_registry import register_model, get_model
+from src.utils.inference_backend import load_pipeline
+from src.serving import inference_client
+from src.utils.logging import get_logger, traced
 
-def classify_evidence_stance(claim: str, evidence_snippets: list[str]) -> list[dict]:
+logger = get_logger("NLI")
+
+def _load_nli_pipeline():
+    """Initializes the NLI pipeline from Hugging Face on the configured inference backend."""
+    # The pipeline uses the GPU (M-series Mac, CUDA) if available, and falls back to CPU otherwise.
+    nli_pipeline = load_pipeline("text-classification", NLI_MODEL)
+    logger.info(f"NLI model '{NLI_MODEL}' running on device: {nli_pipeline.device}")
+    return nli_pipeline
+
+def _warmup_nli_pipeline(nli_pipeline) -> None:
+    nli_pipeline({"text": "The sky is blue.", "text_pair": "The sky has a colour."})
+
+register_model("nli", _load_nli_pipeline, _warmup_nli_pipeline)
+
+# The labels from this model are 'entailment', 'contradiction', 'neutral'.
+STANCE_MAP = {
+    "entailment": "SUPPORTS",
+    "contradiction": "REFUTES",
+    "neutral": "NEUTRAL"
+}
+
+@traced("nli", profile_memory=True)
+def classify_stance_pairs(pairs: list[tuple[str, str]], batch_size: int = NLI_BATCH_SIZE) -> list[dict]:
     """
-    Classifies the stance of each evidence snippet relative to the claim using an NLI model.
+    Classifies the stance of many (claim, snippet) pairs in batched forward passes.
+
+    Pairs are tokenized once, sorted by token length and grouped into buckets, and each
+    bucket is padded only to its own longest member, so short snippets don't pay for long ones.
+
+    Args:
+        pairs: (claim, evidence_snippet) tuples, possibly spanning several claims.
+        batch_size: Number of pairs per forward pass.
+
+    Returns:
+        One dictionary per input pair, in input order, with 'stance', 'score' (probability of
+        the predicted label) and 'probabilities' (the full entailment/neutral/contradiction distribution).
     """
+    if inference_client.enabled():
+        if not pairs:
+            return []
+        try:
+            return inference_client.classify_stance_pairs(pairs)
+        except Exception as e:
+            logger.error(f"NLI request to the inference server failed, returning empty results: {e}")
+            return []
+
+    nli_pipeline = get_model("nli")
     if not nli_pipeline:
-        print("NLI pipeline not available. Returning empty results.")
+        logger.error("NLI pipeline not available. Returning empty results.")
+        return []
+    return run_stance_model(nli_pipeline, pairs, batch_size)
+
+def run_stance_model(nli_pipeline, pairs: list[tuple[str, str]], batch_size: int = NLI_BATCH_SIZE) -> list[dict]:
+    """
+    The batched forward passes of classify_stance_pairs on a given NLI pipeline (PyTorch or ONNX Runtime).
+    """
+    if not pairs:
         return []
 
-    results = []
-    for snippet in evidence_snippets:
-        # Pass the text pair to the pipeline
-        raw_result = nli_pipeline({"text": snippet, "text_pair": claim})
-        
-        # The labels from this model are 'entailment', 'contradiction', 'neutral'.
-        stance_map = {
-            "entailment": "SUPPORTS",
-            "contradiction": "REFUTES",
-            "neutral": "NEUTRAL"
-        }
-        
-        # --- FIX IS HERE ---
-        # Access 'label' and 'score' directly from the result dictionary.
-        stance = stance_map.get(raw_result['label'], "NEUTRAL")
-        score = round(raw_result['score'], 2)
-
-        results.append({
-            "evidence": snippet,
-            "stance": stance,
-            "score": score
-        })
-        
-    return results
\ No newline at end of file
+    import torch
+
+    tokenizer, model = nli_pipeline.tokenizer, nli_pipeline.model
+    id2label = {i: label.lower() for i, label in model.config.id2label.items()}
+
+    # The snippet is the premise and the claim is the hypothesis.
+    encodings = tokenizer(
+        [snippet for _, snippet in pairs],
+        [claim for claim, _ in pairs],
+        truncation=True,
+        max_length=NLI_MAX_LENGTH
+    )
+    lengths = [len(ids) for ids in encodings["input_ids"]]
+    order = sorted(range(len(pairs)), key=lengths.__getitem__)
+
+    results = [None] * len(pairs)
+    for start in range(0, len(order), batch_size):
+        bucket = order[start:start + batch_size]
+        features = [{key: encodings[key][i] for key in encodings.keys()} for i in bucket]
+        batch = tokenizer.pad(features, padding=True, return_tensors="pt").to(model.device)
+
+        with torch.inference_mode():
+            probabilities = model(**batch).logits.softmax(dim=-1).cpu().tolist()
+
+        for i, row in zip(bucket, probabilities):
+            distribution = {id2label[j]: round(p, 4) for j, p in enumerate(row)}
+            best = max(range(len(row)), key=row.__getitem__)
+            results[i] = {
+                "stance": STANCE_MAP.get(id2label[best], "NEUTRAL"),
+                "score": round(row[best], 2),
+                "probabilities": distribution
+            }
+    return results
+
+def classify_evidence_stance_batch(claims_with_evidence: list[tuple[str, list[str]]]) -> list[list[dict]]:
+    """
+    Classifies the evidence of several claims in one batched NLI run.
+
+    Args:
+        claims_with_evidence: (claim, evidence_snippets) tuples.
+
+    Returns:
+        For each claim, the same list classify_evidence_stance would return.
+    """
+    pairs = [(claim, snippet) for claim, snippets in claims_with_evidence for snippet in snippets]
+    flat_results = classify_stance_pairs(pairs)
+    if not flat_results:
+        return [[] for _ in claims_with_evidence]
+
+    grouped, position = [], 0
+    for _, snippets in claims_with_evidence:
+        grouped.append([
+            {"evidence": snippet, **flat_results[position + offset]}
+            for offset, snippet in enumerate(snippets)
+        ])
+        position += len(snippets)
+    return grouped
+
+def classify_evidence_stance(claim: str, evidence_snippets: list[str]) -> list[dict]:
+    """
+    Classifies the stance of each evidence snippet relative to the claim using an NLI model.
+    """
+    return classify_evidence_stance_batch([(claim, evidence_snippets)])[0]
@@ -1,7 +1,13 @@
 # src/text/query_generator.py
-import requests
-from src.utils.config import GROQ_API_KEY, QUERY_GENERATION_MODEL
+from src.utils.config import QUERY_GENERATION_MODEL, LLM_BATCH_MAX_CLAIMS, LLM_BATCH_TOKEN_BUDGET, TEXT_PIPELINE_MAX_WORKERS
+from src.utils.groq_client import chat_completion
+from src.utils.llm_batching import chunk_by_token_budget, parse_json_object, results_by_id, map_concurrently
+from src.utils.prompt_builder import estimate_tokens
+from src.utils.logging import get_logger, traced, increment
 
+logger = get_logger("QueryGenerator")
+
+@traced("query_generation")
 def generate_search_queries(claim: str) -> list[str]:
     """
     Generates a list of search engine queries based on a single factual claim using the Groq API.
@@ -19,32 +25,84 @@ def generate_search_queries(claim: str) -> list[str]:
         "Return only the list of queries, one per line, without any extra text or numbering."
     )
 
-    url = "https://api.groq.com/openai/v1/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {GROQ_API_KEY}",
-        "Content-Type": "application/json"
-    }
-    payload = {
-        "model": QUERY_GENERATION_MODEL,
-        "messages": [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": f"Factual claim:\n---\n{claim}\n---"}
-        ],
-        "temperature": 0.5,
-    }
-
-    try:
-        response = requests.post(url, headers=headers, json=payload)
-        response.raise_for_status()
-        result = response.json()
-
-        generated_queries = result["choices"][0]["message"]["content"].strip()
-        queries = [line.strip() for line in generated_queries.split('\n') if line.strip()]
-
-        all_queries = [claim] + queries
-        unique_queries = list(dict.fromkeys(all_queries))
-        return unique_queries
-
-    except Exception as e:
-        print(f"[Groq QueryGenerator] Error: {e}")
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": f"Factual claim:\n---\n{claim}\n---"}
+    ]
+
+    result = chat_completion(QUERY_GENERATION_MODEL, messages, temperature=0.5)
+    if not result["ok"]:
+        logger.error(f"Error: {result['error']}")
         return [claim]
+
+    queries = [line.strip() for line in result["content"].split('\n') if line.strip()]
+
+    all_queries = [claim] + queries
+    unique_queries = list(dict.fromkeys(all_queries))
+    return unique_queries
+
+BATCH_SYSTEM_PROMPT = (
+    "You are a search query generation expert. For each numbered factual claim, generate 3 diverse, "
+    "search-engine-optimized queries to find evidence: one as a question, one focusing on keywords, "
+    "and one as a direct rephrasing. Respond with a JSON object of the form "
+    '{"results": [{"id": <claim number>, "queries": ["...", "...", "..."]}]} '
+    "with exactly one entry per claim and no other text."
+)
+# Expected output tokens per claim: three short queries plus the JSON structure.
+_OUTPUT_TOKENS_PER_CLAIM = 80
+
+def _with_claim(claim: str, queries: list[str]) -> list[str]:
+    return list(dict.fromkeys([claim] + queries))
+
+def _generate_queries_chunk(claims: list[str]) -> list[list[str] | None]:
+    """
+    One JSON call for a chunk of claims. Claims missing from a malformed reply are None. If the
+    call itself fails every claim falls back to [claim], as in generate_search_queries.
+    """
+    claim_list = "\n".join(f"{i}. {claim}" for i, claim in enumerate(claims))
+    messages = [
+        {"role": "system", "content": BATCH_SYSTEM_PROMPT},
+        {"role": "user", "content": f"Factual claims:\n---\n{claim_list}\n---"}
+    ]
+    result = chat_completion(QUERY_GENERATION_MODEL, messages, temperature=0.5, response_format={"type": "json_object"})
+    if not result["ok"]:
+        logger.error(f"Batched query generation failed: {result['error']}")
+        return [[claim] for claim in claims]
+
+    entries = results_by_id(parse_json_object(result["content"]), len(claims))
+    queries_per_claim = []
+    for i, claim in enumerate(claims):
+        queries = entries.get(i, {}).get("queries")
+        if isinstance(queries, list):
+            queries = [q.strip() for q in queries if isinstance(q, str) and q.strip()]
+        queries_per_claim.append(_with_claim(claim, queries) if queries else None)
+    return queries_per_claim
+
+@traced("query_generation_batch")
+def generate_search_queries_batch(claims: list[str]) -> list[list[str]]:
+    """
+    Generates search queries for many claims with one structured (JSON) Groq call per chunk.
+
+    Chunks are sized to LLM_BATCH_MAX_CLAIMS and LLM_BATCH_TOKEN_BUDGET and sent concurrently.
+    Any claim whose entry is missing or malformed in the reply falls back to its own
+    generate_search_queries call; if a chunk's call fails, its claims are searched as they are.
+
+    Returns:
+        One list of queries per claim, in input order, each starting with the claim itself.
+    """
+    budget = LLM_BATCH_TOKEN_BUDGET - estimate_tokens(BATCH_SYSTEM_PROMPT)
+    costs = [estimate_tokens(claim) + _OUTPUT_TOKENS_PER_CLAIM for claim in claims]
+    chunks = chunk_by_token_budget(costs, budget, LLM_BATCH_MAX_CLAIMS)
+    chunk_results = map_concurrently(_generate_queries_chunk, [[claims[i] for i in chunk] for chunk in chunks], TEXT_PIPELINE_MAX_WORKERS)
+    queries_per_claim = [None] * len(claims)
+    for chunk, chunk_queries in zip(chunks, chunk_results):
+        for i, queries in zip(chunk, chunk_queries):
+            queries_per_claim[i] = queries
+
+    missing = [i for i, queries in enumerate(queries_per_claim) if queries is None]
+    if missing:
+        logger.warning(f"Falling back to single calls for {len(missing)} of {len(claims)} claims.")
+        increment("llm_batch_fallbacks_total", len(missing), stage="query_generation")
+    for i, queries in zip(missing, map_concurrently(generate_search_queries, [claims[i] for i in missing], TEXT_PIPELINE_MAX_WORKERS)):
+        queries_per_claim[i] = queries
+    return queries_per_claim
@@ -18,4 +18,262 @@ LLM_VERIFIER_MODEL = "llama-3.1-8b-instant"      # was "llama3-8b-8192"
 # LLM_VERIFIER_MODEL = "llama-3.3-70b-versatile"  # More powerful but slower
 
 # Local ML Model Configurations (Hugging Face)
-NLI_MODEL = "MoritzLaurer/DeBERTa-v3-base-mnli-fever-anli"
\ No newline at end of file
+NLI_MODEL = "MoritzLaurer/DeBERTa-v3-base-mnli-fever-anli"
+
+# Pipeline Concurrency
+# Maximum number of claims verified in parallel for a single text request.
+TEXT_PIPELINE_MAX_WORKERS = int(os.getenv("TEXT_PIPELINE_MAX_WORKERS", "4"))
+
+# Groq HTTP Client
+GROQ_API_URL = os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
+GROQ_TIMEOUT_SECONDS = float(os.getenv("GROQ_TIMEOUT_SECONDS", "60"))
+GROQ_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", "3"))
+GROQ_BACKOFF_BASE_SECONDS = float(os.getenv("GROQ_BACKOFF_BASE_SECONDS", "0.5"))
+GROQ_BACKOFF_MAX_SECONDS = float(os.getenv("GROQ_BACKOFF_MAX_SECONDS", "20"))
+# Size of the keep-alive connection pool; should cover the number of concurrent pipeline threads.
+GROQ_POOL_SIZE = int(os.getenv("GROQ_POOL_SIZE", "16"))
+
+# NLI Batching
+# Number of (claim, snippet) pairs per forward pass, and the token limit per pair.
+NLI_BATCH_SIZE = int(os.getenv("NLI_BATCH_SIZE", "16"))
+NLI_MAX_LENGTH = int(os.getenv("NLI_MAX_LENGTH", "512"))
+
+# Check-Worthiness Filter
+# Extracted claims are scored on CPU before verification; only check-worthy ones reach the
+# query generation, search, NLI and LLM stages, the rest are reported as SKIPPED.
+# Off by default: a skipped false claim is worse than a wasted lookup. Claims are only skipped when
+# CHECKWORTHINESS_MODEL scores them; the built-in linear model just ranks them. Run
+# scripts/check_checkworthiness.py against the model before enabling it.
+CHECKWORTHINESS_ENABLED = os.getenv("CHECKWORTHINESS_ENABLED", "false").lower() in ("1", "true", "yes")
+CHECKWORTHINESS_THRESHOLD = float(os.getenv("CHECKWORTHINESS_THRESHOLD", "0.5"))
+# At most this many claims are verified per request (0 = no limit).
+CHECKWORTHINESS_TOP_K = int(os.getenv("CHECKWORTHINESS_TOP_K", "10"))
+# The best-scoring claims are always verified, so a single low-scoring claim is not silently dropped.
+CHECKWORTHINESS_MIN_KEEP = int(os.getenv("CHECKWORTHINESS_MIN_KEEP", "1"))
+# Optional Hugging Face text-classification model; empty uses the built-in linear feature model.
+CHECKWORTHINESS_MODEL = os.getenv("CHECKWORTHINESS_MODEL", "")
+CHECKWORTHINESS_POSITIVE_LABEL = os.getenv("CHECKWORTHINESS_POSITIVE_LABEL", "LABEL_1")
+
+# Model Loading
+# Models are loaded lazily on first use. MODEL_PRELOAD_ROLE selects which ones are loaded
+# (and warmed up) at startup instead: "text", "image", "all" or "none".
+MODEL_PRELOAD_ROLE = os.getenv("MODEL_PRELOAD_ROLE", "none")
+_TEXT_MODELS = ["nli", "claim_embedder"] + (["checkworthiness"] if CHECKWORTHINESS_MODEL else [])
+MODEL_ROLES = {
+    "none": [],
+    "text": _TEXT_MODELS,
+    "image": ["captioner", "authenticity_detector", "ocr_reader"],
+    "all": _TEXT_MODELS + ["captioner", "authenticity_detector", "ocr_reader"],
+}
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "true").lower() in ("1", "true", "yes")
+# A failed load is retried on the next use once this many seconds have passed.
+MODEL_LOAD_RETRY_SECONDS = float(os.getenv("MODEL_LOAD_RETRY_SECONDS", "60"))
+
+# Local Inference Server
+# One process (python -m src.serving.inference_server) owns these models and serves every app
+# process on the machine, coalescing concurrent requests into micro-batches. When
+# INFERENCE_SERVER_URL is set ("http://127.0.0.1:8765" or "unix:///tmp/factcheck-inference.sock"),
+# the pipeline modules send their inference there and don't load the served models themselves.
+INFERENCE_SERVER_URL = os.getenv("INFERENCE_SERVER_URL", "")
+INFERENCE_SERVER_MODELS = ["captioner", "ocr_reader", "authenticity_detector", "nli"]
+if INFERENCE_SERVER_URL:
+    MODEL_ROLES = {role: [m for m in names if m not in INFERENCE_SERVER_MODELS] for role, names in MODEL_ROLES.items()}
+# Items per micro-batch, and how long the first request of a batch waits for others to join it.
+INFERENCE_SERVER_MAX_BATCH = int(os.getenv("INFERENCE_SERVER_MAX_BATCH", "32"))
+INFERENCE_SERVER_MAX_WAIT_MS = float(os.getenv("INFERENCE_SERVER_MAX_WAIT_MS", "10"))
+INFERENCE_SERVER_TIMEOUT_SECONDS = float(os.getenv("INFERENCE_SERVER_TIMEOUT_SECONDS", "120"))
+
+# Persistent Caches
+CACHE_DIR = os.getenv("FACTCHECK_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "multimodal-fact-checker"))
+SEARCH_CACHE_PATH = os.getenv("SEARCH_CACHE_PATH", os.path.join(CACHE_DIR, "search_cache.sqlite3"))
+SEARCH_CACHE_TTL_SECONDS = float(os.getenv("SEARCH_CACHE_TTL_SECONDS", str(24 * 3600)))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "50000"))
+SEARCH_CACHE_ENABLED = os.getenv("SEARCH_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+IMAGE_CACHE_PATH = os.getenv("IMAGE_CACHE_PATH", os.path.join(CACHE_DIR, "image_cache.sqlite3"))
+IMAGE_CACHE_MAX_ENTRIES = int(os.getenv("IMAGE_CACHE_MAX_ENTRIES", "30000"))
+IMAGE_CACHE_ENABLED = os.getenv("IMAGE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+# Per-section freshness: the model outputs never change for the same bytes, the web-dependent sections do.
+IMAGE_CACHE_TTLS = {
+    "image_analysis": 30 * 24 * 3600,
+    "online_history": 24 * 3600,
+    "thematic_search": 6 * 3600,
+}
+# Near-duplicate lookup for reposted images (perceptual hash, max Hamming distance out of 64 bits).
+NEAR_DUPLICATE_ENABLED = os.getenv("NEAR_DUPLICATE_ENABLED", "true").lower() in ("1", "true", "yes")
+NEAR_DUPLICATE_INDEX_PATH = os.getenv("NEAR_DUPLICATE_INDEX_PATH", os.path.join(CACHE_DIR, "phash_index.npz"))
+NEAR_DUPLICATE_MAX_DISTANCE = int(os.getenv("NEAR_DUPLICATE_MAX_DISTANCE", "6"))
+NEAR_DUPLICATE_SAVE_EVERY = int(os.getenv("NEAR_DUPLICATE_SAVE_EVERY", "25"))
+
+# Verified-claim store: semantically repeated claims reuse a stored verdict.
+CLAIM_STORE_ENABLED = os.getenv("CLAIM_STORE_ENABLED", "true").lower() in ("1", "true", "yes")
+CLAIM_STORE_PATH = os.getenv("CLAIM_STORE_PATH", os.path.join(CACHE_DIR, "claim_store.sqlite3"))
+CLAIM_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+# Minimum cosine similarity for two claims to be treated as the same claim.
+CLAIM_SIMILARITY_THRESHOLD = float(os.getenv("CLAIM_SIMILARITY_THRESHOLD", "0.92"))
+CLAIM_STORE_MAX_AGE_SECONDS = float(os.getenv("CLAIM_STORE_MAX_AGE_SECONDS", str(7 * 24 * 3600)))
+# Only conclusive verdicts are reused; NOT ENOUGH INFO may change as new coverage appears.
+CLAIM_STORE_CACHEABLE_VERDICTS = ("SUPPORTED", "REFUTED")
+# Above this many stored claims, an approximate index (faiss HNSW) is used if faiss is installed.
+CLAIM_STORE_ANN_MIN_SIZE = int(os.getenv("CLAIM_STORE_ANN_MIN_SIZE", "50000"))
+# Most claims kept (newest first); older rows are deleted and dropped from the in-memory matrix.
+CLAIM_STORE_MAX_ENTRIES = int(os.getenv("CLAIM_STORE_MAX_ENTRIES", "200000"))
+
+# Inference Backend
+# "pytorch" runs the NLI and authenticity models through transformers in fp32. "onnx" exports
+# them once to ONNX with dynamic int8 quantization and serves them through ONNX Runtime
+# (needs `pip install optimum[onnxruntime]`); if that fails the PyTorch models are used.
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "pytorch").lower()
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", os.path.join(CACHE_DIR, "onnx"))
+ONNX_QUANTIZE = os.getenv("ONNX_QUANTIZE", "true").lower() in ("1", "true", "yes")
+# Threads per ONNX Runtime session (0 = one per physical core). Lower it when several workers share a host.
+ONNX_INTRA_OP_THREADS = int(os.getenv("ONNX_INTRA_OP_THREADS", "0"))
+
+# SerpAPI
+# Queries of one get_evidence_snippets call are issued concurrently, up to this many at a time.
+SERPAPI_MAX_CONCURRENCY = int(os.getenv("SERPAPI_MAX_CONCURRENCY", "4"))
+SERPAPI_TIMEOUT_SECONDS = float(os.getenv("SERPAPI_TIMEOUT_SECONDS", "15"))
+# Endpoint overrides, e.g. to point the pipelines at the local stand-ins of scripts/stand_in_servers.py.
+SERPAPI_BASE_URL = os.getenv("SERPAPI_BASE_URL", "https://serpapi.com")
+
+# imgbb (temporary public URLs for reverse image search)
+IMGBB_UPLOAD_URL = os.getenv("IMGBB_UPLOAD_URL", "https://api.imgbb.com/1/upload")
+IMGBB_TIMEOUT_SECONDS = float(os.getenv("IMGBB_TIMEOUT_SECONDS", "30"))
+
+# Image Batch Verification
+IMAGE_BATCH_SIZE = int(os.getenv("IMAGE_BATCH_SIZE", "8"))
+# Worker threads for the per-image network and OCR stages of a batch.
+IMAGE_BATCH_MAX_WORKERS = int(os.getenv("IMAGE_BATCH_MAX_WORKERS", "8"))
+
+# Image Preprocessing
+# Each model gets a copy sized for its input resolution instead of the full-size photo.
+CAPTION_MIN_SIDE = int(os.getenv("CAPTION_MIN_SIDE", "384"))    # BLIP base input is 384x384
+DETECTOR_MIN_SIDE = int(os.getenv("DETECTOR_MIN_SIDE", "224"))  # ViT input is 224x224
+OCR_MAX_SIDE = int(os.getenv("OCR_MAX_SIDE", "1600"))
+UPLOAD_MAX_SIDE = int(os.getenv("UPLOAD_MAX_SIDE", "1600"))
+UPLOAD_JPEG_QUALITY = int(os.getenv("UPLOAD_JPEG_QUALITY", "85"))
+# Originals at or below this size (and within UPLOAD_MAX_SIDE) are uploaded unchanged.
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(1024 * 1024)))
+
+# Deterministic Fast Path (reasoning engine)
+# Conclusive red flags produce a verdict without calling the LLM.
+DETERMINISTIC_FAST_PATH_ENABLED = os.getenv("DETERMINISTIC_FAST_PATH_ENABLED", "true").lower() in ("1", "true", "yes")
+# Weight of each debunking keyword found in a reverse-search title or thematic snippet.
+# A document contributes at most 1.0, scaled by the weight of the section it came from.
+# Bare "fake", "false", "misleading" and "fact check" also appear in fact checks confirming an
+# image is real, so only phrases that assert a debunk are listed, and negated matches
+# ("not a hoax", "isn't doctored") don't count.
+DEBUNK_KEYWORD_WEIGHTS = {
+    "hoax": 1.0,
+    "debunked": 1.0,
+    "photoshopped": 1.0,
+    "doctored": 1.0,
+    "fabricated": 1.0,
+    "manipulated": 0.75,
+    "ai-generated": 0.75,
+    "ai generated": 0.75,
+    "is fake": 0.75,
+    "are fake": 0.75,
+    "false claim": 0.75,
+    "false claims": 0.75,
+    "falsely": 0.5,
+}
+DEBUNK_SECTION_WEIGHTS = {"online_history": 1.0, "thematic_search": 0.75}
+# Rules are checked in order and the first whose conditions all hold decides the verdict.
+# Supported conditions: min_debunk_score, min_debunk_documents, detector_verdict,
+# min_detector_confidence, intent, query_keywords_any, query_keywords_none.
+DETERMINISTIC_RULES = [
+    {
+        "name": "widely_debunked",
+        "min_debunk_score": 2.5,
+        "min_debunk_documents": 3,
+        # REFUTED answers "is this real?"; for "is this fake?" it would be the opposite answer.
+        "query_keywords_any": ["real", "true", "authentic", "genuine", "original", "happen", "happened", "accurate", "legit"],
+        "query_keywords_none": ["fake", "faked", "false", "hoax", "ai", "generated", "photoshop", "photoshopped",
+                                "edited", "doctored", "manipulated", "staged", "misleading"],
+        "verdict": {"final_verdict": "REFUTED", "event_truthfulness": "Event is Fake", "image_context": "Misleading Context"},
+    },
+    {
+        "name": "high_confidence_ai_image",
+        "intent": "IMAGE_AUTHENTICITY",
+        "detector_verdict": "Fake",
+        "min_detector_confidence": 0.97,
+        "query_keywords_any": ["real", "authentic", "genuine", "original"],
+        "query_keywords_none": ["fake", "ai", "generated", "photoshop", "edited", "doctored"],
+        "verdict": {"final_verdict": "REFUTED", "event_truthfulness": "N/A", "image_context": "Fabricated Image"},
+    },
+]
+
+# Logging, Tracing & Metrics
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# One JSON line per finished span (trace_id, span_id, parent_id, name, duration, ...). Empty disables it.
+TRACE_LOG_PATH = os.getenv("TRACE_LOG_PATH", "")
+# Prometheus text-format metrics file, rewritten after every top-level request (e.g. for the
+# node_exporter textfile collector). Empty disables it.
+METRICS_PATH = os.getenv("METRICS_PATH", "")
+# Port for an HTTP /metrics endpoint started by start_metrics_server(). 0 disables it.
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))
+# Interface the metrics endpoint binds to; set to 0.0.0.0 to let a scraper on another host reach it.
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+# RSS snapshots around model stages; tracemalloc additionally reports Python heap peaks (slow).
+TRACE_MEMORY = os.getenv("TRACE_MEMORY", "false").lower() in ("1", "true", "yes")
+TRACE_TRACEMALLOC = os.getenv("TRACE_TRACEMALLOC", "false").lower() in ("1", "true", "yes")
+
+# Batched LLM Calls
+# Query generation and verdicts for all claims of a request are sent as one JSON call per chunk
+# instead of one call per claim. Chunks are split to stay within the context budget.
+LLM_BATCHING_ENABLED = os.getenv("LLM_BATCHING_ENABLED", "true").lower() in ("1", "true", "yes")
+LLM_BATCH_MAX_CLAIMS = int(os.getenv("LLM_BATCH_MAX_CLAIMS", "8"))
+# Tokens available per batched call (prompt + expected output), kept well below the model's
+# context window so requests also stay small relative to the provider's tokens-per-minute limit.
+LLM_BATCH_TOKEN_BUDGET = int(os.getenv("LLM_BATCH_TOKEN_BUDGET", "6000"))
+
+# Evidence Post-Processing
+# Near-duplicate snippets (syndicated copies of one article) are collapsed and the rest ranked
+# against the claim with BM25 before NLI and the LLM see them.
+EVIDENCE_RANKING_ENABLED = os.getenv("EVIDENCE_RANKING_ENABLED", "true").lower() in ("1", "true", "yes")
+# Snippets kept per claim (0 = keep all distinct snippets).
+EVIDENCE_TOP_K = int(os.getenv("EVIDENCE_TOP_K", "6"))
+# Estimated Jaccard similarity of word shingles above which two snippets count as duplicates.
+EVIDENCE_DUPLICATE_THRESHOLD = float(os.getenv("EVIDENCE_DUPLICATE_THRESHOLD", "0.6"))
+EVIDENCE_SHINGLE_SIZE = int(os.getenv("EVIDENCE_SHINGLE_SIZE", "3"))
+EVIDENCE_MINHASH_PERMUTATIONS = int(os.getenv("EVIDENCE_MINHASH_PERMUTATIONS", "64"))
+
+# Prompt Budgets
+# Input tokens allowed for one single-call prompt (verifier, image synthesis), per model. The context
+# windows are far larger, but Groq latency and cost grow with every input token, so evidence is
+# prioritized and truncated to fit. Models not listed use PROMPT_TOKEN_BUDGET.
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "2500"))
+PROMPT_TOKEN_BUDGETS = {
+    "llama-3.1-8b-instant": PROMPT_TOKEN_BUDGET,
+    "llama-3.3-70b-versatile": 4000,
+}
+# Per-item caps applied before the budget, so one long snippet can't crowd out the rest.
+PROMPT_SNIPPET_MAX_TOKENS = int(os.getenv("PROMPT_SNIPPET_MAX_TOKENS", "120"))
+PROMPT_TITLE_MAX_TOKENS = int(os.getenv("PROMPT_TITLE_MAX_TOKENS", "40"))
+PROMPT_OCR_MAX_TOKENS = int(os.getenv("PROMPT_OCR_MAX_TOKENS", "300"))
+
+# Job API
+# Headless HTTP API (python -m src.serving.job_api): checks are submitted as jobs, queued in
+# SQLite and run by per-type worker pools; clients poll for the result.
+JOB_API_HOST = os.getenv("JOB_API_HOST", "127.0.0.1")
+JOB_API_PORT = int(os.getenv("JOB_API_PORT", "8080"))
+# Optional bearer token required on every request. Empty disables authentication.
+JOB_API_TOKEN = os.getenv("JOB_API_TOKEN", "")
+JOB_QUEUE_PATH = os.getenv("JOB_QUEUE_PATH", os.path.join(CACHE_DIR, "jobs.sqlite3"))
+JOB_WORKERS = {
+    "text": int(os.getenv("JOB_TEXT_WORKERS", "2")),
+    "image": int(os.getenv("JOB_IMAGE_WORKERS", "1")),
+}
+# Queued (not yet running) jobs allowed per type; beyond this, submissions get 429 Too Many Requests.
+JOB_MAX_PENDING = {
+    "text": int(os.getenv("JOB_TEXT_MAX_PENDING", "100")),
+    "image": int(os.getenv("JOB_IMAGE_MAX_PENDING", "20")),
+}
+# Finished jobs (and their results) are kept this long, then purged.
+JOB_RESULT_TTL_SECONDS = float(os.getenv("JOB_RESULT_TTL_SECONDS", str(3600)))
+# A job still "running" after this long is assumed lost with its worker process and is queued again.
+JOB_MAX_RUN_SECONDS = float(os.getenv("JOB_MAX_RUN_SECONDS", "900"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "2"))
+# Idle workers check the queue at least this often (jobs submitted to this process wake them at once).
+JOB_POLL_INTERVAL_SECONDS = float(os.getenv("JOB_POLL_INTERVAL_SECONDS", "1.0"))
+JOB_MAX_REQUEST_BYTES = int(os.getenv("JOB_MAX_REQUEST_BYTES", str(20 * 1024 * 1024)))
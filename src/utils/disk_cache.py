@@ -0,0 +1,168 @@
+# src/utils/disk_cache.py
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from src.utils.logging import get_logger, increment
+
+logger = get_logger("DiskCache")
+
+# An eviction trims the cache this far below max_entries, so the next writes don't evict again.
+EVICTION_HEADROOM = 0.1
+# Writes between recounts of the table, which picks up entries written by other processes.
+RECOUNT_INTERVAL = 256
+
+
+def make_cache_key(*parts) -> str:
+    """
+    Builds a stable key from JSON-serializable parts (dict keys are sorted).
+    """
+    serialized = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """
+    A size-bounded key/value cache stored in a single SQLite file.
+
+    Values are stored as JSON with a per-entry expiry time. When the number of entries
+    exceeds max_entries, the least recently used entries are evicted. The entry count is
+    estimated in memory and only recounted every RECOUNT_INTERVAL writes or when the estimate
+    exceeds max_entries, so writes don't scan the table. The database runs in
+    WAL mode with a busy timeout, so several worker processes can share one file safely.
+    Hit, miss, write and eviction counters are kept per process in `stats`.
+    """
+
+    def __init__(self, path: str, default_ttl: float, max_entries: int, table: str = "cache"):
+        self.path = path
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.table = table
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "writes": 0, "evictions": 0}
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        # Estimated number of rows; None until the first write counts them.
+        self._size_estimate = None
+        self._writes_since_count = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {self.table}_last_access ON {self.table} (last_access)")
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must not be shared between threads, so each thread keeps its own.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[name] += amount
+        increment("cache_events_total", amount, cache=self.table, event=name)
+
+    def get(self, key: str):
+        """
+        Returns the cached value for key, or None if it is missing or expired.
+        """
+        now = time.time()
+        try:
+            conn = self._connection()
+            row = conn.execute(f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self._count("misses")
+                return None
+            value, expires_at = row
+            if expires_at < now:
+                conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._count("expired")
+                self._count("misses")
+                return None
+            conn.execute(f"UPDATE {self.table} SET last_access = ? WHERE key = ?", (now, key))
+            self._count("hits")
+            return json.loads(value)
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"Read failed for '{self.path}': {e}")
+            self._count("misses")
+            return None
+
+    def set(self, key: str, value, ttl: float | None = None) -> None:
+        """
+        Stores a JSON-serializable value. Once the cache holds more than max_entries, the least
+        recently used entries are evicted down to EVICTION_HEADROOM below it.
+        """
+        now = time.time()
+        expires_at = now + (self.default_ttl if ttl is None else ttl)
+        try:
+            conn = self._connection()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value, ensure_ascii=False), expires_at, now)
+                )
+                evicted = self._evict(conn)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            self._count("writes")
+            if evicted:
+                self._count("evictions", evicted)
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"Write failed for '{self.path}': {e}")
+
+    def _evict(self, conn: sqlite3.Connection) -> int:
+        with self._stats_lock:
+            if self._size_estimate is not None:
+                self._size_estimate += 1
+                self._writes_since_count += 1
+            recount = (
+                self._size_estimate is None
+                or self._size_estimate > self.max_entries
+                or self._writes_since_count >= RECOUNT_INTERVAL
+            )
+        if not recount:
+            return 0
+
+        (size,) = conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        overflow = 0
+        if size > self.max_entries:
+            overflow = size - int(self.max_entries * (1 - EVICTION_HEADROOM))
+            conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN "
+                f"(SELECT key FROM {self.table} ORDER BY last_access ASC LIMIT ?)",
+                (overflow,)
+            )
+        with self._stats_lock:
+            self._size_estimate = size - overflow
+            self._writes_since_count = 0
+        return overflow
+
+    def purge_expired(self) -> int:
+        """
+        Deletes all expired entries and returns how many were removed.
+        """
+        try:
+            cursor = self._connection().execute(f"DELETE FROM {self.table} WHERE expires_at < ?", (time.time(),))
+            with self._stats_lock:
+                if self._size_estimate is not None:
+                    self._size_estimate = max(0, self._size_estimate - cursor.rowcount)
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            logger.warning(f"Purge failed for '{self.path}': {e}")
+            return 0
+
+    def __len__(self) -> int:
+        (size,) = self._connection().execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()
+        return size
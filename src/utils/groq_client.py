@@ -0,0 +1,143 @@
+# src/utils/groq_client.py
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from src.utils.config import (
+    GROQ_API_KEY,
+    GROQ_API_URL,
+    GROQ_TIMEOUT_SECONDS,
+    GROQ_MAX_RETRIES,
+    GROQ_BACKOFF_BASE_SECONDS,
+    GROQ_BACKOFF_MAX_SECONDS,
+    GROQ_POOL_SIZE,
+)
+from src.utils.logging import get_logger, external_call, increment
+
+logger = get_logger("GroqClient")
+
+# Status codes worth retrying: rate limiting and transient server-side failures.
+RETRYABLE_STATUS_CODES = {408, 409, 425, 429, 500, 502, 503, 504}
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _get_session() -> requests.Session:
+    """
+    Returns the process-wide Groq session, creating it on first use.
+    The session keeps connections alive so repeated calls skip the TCP/TLS handshake.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                # Retries are handled in chat_completion so that Retry-After and jitter apply uniformly.
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=GROQ_POOL_SIZE, max_retries=0)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.headers.update({
+                    "Authorization": f"Bearer {GROQ_API_KEY}",
+                    "Content-Type": "application/json"
+                })
+                _session = session
+    return _session
+
+
+def _retry_after_seconds(response: requests.Response) -> float | None:
+    """
+    Parses the Retry-After header, which may be either a number of seconds or an HTTP date.
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff_delay(attempt: int, retry_after: float | None) -> float:
+    """
+    Full-jitter exponential backoff, never shorter than the server's Retry-After hint.
+    """
+    ceiling = min(GROQ_BACKOFF_MAX_SECONDS, GROQ_BACKOFF_BASE_SECONDS * (2 ** attempt))
+    delay = random.uniform(0, ceiling)
+    if retry_after is not None:
+        delay = max(delay, min(retry_after, GROQ_BACKOFF_MAX_SECONDS))
+    return delay
+
+
+def chat_completion(
+    model: str,
+    messages: list[dict],
+    temperature: float = 0.0,
+    timeout: float | None = None,
+    max_retries: int | None = None,
+    **extra_params
+) -> dict:
+    """
+    Sends a chat completion request to Groq through the shared pooled session.
+
+    Args:
+        model: The Groq model name.
+        messages: The chat messages (system/user) to send.
+        temperature: Sampling temperature.
+        timeout: Per-attempt timeout in seconds. Defaults to GROQ_TIMEOUT_SECONDS.
+        max_retries: Retries after the first attempt. Defaults to GROQ_MAX_RETRIES.
+        **extra_params: Additional payload fields such as top_p.
+
+    Returns:
+        A dictionary with 'ok', 'content', 'error', 'status_code' and 'attempts'.
+        On failure 'ok' is False, 'content' is None and 'error' describes the last failure.
+    """
+    if not GROQ_API_KEY:
+        return {"ok": False, "content": None, "error": "GROQ_API_KEY not found.", "status_code": None, "attempts": 0}
+
+    payload = {"model": model, "messages": messages, "temperature": temperature, **extra_params}
+    timeout = GROQ_TIMEOUT_SECONDS if timeout is None else timeout
+    max_retries = GROQ_MAX_RETRIES if max_retries is None else max_retries
+    session = _get_session()
+
+    error, status_code = None, None
+    for attempt in range(max_retries + 1):
+        retry_after = None
+        try:
+            with external_call("groq") as call:
+                response = session.post(GROQ_API_URL, json=payload, timeout=timeout)
+                if not response.ok:
+                    call["outcome"] = "rate_limited" if response.status_code == 429 else "error"
+            status_code = response.status_code
+            if response.ok:
+                content = response.json()["choices"][0]["message"]["content"].strip()
+                return {"ok": True, "content": content, "error": None, "status_code": status_code, "attempts": attempt + 1}
+
+            error = f"HTTP {status_code}: {response.text[:200]}"
+            if status_code not in RETRYABLE_STATUS_CODES:
+                break
+            retry_after = _retry_after_seconds(response)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            error, status_code = f"{type(e).__name__}: {e}", None
+        except requests.RequestException as e:
+            error = f"{type(e).__name__}: {e}"
+            break
+        except (KeyError, IndexError, ValueError) as e:
+            # A 200 response with an unexpected body will not fix itself on retry.
+            error = f"Malformed response: {e}"
+            break
+
+        if attempt < max_retries:
+            delay = _backoff_delay(attempt, retry_after)
+            logger.warning(f"Attempt {attempt + 1} failed ({error}). Retrying in {delay:.2f}s...")
+            increment("external_retries_total", service="groq")
+            time.sleep(delay)
+
+    return {"ok": False, "content": None, "error": error, "status_code": status_code, "attempts": attempt + 1}
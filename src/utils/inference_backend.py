@@ -0,0 +1,138 @@
+# src/utils/inference_backend.py
+import os
+import platform
+import shutil
+from src.utils.config import INFERENCE_BACKEND, ONNX_MODEL_DIR, ONNX_QUANTIZE, ONNX_INTRA_OP_THREADS
+from src.utils.logging import get_logger
+
+logger = get_logger("InferenceBackend")
+
+BACKENDS = ("pytorch", "onnx")
+# optimum.onnxruntime model class for each pipeline task we serve.
+_ORT_MODEL_CLASSES = {
+    "text-classification": "ORTModelForSequenceClassification",
+    "image-classification": "ORTModelForImageClassification",
+}
+ONNX_FILE_NAME = "model.onnx"
+QUANTIZED_FILE_NAME = "model_quantized.onnx"
+
+
+def _model_dir(model_id: str, variant: str) -> str:
+    return os.path.join(ONNX_MODEL_DIR, model_id.replace("/", "--"), variant)
+
+
+def _save_preprocessor(task: str, source: str, target_dir: str) -> None:
+    if task == "image-classification":
+        from transformers import AutoImageProcessor
+        AutoImageProcessor.from_pretrained(source).save_pretrained(target_dir)
+    else:
+        from transformers import AutoTokenizer
+        AutoTokenizer.from_pretrained(source).save_pretrained(target_dir)
+
+
+def _publish(tmp_dir: str, target_dir: str) -> None:
+    # Another worker may have finished the same export first; its copy is just as good.
+    try:
+        os.rename(tmp_dir, target_dir)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _quantization_config():
+    """Dynamic int8 quantization config (no calibration data needed) for the CPU we are running on."""
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    if platform.machine().lower() in ("arm64", "aarch64"):
+        return AutoQuantizationConfig.arm64(is_static=False, per_channel=False)
+    try:
+        with open("/proc/cpuinfo") as f:
+            cpu_flags = f.read()
+    except OSError:
+        cpu_flags = ""
+    if "avx512_vnni" in cpu_flags:
+        return AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+    return AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+
+
+def export_onnx_model(task: str, model_id: str, quantize: bool = ONNX_QUANTIZE) -> tuple[str, str]:
+    """
+    Exports a Hugging Face model to ONNX (and quantizes it to int8) under ONNX_MODEL_DIR.
+    Each step runs only once; later calls reuse the files on disk.
+
+    Args:
+        task: The pipeline task, "text-classification" or "image-classification".
+        model_id: The Hugging Face model id.
+        quantize: Whether to return the dynamically quantized int8 model instead of the fp32 export.
+
+    Returns:
+        The directory holding the model, config and preprocessor, and the ONNX file name in it.
+    """
+    import optimum.onnxruntime as ort
+
+    fp32_dir = _model_dir(model_id, "fp32")
+    if not os.path.exists(os.path.join(fp32_dir, ONNX_FILE_NAME)):
+        logger.info(f"Exporting '{model_id}' to ONNX in {fp32_dir}...")
+        tmp_dir = f"{fp32_dir}.{os.getpid()}.tmp"
+        model_class = getattr(ort, _ORT_MODEL_CLASSES[task])
+        model_class.from_pretrained(model_id, export=True).save_pretrained(tmp_dir)
+        _save_preprocessor(task, model_id, tmp_dir)
+        _publish(tmp_dir, fp32_dir)
+    if not quantize:
+        return fp32_dir, ONNX_FILE_NAME
+
+    int8_dir = _model_dir(model_id, "int8")
+    if not os.path.exists(os.path.join(int8_dir, QUANTIZED_FILE_NAME)):
+        logger.info(f"Quantizing '{model_id}' to int8 in {int8_dir}...")
+        tmp_dir = f"{int8_dir}.{os.getpid()}.tmp"
+        quantizer = ort.ORTQuantizer.from_pretrained(fp32_dir, file_name=ONNX_FILE_NAME)
+        quantizer.quantize(save_dir=tmp_dir, quantization_config=_quantization_config())
+        _save_preprocessor(task, fp32_dir, tmp_dir)
+        _publish(tmp_dir, int8_dir)
+    return int8_dir, QUANTIZED_FILE_NAME
+
+
+def _load_onnx_pipeline(task: str, model_id: str):
+    import onnxruntime
+    import optimum.onnxruntime as ort
+    from transformers import pipeline
+
+    model_dir, file_name = export_onnx_model(task, model_id)
+    options = onnxruntime.SessionOptions()
+    if ONNX_INTRA_OP_THREADS:
+        options.intra_op_num_threads = ONNX_INTRA_OP_THREADS
+    model = getattr(ort, _ORT_MODEL_CLASSES[task]).from_pretrained(
+        model_dir, file_name=file_name, session_options=options, provider="CPUExecutionProvider"
+    )
+    if task == "image-classification":
+        from transformers import AutoImageProcessor
+        return pipeline(task, model=model, image_processor=AutoImageProcessor.from_pretrained(model_dir))
+    from transformers import AutoTokenizer
+    return pipeline(task, model=model, tokenizer=AutoTokenizer.from_pretrained(model_dir))
+
+
+def load_pipeline(task: str, model_id: str, backend: str = INFERENCE_BACKEND, fallback: bool = True):
+    """
+    Builds a transformers pipeline for a classification model on the selected inference backend.
+
+    The ONNX Runtime pipeline exposes the same labels, config and output format as the PyTorch one,
+    so callers don't need to know which backend they got.
+
+    Args:
+        task: The pipeline task, "text-classification" or "image-classification".
+        model_id: The Hugging Face model id.
+        backend: "pytorch" or "onnx". Defaults to INFERENCE_BACKEND.
+        fallback: Whether to fall back to PyTorch when the ONNX model can't be built or loaded.
+    """
+    from transformers import pipeline
+
+    if backend == "onnx":
+        try:
+            onnx_pipeline = _load_onnx_pipeline(task, model_id)
+            logger.info(f"'{model_id}' running on ONNX Runtime ({'int8' if ONNX_QUANTIZE else 'fp32'}).")
+            return onnx_pipeline
+        except Exception as e:
+            if not fallback:
+                raise
+            logger.warning(f"ONNX backend unavailable for '{model_id}', falling back to PyTorch: {e}")
+    elif backend != "pytorch":
+        logger.warning(f"Unknown inference backend '{backend}'. Expected one of {list(BACKENDS)}; using PyTorch.")
+    return pipeline(task, model=model_id)
@@ -0,0 +1,81 @@
+# src/utils/llm_batching.py
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.logging import submit_with_context
+
+_CODE_FENCE = re.compile(r"^```(?:json)?\s*|\s*```$", re.IGNORECASE)
+
+
+def chunk_by_token_budget(costs: list[int], budget: int, max_items: int) -> list[list[int]]:
+    """
+    Splits items (given by their token cost) into consecutive chunks whose total cost stays within
+    the budget and that hold at most max_items each. An item over the budget on its own gets its own chunk.
+
+    Returns:
+        Lists of item indices, in order.
+    """
+    chunks, current, current_cost = [], [], 0
+    for i, cost in enumerate(costs):
+        if current and (current_cost + cost > budget or len(current) >= max_items):
+            chunks.append(current)
+            current, current_cost = [], 0
+        current.append(i)
+        current_cost += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def parse_json_object(content: str) -> dict | None:
+    """
+    Parses a JSON object from an LLM reply, tolerating code fences and text around the object.
+    Returns None if no object can be parsed.
+    """
+    text = _CODE_FENCE.sub("", content.strip())
+    try:
+        parsed = json.loads(text)
+        return parsed if isinstance(parsed, dict) else None
+    except ValueError:
+        pass
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end <= start:
+        return None
+    try:
+        parsed = json.loads(text[start:end + 1])
+        return parsed if isinstance(parsed, dict) else None
+    except ValueError:
+        return None
+
+
+def results_by_id(payload: dict | None, count: int) -> dict[int, dict]:
+    """
+    Maps each well-formed entry of payload["results"] to its integer "id" in [0, count).
+    Entries with a missing, invalid or duplicate id are dropped.
+    """
+    entries = payload.get("results") if isinstance(payload, dict) else None
+    if not isinstance(entries, list):
+        return {}
+    by_id = {}
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            entry_id = int(entry.get("id"))
+        except (TypeError, ValueError):
+            continue
+        if 0 <= entry_id < count and entry_id not in by_id:
+            by_id[entry_id] = entry
+    return by_id
+
+
+def map_concurrently(fn, items: list, max_workers: int) -> list:
+    """
+    Applies fn to every item on a thread pool (inline for a single item) and returns the results in order.
+    Spans opened by fn stay nested under the caller's span.
+    """
+    if len(items) <= 1 or max_workers <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items)), thread_name_prefix="llm-batch") as executor:
+        futures = [submit_with_context(executor, fn, item) for item in items]
+        return [future.result() for future in futures]
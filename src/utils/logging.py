@@ -0,0 +1,321 @@
+# src/utils/logging.py
+import atexit
+import contextvars
+import functools
+import json
+import logging
+import os
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.utils.config import LOG_LEVEL, TRACE_LOG_PATH, METRICS_PATH, METRICS_PORT, METRICS_HOST, TRACE_MEMORY, TRACE_TRACEMALLOC
+
+METRIC_PREFIX = "factcheck_"
+# Latency buckets in seconds, from cache hits up to slow LLM calls and model loads.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# --- Loggers ---
+
+class _TagFormatter(logging.Formatter):
+    # Keeps the "[Tag] message" layout the console output always had.
+    def format(self, record: logging.LogRecord) -> str:
+        record.tag = record.name.removeprefix("factcheck.")
+        return super().format(record)
+
+_root_logger = logging.getLogger("factcheck")
+if not _root_logger.handlers:
+    _handler = logging.StreamHandler(sys.stdout)
+    _handler.setFormatter(_TagFormatter("[%(tag)s] %(message)s"))
+    _root_logger.addHandler(_handler)
+    _root_logger.setLevel(LOG_LEVEL)
+    _root_logger.propagate = False
+
+def get_logger(tag: str) -> logging.Logger:
+    """
+    Returns the logger for one component; its messages are printed as "[tag] message".
+    """
+    return _root_logger.getChild(tag)
+
+logger = get_logger("Trace")
+
+# --- Metrics ---
+
+_metrics_lock = threading.Lock()
+_counters = {}
+_gauges = {}
+_histograms = {}
+
+def _metric_key(name: str, labels: dict) -> tuple:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+def increment(name: str, amount: float = 1, **labels) -> None:
+    """
+    Adds to a counter, e.g. increment("external_calls_total", service="groq", outcome="ok").
+    """
+    key = _metric_key(name, labels)
+    with _metrics_lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+def set_gauge(name: str, value: float, **labels) -> None:
+    """
+    Sets a gauge to its current value.
+    """
+    with _metrics_lock:
+        _gauges[_metric_key(name, labels)] = value
+
+def observe(name: str, value: float, **labels) -> None:
+    """
+    Records one observation (usually a duration in seconds) in a histogram.
+    """
+    key = _metric_key(name, labels)
+    with _metrics_lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = {"buckets": [0] * len(DEFAULT_BUCKETS), "sum": 0.0, "count": 0}
+        position = bisect_left(DEFAULT_BUCKETS, value)
+        if position < len(DEFAULT_BUCKETS):
+            histogram["buckets"][position] += 1
+        histogram["sum"] += value
+        histogram["count"] += 1
+
+def metrics_snapshot() -> dict:
+    """
+    Returns a copy of every metric as plain data: counters, gauges and histograms, each a list of
+    {"name", "labels", ...} entries. Histogram bucket counts are not cumulative here.
+    """
+    with _metrics_lock:
+        return {
+            "counters": [{"name": n, "labels": dict(l), "value": v} for (n, l), v in _counters.items()],
+            "gauges": [{"name": n, "labels": dict(l), "value": v} for (n, l), v in _gauges.items()],
+            "histograms": [
+                {"name": n, "labels": dict(l), "buckets": list(h["buckets"]), "sum": h["sum"], "count": h["count"]}
+                for (n, l), h in _histograms.items()
+            ],
+        }
+
+def reset_metrics() -> None:
+    with _metrics_lock:
+        _counters.clear()
+        _gauges.clear()
+        _histograms.clear()
+
+def _format_labels(labels: dict, extra: tuple = ()) -> str:
+    pairs = list(labels.items()) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+def render_prometheus() -> str:
+    """
+    Renders every metric in the Prometheus text exposition format.
+    """
+    snapshot = metrics_snapshot()
+    lines, typed = [], set()
+
+    def type_line(name, kind):
+        if name not in typed:
+            typed.add(name)
+            lines.append(f"# TYPE {name} {kind}")
+
+    for kind in ("counters", "gauges"):
+        for metric in sorted(snapshot[kind], key=lambda m: m["name"]):
+            name = METRIC_PREFIX + metric["name"]
+            type_line(name, "counter" if kind == "counters" else "gauge")
+            lines.append(f"{name}{_format_labels(metric['labels'])} {metric['value']}")
+
+    for metric in sorted(snapshot["histograms"], key=lambda m: m["name"]):
+        name = METRIC_PREFIX + metric["name"]
+        type_line(name, "histogram")
+        cumulative = 0
+        for bound, count in zip(DEFAULT_BUCKETS, metric["buckets"]):
+            cumulative += count
+            lines.append(f"{name}_bucket{_format_labels(metric['labels'], (('le', bound),))} {cumulative}")
+        lines.append(f"{name}_bucket{_format_labels(metric['labels'], (('le', '+Inf'),))} {metric['count']}")
+        lines.append(f"{name}_sum{_format_labels(metric['labels'])} {metric['sum']}")
+        lines.append(f"{name}_count{_format_labels(metric['labels'])} {metric['count']}")
+    return "\n".join(lines) + "\n"
+
+def write_metrics_file(path: str = METRICS_PATH) -> None:
+    """
+    Atomically rewrites the Prometheus metrics file, so a scraper never reads a partial file.
+    """
+    if not path:
+        return
+    try:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(render_prometheus())
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not write metrics file '{path}': {e}")
+
+atexit.register(write_metrics_file)
+
+_metrics_server = None
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_metrics_server(port: int = METRICS_PORT, host: str = METRICS_HOST):
+    """
+    Serves the metrics at http://host:port/metrics from a daemon thread. Does nothing if port is 0
+    or the server is already running. Returns the server, or None if it was not started.
+    """
+    global _metrics_server
+    if not port or _metrics_server is not None:
+        return _metrics_server
+    try:
+        _metrics_server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        logger.warning(f"Could not start metrics server on port {port}: {e}")
+        return None
+    threading.Thread(target=_metrics_server.serve_forever, name="metrics-server", daemon=True).start()
+    logger.info(f"Serving metrics on http://{host}:{port}/metrics")
+    return _metrics_server
+
+# --- Memory ---
+
+def memory_snapshot() -> dict:
+    """
+    Returns the current RSS (and the tracemalloc heap usage when TRACE_TRACEMALLOC is on) in MB.
+    """
+    snapshot = {}
+    try:
+        with open("/proc/self/statm") as f:
+            snapshot["rss_mb"] = round(int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20, 1)
+    except (OSError, ValueError, IndexError):
+        # Outside Linux only the peak RSS is available (kilobytes on Linux, bytes on macOS).
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        snapshot["rss_mb"] = round(peak / (2**20 if sys.platform == "darwin" else 2**10), 1)
+    if TRACE_TRACEMALLOC:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        current, peak = tracemalloc.get_traced_memory()
+        snapshot["heap_mb"], snapshot["heap_peak_mb"] = round(current / 2**20, 1), round(peak / 2**20, 1)
+    return snapshot
+
+# --- Spans ---
+
+_current_span = contextvars.ContextVar("factcheck_current_span", default=None)
+_trace_log_lock = threading.Lock()
+
+def current_span() -> dict | None:
+    return _current_span.get()
+
+def _write_trace(record: dict) -> None:
+    if not TRACE_LOG_PATH:
+        return
+    line = json.dumps(record, ensure_ascii=False, default=str)
+    try:
+        with _trace_log_lock:
+            with open(TRACE_LOG_PATH, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+    except OSError as e:
+        logger.warning(f"Could not write trace log '{TRACE_LOG_PATH}': {e}")
+
+@contextmanager
+def span(name: str, profile_memory: bool = False, **attributes):
+    """
+    Times a stage as a span nested under the current one (request -> claim -> stage).
+
+    The span dictionary is yielded so callers can add attributes while it is open. On exit the
+    duration is recorded in the stage_duration_seconds histogram, failures are counted in
+    errors_total, and the span is appended to the JSON trace log. With profile_memory and
+    TRACE_MEMORY enabled, RSS snapshots before and after the stage are attached.
+    Work submitted to executors must go through submit_with_context to stay in the trace.
+    """
+    parent = _current_span.get()
+    record = {
+        "trace_id": parent["trace_id"] if parent else uuid.uuid4().hex,
+        "span_id": uuid.uuid4().hex[:16],
+        "parent_id": parent["span_id"] if parent else None,
+        "name": name,
+        "start": time.time(),
+        "thread": threading.current_thread().name,
+        "attributes": attributes,
+        "status": "ok",
+    }
+    memory_before = memory_snapshot() if profile_memory and TRACE_MEMORY else None
+    token = _current_span.set(record)
+    start = time.perf_counter()
+    try:
+        yield record
+    except Exception as e:
+        record["status"], record["error"] = "error", f"{type(e).__name__}: {e}"
+        increment("errors_total", stage=name)
+        raise
+    finally:
+        record["duration_seconds"] = round(time.perf_counter() - start, 6)
+        try:
+            _current_span.reset(token)
+        except ValueError:
+            # A generator span can be closed from a different context than the one it was opened in.
+            _current_span.set(parent)
+        if memory_before is not None:
+            memory_after = memory_snapshot()
+            record["memory"] = {"before": memory_before, "after": memory_after}
+            set_gauge("process_rss_megabytes", memory_after["rss_mb"])
+        observe("stage_duration_seconds", record["duration_seconds"], stage=name)
+        logger.debug(f"{name} finished in {record['duration_seconds']:.3f}s ({record['status']})")
+        _write_trace(record)
+        if parent is None:
+            write_metrics_file()
+
+def traced(name: str | None = None, profile_memory: bool = False):
+    """
+    Decorator that runs every call of the function inside a span (named after the function by default).
+    """
+    def decorator(func):
+        span_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name, profile_memory=profile_memory):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def submit_with_context(executor, fn, *args, **kwargs):
+    """
+    executor.submit that carries the caller's context, so spans opened by the task nest under the
+    caller's span instead of starting a new trace on the worker thread.
+    """
+    return executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+@contextmanager
+def external_call(service: str):
+    """
+    Counts and times one call to an external service (groq, serpapi, imgbb).
+    The outcome label is "ok" unless the block raises or sets call["outcome"] itself.
+    """
+    call = {"outcome": "ok"}
+    start = time.perf_counter()
+    try:
+        yield call
+    except Exception:
+        call["outcome"] = "error"
+        raise
+    finally:
+        increment("external_calls_total", service=service, outcome=call["outcome"])
+        observe("external_call_seconds", time.perf_counter() - start, service=service)
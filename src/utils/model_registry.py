@@ -0,0 +1,135 @@
+# src/utils/model_registry.py
+import threading
+import time
+from src.utils.config import MODEL_PRELOAD_ROLE, MODEL_ROLES, MODEL_WARMUP, MODEL_LOAD_RETRY_SECONDS
+from src.utils.logging import get_logger, span, set_gauge
+
+logger = get_logger("ModelRegistry")
+
+# name -> {"loader", "warmup", "model", "error", "failed_at", "load_seconds", "warmed_up", "lock"}
+_models = {}
+_registry_lock = threading.Lock()
+
+
+def register_model(name: str, loader, warmup=None) -> None:
+    """
+    Registers a model under a name without loading it.
+
+    Args:
+        name: The registry name, e.g. "nli" or "captioner".
+        loader: A zero-argument callable that builds and returns the model.
+        warmup: Optional callable taking the loaded model and running a dummy inference.
+    """
+    with _registry_lock:
+        if name in _models:
+            return
+        _models[name] = {
+            "loader": loader,
+            "warmup": warmup,
+            "model": None,
+            "error": None,
+            "failed_at": None,
+            "load_seconds": None,
+            "warmed_up": False,
+            "lock": threading.Lock(),
+        }
+
+
+def get_model(name: str):
+    """
+    Returns the named model, loading it on first use.
+
+    Concurrent callers wait for a single load. If loading fails the error is logged and None is
+    returned; the load is attempted again once MODEL_LOAD_RETRY_SECONDS have passed.
+    """
+    entry = _models.get(name)
+    if entry is None:
+        raise KeyError(f"No model registered under '{name}'.")
+    if entry["model"] is not None:
+        return entry["model"]
+
+    with entry["lock"]:
+        if entry["model"] is not None:
+            return entry["model"]
+        if entry["failed_at"] is not None and time.monotonic() - entry["failed_at"] < MODEL_LOAD_RETRY_SECONDS:
+            return None
+
+        start = time.perf_counter()
+        try:
+            with span("model_load", profile_memory=True, model=name):
+                model = entry["loader"]()
+        except Exception as e:
+            logger.error(f"Failed to load model '{name}'. Error: {e}")
+            entry["error"], entry["failed_at"] = str(e), time.monotonic()
+            return None
+
+        entry["load_seconds"] = round(time.perf_counter() - start, 2)
+        entry["model"], entry["error"], entry["failed_at"] = model, None, None
+        set_gauge("model_load_seconds", entry["load_seconds"], model=name)
+        logger.info(f"Model '{name}' loaded in {entry['load_seconds']}s.")
+        return model
+
+
+def warmup_models(names: list[str] | None = None) -> dict:
+    """
+    Loads the given models (all registered models by default) and runs one dummy inference on each,
+    so the first real request doesn't pay for lazy initialisation inside the frameworks.
+
+    Returns:
+        A dictionary mapping each model name to True if it is loaded and warmed up.
+    """
+    status = {}
+    for name in names if names is not None else list(_models):
+        if name not in _models:
+            logger.warning(f"Cannot warm up unknown model '{name}'.")
+            status[name] = False
+            continue
+        entry = _models[name]
+        model = get_model(name)
+        if model is None:
+            status[name] = False
+            continue
+        if entry["warmup"] and not entry["warmed_up"]:
+            try:
+                entry["warmup"](model)
+                entry["warmed_up"] = True
+            except Exception as e:
+                logger.warning(f"Warmup failed for model '{name}'. Error: {e}")
+        status[name] = True
+    return status
+
+
+def preload_models(role: str | None = None, warmup: bool = MODEL_WARMUP) -> dict:
+    """
+    Loads the models a deployment role needs, as configured in MODEL_ROLES.
+
+    Args:
+        role: The deployment role. Defaults to MODEL_PRELOAD_ROLE.
+        warmup: Whether to run a dummy inference after loading.
+
+    Returns:
+        A dictionary mapping each model name to True if it loaded successfully.
+    """
+    role = role or MODEL_PRELOAD_ROLE
+    if role not in MODEL_ROLES:
+        logger.warning(f"Unknown model role '{role}'. Expected one of {list(MODEL_ROLES)}.")
+        return {}
+    names = MODEL_ROLES[role]
+    if warmup:
+        return warmup_models(names)
+    return {name: get_model(name) is not None for name in names if name in _models}
+
+
+def model_status() -> dict:
+    """
+    Reports load state, load time and last error for every registered model.
+    """
+    return {
+        name: {
+            "loaded": entry["model"] is not None,
+            "warmed_up": entry["warmed_up"],
+            "load_seconds": entry["load_seconds"],
+            "error": entry["error"],
+        }
+        for name, entry in _models.items()
+    }
@@ -0,0 +1,150 @@
+# src/utils/prompt_builder.py
+import re
+from src.utils.config import PROMPT_TOKEN_BUDGET, PROMPT_TOKEN_BUDGETS
+from src.utils.logging import get_logger, increment, current_span
+
+logger = get_logger("PromptBuilder")
+
+# Words, numbers and single punctuation marks; BPE vocabularies split text along roughly these lines.
+_TOKEN_PIECE = re.compile(r"\w+|[^\w\s]")
+# Tokens for the "- " bullet and line break around each item.
+_ITEM_OVERHEAD_TOKENS = 2
+# A partially fitting item is cut to the remaining budget only if at least this much of it fits.
+_MIN_PARTIAL_TOKENS = 16
+_ELLIPSIS = " …"
+
+
+def _piece_tokens(piece: str) -> int:
+    # Common short words are one token; longer words and numbers split into pieces of ~5 characters.
+    return 1 if len(piece) <= 5 else (len(piece) + 4) // 5
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Fast local estimate of the number of tokens in text, without a tokenizer. Slightly
+    overestimates for plain English, so budgets computed with it are safe.
+    """
+    return sum(_piece_tokens(piece) for piece in _TOKEN_PIECE.findall(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> tuple[str, int]:
+    """
+    Cuts text after the last word that fits in max_tokens and marks the cut with an ellipsis.
+
+    Returns:
+        The (possibly truncated) text and the estimated number of tokens dropped.
+    """
+    used, end = 0, 0
+    for match in _TOKEN_PIECE.finditer(text):
+        cost = _piece_tokens(match.group())
+        if used + cost > max_tokens:
+            dropped = estimate_tokens(text[match.start():])
+            return text[:end].rstrip() + _ELLIPSIS, dropped
+        used += cost
+        end = match.end()
+    return text, 0
+
+
+def token_budget(model: str) -> int:
+    """Input token budget for one prompt to the given model."""
+    return PROMPT_TOKEN_BUDGETS.get(model, PROMPT_TOKEN_BUDGET)
+
+
+def prompt_section(name: str, items: list[str], priority: int = 0, max_item_tokens: int | None = None) -> dict:
+    """
+    Describes one evidence section of a prompt.
+
+    Args:
+        name: Key of the section in the fitted result.
+        items: The section's texts, most important first.
+        priority: Sections with a lower number are filled first.
+        max_item_tokens: Each item is truncated to this many tokens before budgeting.
+    """
+    return {"name": name, "items": list(items), "priority": priority, "max_item_tokens": max_item_tokens}
+
+
+def fit_sections(sections: list[dict], budget: int) -> dict:
+    """
+    Fits the sections' items into a token budget.
+
+    Items are first truncated to their section's max_item_tokens. Sections are then filled in
+    priority order (ties keep their given order), items in order; the first item that doesn't fit
+    is cut to the remaining budget when enough of it fits, and everything after it is dropped.
+
+    Returns:
+        {"sections": {name: [kept items]}, "report": {...}} where the report gives the budget,
+        tokens used and dropped, and per section the kept, truncated and dropped item counts.
+    """
+    remaining = max(0, budget)
+    fitted, section_reports = {}, {}
+    dropped_tokens = 0
+    for section in sorted(sections, key=lambda s: s["priority"]):
+        kept, truncated, dropped = [], 0, 0
+        for item in section["items"]:
+            capped = 0
+            if section["max_item_tokens"]:
+                item, capped = truncate_to_tokens(item, section["max_item_tokens"])
+                dropped_tokens += capped
+            cost = estimate_tokens(item) + _ITEM_OVERHEAD_TOKENS
+            if cost <= remaining:
+                kept.append(item)
+                truncated += bool(capped)
+                remaining -= cost
+                continue
+            available = remaining - _ITEM_OVERHEAD_TOKENS
+            if available >= _MIN_PARTIAL_TOKENS:
+                item, cut = truncate_to_tokens(item, available)
+                kept.append(item)
+                truncated += 1
+                dropped_tokens += cut
+                remaining -= estimate_tokens(item) + _ITEM_OVERHEAD_TOKENS
+            else:
+                dropped += 1
+                dropped_tokens += cost - _ITEM_OVERHEAD_TOKENS
+                remaining = 0
+        fitted[section["name"]] = kept
+        section_reports[section["name"]] = {"kept": len(kept), "truncated": truncated, "dropped": dropped}
+
+    return {
+        "sections": fitted,
+        "report": {
+            "budget": budget,
+            "used_tokens": budget - remaining if budget > 0 else 0,
+            "dropped_tokens": dropped_tokens,
+            "sections": section_reports,
+        },
+    }
+
+
+def fit_prompt(prompt: str, model: str, fixed_text: str, sections: list[dict]) -> dict:
+    """
+    Fits evidence sections into the model's prompt budget, after the fixed parts of the prompt.
+
+    The report is logged, attached to the current span as the "prompt" attribute and counted in
+    the prompt_tokens_total and prompt_tokens_dropped_total metrics.
+
+    Args:
+        prompt: Name of the prompt, used as the metric label.
+        model: The model the prompt is sent to.
+        fixed_text: Everything in the prompt that is always sent (system prompt, instructions, claim).
+        sections: Evidence sections built with prompt_section.
+
+    Returns:
+        The fit_sections result; its report also holds the fixed token count.
+    """
+    fixed_tokens = estimate_tokens(fixed_text)
+    fitted = fit_sections(sections, token_budget(model) - fixed_tokens)
+    report = {**fitted["report"], "fixed_tokens": fixed_tokens}
+    fitted["report"] = report
+
+    increment("prompt_tokens_total", fixed_tokens + report["used_tokens"], prompt=prompt)
+    if report["dropped_tokens"]:
+        increment("prompt_tokens_dropped_total", report["dropped_tokens"], prompt=prompt)
+        logger.info(
+            f"{prompt}: dropped ~{report['dropped_tokens']} evidence tokens to fit the "
+            f"{token_budget(model)}-token budget ({report['sections']})."
+        )
+    span_record = current_span()
+    if span_record is not None:
+        span_record["attributes"]["prompt"] = report
+    return fitted
@@ -0,0 +1,28 @@
+# src/utils/serpapi_client.py
+from serpapi import GoogleSearch
+from src.utils.config import SERPAPI_API_KEY, SERPAPI_TIMEOUT_SECONDS, SERPAPI_BASE_URL
+from src.utils.logging import traced, external_call
+
+@traced("serpapi_search")
+def run_search(params: dict, timeout: float = SERPAPI_TIMEOUT_SECONDS) -> dict:
+    """
+    Runs one SerpAPI search with a request timeout and returns the result dictionary.
+
+    Args:
+        params: Search parameters (engine, q/url, ...). The API key is added here.
+        timeout: Timeout in seconds for the HTTP request.
+
+    Raises:
+        RuntimeError: If SerpAPI reports an error for the search.
+    """
+    search = GoogleSearch({**params, "api_key": SERPAPI_API_KEY})
+    # The library's default timeout is 60000 seconds, i.e. effectively none.
+    search.timeout = timeout
+    search.BACKEND = SERPAPI_BASE_URL
+    with external_call("serpapi") as call:
+        results = search.get_dict()
+        if "error" in results:
+            call["outcome"] = "error"
+    if "error" in results:
+        raise RuntimeError(results["error"])
+    return results
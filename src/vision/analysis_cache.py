@@ -0,0 +1,174 @@
+# src/vision/analysis_cache.py
+import atexit
+import os
+import threading
+from src.utils.config import (
+    IMAGE_CACHE_ENABLED,
+    IMAGE_CACHE_PATH,
+    IMAGE_CACHE_MAX_ENTRIES,
+    IMAGE_CACHE_TTLS,
+    NEAR_DUPLICATE_ENABLED,
+    NEAR_DUPLICATE_INDEX_PATH,
+    NEAR_DUPLICATE_MAX_DISTANCE,
+    NEAR_DUPLICATE_SAVE_EVERY,
+)
+from src.utils.disk_cache import DiskCache
+from src.vision.near_duplicate_index import PerceptualHashIndex
+from src.utils.logging import get_logger
+
+logger = get_logger("AnalysisCache")
+
+# The report sections that depend only on the image, not on the user's question.
+CACHED_SECTIONS = ("image_analysis", "online_history", "thematic_search")
+# The sections a near-duplicate may share. A perceptual hash can't see overlaid text, so two images
+# with different captions on the same photo match; OCR and the thematic search always run again.
+NEAR_DUPLICATE_SECTIONS = ("online_history",)
+
+# Messages the vision modules return instead of raising; results containing them are not cached.
+_ERROR_MARKERS = ("is not available", "An error occurred")
+
+_analysis_cache = None
+_analysis_cache_lock = threading.Lock()
+
+def _get_analysis_cache() -> DiskCache | None:
+    global _analysis_cache
+    if not IMAGE_CACHE_ENABLED:
+        return None
+    with _analysis_cache_lock:
+        if _analysis_cache is None:
+            try:
+                _analysis_cache = DiskCache(
+                    IMAGE_CACHE_PATH,
+                    default_ttl=max(IMAGE_CACHE_TTLS.values()),
+                    max_entries=IMAGE_CACHE_MAX_ENTRIES,
+                    table="image_sections"
+                )
+            except Exception as e:
+                logger.warning(f"Image cache unavailable, continuing without it: {e}")
+                return None
+    return _analysis_cache
+
+def is_error_text(text: str) -> bool:
+    """Whether a caption or OCR text is actually a vision module's error message."""
+    return any(marker in (text or "") for marker in _ERROR_MARKERS)
+
+def _is_cacheable(section: str, value) -> bool:
+    """Rejects failed stage results so a transient error is not served from the cache."""
+    if section == "image_analysis":
+        return "error" not in value.get("authenticity", {}) and not (
+            is_error_text(value.get("caption")) or is_error_text(value.get("ocr_text"))
+        )
+    if section == "online_history":
+        return "error" not in value
+    # An empty thematic search is either "no OCR text" (free to redo) or a failed search.
+    return isinstance(value, list) and len(value) > 0
+
+def load_cached_sections(fingerprint: str) -> dict:
+    """
+    Returns the fresh cached report sections for an image, keyed by section name.
+    """
+    cache = _get_analysis_cache()
+    if cache is None:
+        return {}
+    sections = {}
+    for section in CACHED_SECTIONS:
+        value = cache.get(f"{fingerprint}:{section}")
+        if value is not None:
+            sections[section] = value
+    return sections
+
+def store_sections(fingerprint: str, sections: dict) -> list[str]:
+    """
+    Stores freshly computed report sections, each with its own TTL from IMAGE_CACHE_TTLS.
+
+    Returns:
+        The names of the sections that were stored.
+    """
+    cache = _get_analysis_cache()
+    if cache is None:
+        return []
+    # The thematic search is derived from the OCR text, so it is only as good as the analysis it came with.
+    analysis_failed = "image_analysis" in sections and not _is_cacheable("image_analysis", sections["image_analysis"])
+    stored = []
+    for section, value in sections.items():
+        if section == "thematic_search" and analysis_failed:
+            continue
+        if section in CACHED_SECTIONS and _is_cacheable(section, value):
+            cache.set(f"{fingerprint}:{section}", value, ttl=IMAGE_CACHE_TTLS[section])
+            stored.append(section)
+    return stored
+
+# --- Near-duplicate lookup ---
+# Perceptual hash -> fingerprint of an image whose sections are in the cache.
+
+_near_duplicate_index = None
+_near_duplicate_lock = threading.Lock()
+_unsaved_additions = 0
+_index_mtime = None
+
+def _get_near_duplicate_index() -> PerceptualHashIndex | None:
+    global _near_duplicate_index, _index_mtime
+    if not (NEAR_DUPLICATE_ENABLED and IMAGE_CACHE_ENABLED):
+        return None
+    if _near_duplicate_index is None:
+        index = PerceptualHashIndex()
+        if os.path.exists(NEAR_DUPLICATE_INDEX_PATH):
+            try:
+                _index_mtime = os.path.getmtime(NEAR_DUPLICATE_INDEX_PATH)
+                index = PerceptualHashIndex.load(NEAR_DUPLICATE_INDEX_PATH)
+                logger.info(f"Loaded near-duplicate index with {len(index)} images.")
+            except Exception as e:
+                logger.warning(f"Could not load near-duplicate index, starting empty: {e}")
+        _near_duplicate_index = index
+        atexit.register(save_near_duplicate_index)
+    return _near_duplicate_index
+
+def save_near_duplicate_index() -> None:
+    """
+    Persists the near-duplicate index. Entries another process saved in the meantime are merged in first.
+    """
+    global _unsaved_additions, _index_mtime
+    with _near_duplicate_lock:
+        index = _near_duplicate_index
+        if index is None or _unsaved_additions == 0:
+            return
+        try:
+            if os.path.exists(NEAR_DUPLICATE_INDEX_PATH) and os.path.getmtime(NEAR_DUPLICATE_INDEX_PATH) != _index_mtime:
+                index.merge_from(PerceptualHashIndex.load(NEAR_DUPLICATE_INDEX_PATH))
+            index.save(NEAR_DUPLICATE_INDEX_PATH)
+            _index_mtime = os.path.getmtime(NEAR_DUPLICATE_INDEX_PATH)
+            _unsaved_additions = 0
+        except Exception as e:
+            logger.warning(f"Could not save near-duplicate index: {e}")
+
+def find_near_duplicate(phash: int, exclude: str | None = None) -> tuple[str, int] | None:
+    """
+    Looks up a previously analysed image whose perceptual hash is within NEAR_DUPLICATE_MAX_DISTANCE.
+
+    Returns:
+        (fingerprint, distance) of the closest match, or None.
+    """
+    with _near_duplicate_lock:
+        index = _get_near_duplicate_index()
+        if index is None:
+            return None
+        matches = index.query(phash, NEAR_DUPLICATE_MAX_DISTANCE)
+    for distance, fingerprint in matches:
+        if fingerprint != exclude:
+            return fingerprint, distance
+    return None
+
+def remember_image(phash: int, fingerprint: str) -> None:
+    """
+    Records that the cached sections of `fingerprint` belong to an image with this perceptual hash.
+    """
+    global _unsaved_additions
+    with _near_duplicate_lock:
+        index = _get_near_duplicate_index()
+        if index is None:
+            return
+        index.add(phash, fingerprint)
+        _unsaved_additions += 1
+        should_save = _unsaved_additions >= NEAR_DUPLICATE_SAVE_EVERY
+    if should_save:
+        save_near_duplicate_index()
@@ -1,38 +1,117 @@
 # src/vision/captioning.py
-from transformers import pipeline
 from PIL import Image
+from src.utils.model_registry import register_model, get_model
+from src.utils.config import IMAGE_BATCH_SIZE
+from src.serving import inference_client
+from src.vision.image_input import ImageSource, load_image
+from src.utils.logging import get_logger, traced
+
+logger = get_logger("Captioning")
 
 MODEL_NAME = "Salesforce/blip-image-captioning-base"
 
-try:
-    # Initialize the image captioning pipeline. It will download the model on first run.
-    captioner = pipeline("image-to-text", model=MODEL_NAME)
-    print(f"Image captioning model '{MODEL_NAME}' loaded successfully.")
-except Exception as e:
-    print(f"Failed to load captioning model. Error: {e}")
-    captioner = None
+def _load_captioner():
+    """Builds the image captioning pipeline. It will download the model on first run."""
+    from transformers import pipeline
+    return pipeline("image-to-text", model=MODEL_NAME)
+
+def _warmup_captioner(captioner) -> None:
+    captioner(Image.new("RGB", (64, 64)))
+
+register_model("captioner", _load_captioner, _warmup_captioner)
 
-def generate_image_caption(image_path: str) -> str:
+@traced("caption", profile_memory=True)
+def generate_image_caption(image: ImageSource) -> str:
     """
     Generates a textual caption for a given image.
 
     Args:
-        image_path: The file path to the image.
+        image: The image, as a file path, bytes, PIL image or LoadedImage.
 
     Returns:
         A string containing the generated caption, or an error message.
     """
+    if inference_client.enabled():
+        try:
+            return inference_client.generate_captions([load_image(image).caption_image])[0]
+        except Exception as e:
+            return f"An error occurred during captioning: {e}"
+
+    captioner = get_model("captioner")
     if not captioner:
         return "Image captioning model is not available."
 
     try:
-        # Open the image using Pillow to handle various formats
-        image = Image.open(image_path).convert("RGB")
+        # The shared copy already downscaled to the captioner's input resolution.
+        rgb_image = load_image(image).caption_image
         
         # The pipeline returns a list with one dictionary: [{'generated_text': '...'}]
-        result = captioner(image)
+        result = captioner(rgb_image)
         caption = result[0].get('generated_text', 'Could not generate caption.')
         return caption
         
     except Exception as e:
-        return f"An error occurred during captioning: {e}"
\ No newline at end of file
+        return f"An error occurred during captioning: {e}"
+
+@traced("caption_batch", profile_memory=True)
+def generate_image_captions(images: list[ImageSource], batch_size: int = IMAGE_BATCH_SIZE) -> list[str]:
+    """
+    Generates captions for many images with batched forward passes through the captioner.
+
+    Args:
+        images: The images, as file paths, bytes, PIL images or LoadedImages.
+        batch_size: Number of images per forward pass.
+
+    Returns:
+        One caption (or error message) per image, in input order. An image that cannot be
+        opened only affects its own entry.
+    """
+    captions = [None] * len(images)
+    rgb_images, positions = [], []
+    for i, image in enumerate(images):
+        try:
+            rgb_images.append(load_image(image).caption_image)
+            positions.append(i)
+        except Exception as e:
+            captions[i] = f"An error occurred during captioning: {e}"
+
+    if rgb_images and inference_client.enabled():
+        try:
+            results = inference_client.generate_captions(rgb_images)
+        except Exception as e:
+            results = [f"An error occurred during captioning: {e}"] * len(rgb_images)
+        for i, caption in zip(positions, results):
+            captions[i] = caption
+        return captions
+
+    captioner = get_model("captioner")
+    if not captioner:
+        # Images that failed to load keep their own error.
+        for i in positions:
+            captions[i] = "Image captioning model is not available."
+        return captions
+
+    for i, caption in zip(positions, run_captioner(captioner, rgb_images, batch_size)):
+        captions[i] = caption
+    return captions
+
+def run_captioner(captioner, images: list[Image.Image], batch_size: int = IMAGE_BATCH_SIZE) -> list[str]:
+    """
+    The batched forward passes of generate_image_captions on images already sized for the
+    captioner (LoadedImage.caption_image). If the batch fails, each image is captioned on its
+    own so a single bad input can't fail the whole batch.
+    """
+    if not images:
+        return []
+    try:
+        return [result[0].get('generated_text', 'Could not generate caption.') for result in captioner(images, batch_size=batch_size)]
+    except Exception as e:
+        logger.warning(f"Batched captioning failed, retrying per image: {e}")
+
+    captions = []
+    for image in images:
+        try:
+            captions.append(captioner(image)[0].get('generated_text', 'Could not generate caption.'))
+        except Exception as e:
+            captions.append(f"An error occurred during captioning: {e}")
+    return captions
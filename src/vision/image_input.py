@@ -0,0 +1,97 @@
+# src/vision/image_input.py
+import hashlib
+import io
+from functools import cached_property
+import numpy as np
+from PIL import Image
+from src.utils.config import (
+    CAPTION_MIN_SIDE,
+    DETECTOR_MIN_SIDE,
+    OCR_MAX_SIDE,
+    UPLOAD_MAX_SIDE,
+    UPLOAD_JPEG_QUALITY,
+    UPLOAD_MAX_BYTES,
+)
+from src.vision.preprocessing import apply_exif_orientation, resize_to_min_side, resize_to_max_side, encode_for_upload
+
+
+class LoadedImage:
+    """
+    One image, read and decoded exactly once, shared by every vision stage.
+
+    Holds the original encoded bytes (for hashing), the decoded, upright RGB PIL image and a
+    lazily built NumPy array view. Each stage reads its own model-sized variant (caption_image,
+    detector_image, ocr_array, upload_bytes), computed on first use and then reused.
+    Stages only read from it, so one instance can be used from several threads at once.
+    """
+
+    def __init__(self, data: bytes, image: Image.Image | None = None, name: str | None = None):
+        self.data = data
+        self.name = name
+        if image is None:
+            image = Image.open(io.BytesIO(data))
+        # Decode now, so concurrent stages never race on Pillow's lazy loading.
+        image = apply_exif_orientation(image)
+        self.image = image if image.mode == "RGB" else image.convert("RGB")
+        self.image.load()
+
+    @cached_property
+    def array(self) -> np.ndarray:
+        """The decoded image as an (H, W, 3) uint8 RGB array."""
+        return np.asarray(self.image)
+
+    @cached_property
+    def caption_image(self) -> Image.Image:
+        """Copy downscaled for the captioner's input resolution."""
+        return resize_to_min_side(self.image, CAPTION_MIN_SIDE)
+
+    @cached_property
+    def detector_image(self) -> Image.Image:
+        """Copy downscaled for the authenticity detector's input resolution."""
+        return resize_to_min_side(self.image, DETECTOR_MIN_SIDE)
+
+    @cached_property
+    def ocr_array(self) -> np.ndarray:
+        """RGB array capped at OCR_MAX_SIDE: enough resolution for text, far fewer pixels to scan."""
+        return np.asarray(resize_to_max_side(self.image, OCR_MAX_SIDE))
+
+    @cached_property
+    def upload_bytes(self) -> bytes:
+        """Compressed bytes for the reverse-image-search upload."""
+        return encode_for_upload(self.image, self.data, UPLOAD_MAX_SIDE, UPLOAD_JPEG_QUALITY, UPLOAD_MAX_BYTES)
+
+    @cached_property
+    def fingerprint(self) -> str:
+        """SHA-256 of the original bytes; the content address used by the image cache."""
+        return hashlib.sha256(self.data).hexdigest()
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return self.image.size
+
+
+# Anything the pipeline accepts as an image.
+ImageSource = str | bytes | Image.Image | LoadedImage
+
+def load_image(source: ImageSource) -> LoadedImage:
+    """
+    Builds the shared in-memory representation of an image.
+
+    Args:
+        source: A file path, the raw encoded bytes, a PIL image, or an already loaded image
+                (returned unchanged).
+
+    Returns:
+        A LoadedImage. Raises if the input cannot be read or decoded.
+    """
+    if isinstance(source, LoadedImage):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return LoadedImage(bytes(source))
+    if isinstance(source, Image.Image):
+        # No original bytes exist, so encode once losslessly for hashing and upload.
+        buffer = io.BytesIO()
+        source.save(buffer, format="PNG")
+        return LoadedImage(buffer.getvalue(), image=source)
+    with open(source, "rb") as image_file:
+        return LoadedImage(image_file.read(), name=str(source))
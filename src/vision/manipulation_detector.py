@@ -1,50 +1,127 @@
 # src/vision/manipulation_detector.py
-from transformers import pipeline
 from PIL import Image
+from src.utils.model_registry import register_model, get_model
+from src.utils.config import IMAGE_BATCH_SIZE
+from src.utils.inference_backend import load_pipeline
+from src.serving import inference_client
+from src.vision.image_input import ImageSource, load_image
+from src.utils.logging import get_logger, traced
+
+logger = get_logger("ManipulationDetector")
 
 MODEL_NAME = "umm-maybe/AI-image-detector"
 
-try:
-    detector = pipeline("image-classification", model=MODEL_NAME)
-    print(f"Manipulation detector model '{MODEL_NAME}' loaded successfully.")
-except Exception as e:
-    print(f"Failed to load manipulation detector model. Error: {e}")
-    detector = None
+def _load_detector():
+    return load_pipeline("image-classification", MODEL_NAME)
+
+def _warmup_detector(detector) -> None:
+    detector(Image.new("RGB", (64, 64)))
+
+register_model("authenticity_detector", _load_detector, _warmup_detector)
+
+CONFIDENCE_THRESHOLD = 0.75
 
-def classify_image_authenticity(image_path: str) -> dict:
+def _interpret_scores(results: list[dict]) -> dict:
+    """
+    Turns the detector's label scores into a Real/Fake/Uncertain verdict.
+    """
+    scores = {item['label']: item['score'] for item in results}
+
+    # Determine the verdict based on the label with the highest score
+    best_label = max(scores, key=scores.get)
+    confidence = round(scores[best_label], 2)
+
+    if confidence < CONFIDENCE_THRESHOLD:
+        verdict = "Uncertain"
+    else:
+        # --- THE FIX IS HERE ---
+        # Use the model's actual labels: 'human' and 'artificial'
+        verdict = "Real" if best_label == 'human' else "Fake"
+
+    return {
+        "verdict": verdict,
+        "confidence": confidence,
+        # --- THE FIX IS HERE ---
+        # Get the scores using the correct labels
+        "raw_score_real": round(scores.get('human', 0), 2),
+        "raw_score_fake": round(scores.get('artificial', 0), 2)
+    }
+
+@traced("authenticity", profile_memory=True)
+def classify_image_authenticity(image: ImageSource) -> dict:
     """
     Classifies an image as Real, Fake, or Uncertain based on a confidence threshold.
     """
+    if inference_client.enabled():
+        try:
+            return inference_client.classify_authenticity([load_image(image).detector_image])[0]
+        except Exception as e:
+            return {"error": f"An error occurred during image authenticity classification: {e}"}
+
+    detector = get_model("authenticity_detector")
     if not detector:
         return {"error": "Manipulation detector is not available."}
 
     try:
-        image = Image.open(image_path)
-        results = detector(image)
-        
-        scores = {item['label']: item['score'] for item in results}
-        
-        # Determine the verdict based on the label with the highest score
-        best_label = max(scores, key=scores.get)
-        confidence = round(scores[best_label], 2)
-        
-        CONFIDENCE_THRESHOLD = 0.75 
-
-        if confidence < CONFIDENCE_THRESHOLD:
-            verdict = "Uncertain"
-        else:
-            # --- THE FIX IS HERE ---
-            # Use the model's actual labels: 'human' and 'artificial'
-            verdict = "Real" if best_label == 'human' else "Fake"
-        
-        return {
-            "verdict": verdict,
-            "confidence": confidence,
-            # --- THE FIX IS HERE ---
-            # Get the scores using the correct labels
-            "raw_score_real": round(scores.get('human', 0), 2),
-            "raw_score_fake": round(scores.get('artificial', 0), 2)
-        }
+        return _interpret_scores(detector(load_image(image).detector_image))
 
     except Exception as e:
-        return {"error": f"An error occurred during image authenticity classification: {e}"}
\ No newline at end of file
+        return {"error": f"An error occurred during image authenticity classification: {e}"}
+
+@traced("authenticity_batch", profile_memory=True)
+def classify_images_authenticity(images: list[ImageSource], batch_size: int = IMAGE_BATCH_SIZE) -> list[dict]:
+    """
+    Classifies many images with batched forward passes through the detector.
+
+    Returns:
+        One report per image, in input order, in the same format as classify_image_authenticity.
+    """
+    reports = [None] * len(images)
+    rgb_images, positions = [], []
+    for i, image in enumerate(images):
+        try:
+            rgb_images.append(load_image(image).detector_image)
+            positions.append(i)
+        except Exception as e:
+            reports[i] = {"error": f"An error occurred during image authenticity classification: {e}"}
+
+    if rgb_images and inference_client.enabled():
+        try:
+            results = inference_client.classify_authenticity(rgb_images)
+        except Exception as e:
+            results = [{"error": f"An error occurred during image authenticity classification: {e}"}] * len(rgb_images)
+        for i, report in zip(positions, results):
+            reports[i] = report
+        return reports
+
+    detector = get_model("authenticity_detector")
+    if not detector:
+        # Images that failed to load keep their own error.
+        for i in positions:
+            reports[i] = {"error": "Manipulation detector is not available."}
+        return reports
+
+    for i, report in zip(positions, run_detector(detector, rgb_images, batch_size)):
+        reports[i] = report
+    return reports
+
+def run_detector(detector, images: list[Image.Image], batch_size: int = IMAGE_BATCH_SIZE) -> list[dict]:
+    """
+    The batched forward passes of classify_images_authenticity on images already sized for the
+    detector (LoadedImage.detector_image). If the batch fails, each image is classified on its
+    own so a single bad input can't fail the whole batch.
+    """
+    if not images:
+        return []
+    try:
+        return [_interpret_scores(results) for results in detector(images, batch_size=batch_size)]
+    except Exception as e:
+        logger.warning(f"Batched classification failed, retrying per image: {e}")
+
+    reports = []
+    for image in images:
+        try:
+            reports.append(_interpret_scores(detector(image)))
+        except Exception as e:
+            reports.append({"error": f"An error occurred during image authenticity classification: {e}"})
+    return reports
@@ -0,0 +1,160 @@
+# src/vision/near_duplicate_index.py
+import os
+import numpy as np
+
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+def _popcount64(values: np.ndarray) -> np.ndarray:
+    """Bit count of each uint64, vectorized."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values).astype(np.int64)
+    return _POPCOUNT_TABLE[values.view(np.uint8)].reshape(-1, 8).sum(axis=1, dtype=np.int64)
+
+def _values_within_radius(value: int, radius: int, bits: int) -> list[int]:
+    """All `bits`-bit integers within Hamming distance `radius` of value."""
+    results = {value}
+    frontier = {value}
+    for _ in range(radius):
+        frontier = {v ^ (1 << b) for v in frontier for b in range(bits)}
+        results |= frontier
+    return sorted(results)
+
+
+class PerceptualHashIndex:
+    """
+    Multi-index hashing over 64-bit perceptual hashes for Hamming radius queries.
+
+    Each hash is split into `num_chunks` 16-bit chunks, and every chunk has its own sorted table.
+    If two hashes are within distance r, at least one chunk differs by at most r // num_chunks bits
+    (pigeonhole), so a query only probes the few chunk values within that radius via binary search,
+    then verifies the full distance on the candidates. Nothing is ever scanned linearly.
+
+    New entries go to small in-memory chunk tables and are merged into the sorted arrays in bulk.
+    The sorted arrays are persisted as-is, so reloading an index is a single file read.
+    """
+
+    HASH_BITS = 64
+
+    def __init__(self, num_chunks: int = 4):
+        if self.HASH_BITS % num_chunks:
+            raise ValueError("num_chunks must divide 64.")
+        self.num_chunks = num_chunks
+        self.chunk_bits = self.HASH_BITS // num_chunks
+        self._hashes = np.zeros(0, dtype=np.uint64)
+        self._keys = np.zeros(0, dtype="<U64")
+        self._sorted_chunks = [np.zeros(0, dtype=np.uint64) for _ in range(num_chunks)]
+        self._sorted_positions = [np.zeros(0, dtype=np.int64) for _ in range(num_chunks)]
+        self._pending_hashes, self._pending_keys = [], []
+        self._pending_tables = [{} for _ in range(num_chunks)]
+
+    def __len__(self) -> int:
+        return len(self._hashes) + len(self._pending_hashes)
+
+    def _chunks(self, value: int) -> list[int]:
+        mask = (1 << self.chunk_bits) - 1
+        return [(value >> (j * self.chunk_bits)) & mask for j in range(self.num_chunks)]
+
+    def add(self, phash: int, key: str) -> None:
+        """
+        Adds a perceptual hash with the key it should resolve to (e.g. an image fingerprint).
+        """
+        position = len(self._pending_hashes)
+        self._pending_hashes.append(phash)
+        self._pending_keys.append(key)
+        for table, chunk in zip(self._pending_tables, self._chunks(phash)):
+            table.setdefault(chunk, []).append(position)
+        if len(self._pending_hashes) >= max(4096, len(self._hashes) // 8):
+            self._merge_pending()
+
+    def _merge_pending(self) -> None:
+        if not self._pending_hashes:
+            return
+        self._hashes = np.concatenate([self._hashes, np.array(self._pending_hashes, dtype=np.uint64)])
+        self._keys = np.concatenate([self._keys, np.array(self._pending_keys, dtype="<U64")])
+        mask = np.uint64((1 << self.chunk_bits) - 1)
+        for j in range(self.num_chunks):
+            chunk_values = (self._hashes >> np.uint64(j * self.chunk_bits)) & mask
+            order = np.argsort(chunk_values, kind="stable")
+            self._sorted_chunks[j] = chunk_values[order]
+            self._sorted_positions[j] = order
+        self._pending_hashes, self._pending_keys = [], []
+        self._pending_tables = [{} for _ in range(self.num_chunks)]
+
+    def query(self, phash: int, max_distance: int) -> list[tuple[int, str]]:
+        """
+        Finds every indexed hash within max_distance bits of phash.
+
+        Returns:
+            (distance, key) tuples sorted by distance, one per distinct key.
+        """
+        chunk_radius = max_distance // self.num_chunks
+        best = {}
+
+        # Merged entries: probe each chunk table with binary search.
+        candidate_slices = []
+        for j, chunk in enumerate(self._chunks(phash)):
+            probes = np.array(_values_within_radius(chunk, chunk_radius, self.chunk_bits), dtype=np.uint64)
+            starts = np.searchsorted(self._sorted_chunks[j], probes, side="left")
+            ends = np.searchsorted(self._sorted_chunks[j], probes, side="right")
+            for start, end in zip(starts, ends):
+                if end > start:
+                    candidate_slices.append(self._sorted_positions[j][start:end])
+        if candidate_slices:
+            candidates = np.unique(np.concatenate(candidate_slices))
+            distances = _popcount64(self._hashes[candidates] ^ np.uint64(phash))
+            for position, distance in zip(candidates[distances <= max_distance], distances[distances <= max_distance]):
+                key = str(self._keys[position])
+                best[key] = min(int(distance), best.get(key, max_distance + 1))
+
+        # Pending entries: probe the in-memory chunk tables.
+        pending = set()
+        for table, chunk in zip(self._pending_tables, self._chunks(phash)):
+            for probe in _values_within_radius(chunk, chunk_radius, self.chunk_bits):
+                pending.update(table.get(probe, ()))
+        for position in pending:
+            distance = bin(self._pending_hashes[position] ^ phash).count("1")
+            if distance <= max_distance:
+                key = self._pending_keys[position]
+                best[key] = min(distance, best.get(key, max_distance + 1))
+
+        return sorted((distance, key) for key, distance in best.items())
+
+    def save(self, path: str) -> None:
+        """
+        Writes the index atomically (temp file + rename), so readers never see a partial file.
+        """
+        self._merge_pending()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        arrays = {"hashes": self._hashes, "keys": self._keys, "num_chunks": np.array(self.num_chunks)}
+        for j in range(self.num_chunks):
+            arrays[f"sorted_chunks_{j}"] = self._sorted_chunks[j]
+            arrays[f"sorted_positions_{j}"] = self._sorted_positions[j]
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "PerceptualHashIndex":
+        """
+        Loads an index written by save(); the sorted chunk tables are used directly without re-sorting.
+        """
+        with np.load(path) as data:
+            index = cls(num_chunks=int(data["num_chunks"]))
+            index._hashes = data["hashes"]
+            index._keys = data["keys"]
+            for j in range(index.num_chunks):
+                index._sorted_chunks[j] = data[f"sorted_chunks_{j}"]
+                index._sorted_positions[j] = data[f"sorted_positions_{j}"]
+        return index
+
+    def merge_from(self, other: "PerceptualHashIndex") -> int:
+        """
+        Adds the entries of another index whose keys are not already present. Returns how many were added.
+        """
+        other._merge_pending()
+        self._merge_pending()
+        new = ~np.isin(other._keys, self._keys)
+        for phash, key in zip(other._hashes[new], other._keys[new]):
+            self.add(int(phash), str(key))
+        return int(new.sum())
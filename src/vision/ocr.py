@@ -1,33 +1,49 @@
 # src/vision/ocr.py
-import easyocr
 import warnings
 from PIL import Image
 import numpy as np
+from src.utils.model_registry import register_model, get_model
+from src.serving import inference_client
+from src.vision.image_input import ImageSource, load_image
+from src.utils.logging import traced
 
 # This is the single, final version of this file.
 
-try:
-    # Initialize the OCR reader ONCE, forcing CPU for maximum stability.
-    reader = easyocr.Reader(['en'], gpu=False)
-    print("EasyOCR reader loaded successfully.")
-except Exception as e:
-    print(f"Failed to load EasyOCR reader. Error: {e}")
-    reader = None
+def _load_reader():
+    """Initializes the OCR reader ONCE, forcing CPU for maximum stability."""
+    import easyocr
+    return easyocr.Reader(['en'], gpu=False)
 
-def extract_text_from_image(image_path: str) -> str:
+def _warmup_reader(reader) -> None:
+    reader.readtext(np.full((32, 96, 3), 255, dtype=np.uint8))
+
+register_model("ocr_reader", _load_reader, _warmup_reader)
+
+@traced("ocr", profile_memory=True)
+def extract_text_from_image(image: ImageSource) -> str:
     """
     Extracts text from an image using a stable CPU-based method.
     """
+    if inference_client.enabled():
+        try:
+            return inference_client.extract_text([load_image(image).ocr_array])[0]
+        except Exception as e:
+            return f"An error occurred during OCR processing: {e}"
+
+    reader = get_model("ocr_reader")
     if not reader:
         return "OCR reader is not available."
     try:
-        # Pass the image path directly to the reader, which can handle it.
-        detections = reader.readtext(image_path)
-        
-        if not detections:
-            return "" # Return empty string if no text is found
-            
-        all_text = " ".join([text for bbox, text, score in detections])
-        return all_text
+        # Pass the already decoded, OCR-sized RGB array, so EasyOCR doesn't read and decode the file again.
+        return read_text(reader, load_image(image).ocr_array)
     except Exception as e:
-        return f"An error occurred during OCR processing: {e}"
\ No newline at end of file
+        return f"An error occurred during OCR processing: {e}"
+
+def read_text(reader, array: np.ndarray) -> str:
+    """
+    Runs the OCR reader on an OCR-sized RGB array (LoadedImage.ocr_array) and joins the detected text.
+    """
+    detections = reader.readtext(array)
+    if not detections:
+        return "" # Return empty string if no text is found
+    return " ".join([text for bbox, text, score in detections])
\ No newline at end of file
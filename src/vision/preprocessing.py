@@ -1,5 +1,8 @@
 # src/vision/preprocessing.py
+import io
 import re
+import numpy as np
+from PIL import Image, ImageOps
 
 def clean_ocr_text(text: str) -> str:
     """
@@ -11,4 +14,96 @@ def clean_ocr_text(text: str) -> str:
     cleaned_text = re.sub(r'[^a-zA-Z0-9\s]', '', text)
     # Replace multiple spaces with a single space
     cleaned_text = re.sub(r'\s+', ' ', cleaned_text).strip()
-    return cleaned_text
\ No newline at end of file
+    return cleaned_text
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    """Packs a boolean array (row-major) into an integer, first element as the most significant bit."""
+    value = 0
+    for bit in bits.flatten():
+        value = (value << 1) | int(bit)
+    return value
+
+def _dct_matrix(size: int) -> np.ndarray:
+    """Orthonormal DCT-II basis, so a 2D DCT is two matrix products."""
+    n = np.arange(size)
+    matrix = np.cos(np.pi * (2 * n[None, :] + 1) * n[:, None] / (2 * size)) * np.sqrt(2 / size)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+def compute_dhash(image: Image.Image, hash_size: int = 8) -> int:
+    """
+    Computes a difference hash: the sign of horizontal gradients on a tiny grayscale copy.
+
+    Returns:
+        A hash_size * hash_size bit integer (64 bits by default).
+    """
+    small = image.convert("L").resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS)
+    pixels = np.asarray(small, dtype=np.float32)
+    return _bits_to_int(pixels[:, 1:] > pixels[:, :-1])
+
+def compute_phash(image: Image.Image, hash_size: int = 8, highfreq_factor: int = 4) -> int:
+    """
+    Computes a DCT-based perceptual hash that survives recompression, resizing and mild edits.
+
+    The image is reduced to a (hash_size * highfreq_factor)^2 grayscale square, transformed with a 2D DCT,
+    and the lowest hash_size x hash_size frequencies are thresholded at their median.
+
+    Returns:
+        A hash_size * hash_size bit integer (64 bits by default).
+    """
+    size = hash_size * highfreq_factor
+    small = image.convert("L").resize((size, size), Image.Resampling.LANCZOS)
+    pixels = np.asarray(small, dtype=np.float64)
+    dct = _dct_matrix(size)
+    low_frequencies = (dct @ pixels @ dct.T)[:hash_size, :hash_size]
+    return _bits_to_int(low_frequencies > np.median(low_frequencies))
+
+def hamming_distance(hash_a: int, hash_b: int) -> int:
+    """Number of differing bits between two perceptual hashes."""
+    return bin(hash_a ^ hash_b).count("1")
+
+def apply_exif_orientation(image: Image.Image) -> Image.Image:
+    """
+    Rotates/flips an image according to its EXIF orientation tag, so phone photos are upright.
+    """
+    return ImageOps.exif_transpose(image)
+
+def resize_to_min_side(image: Image.Image, min_side: int) -> Image.Image:
+    """
+    Downscales an image so its shorter side equals min_side, keeping the aspect ratio.
+    Images that are already small enough are returned unchanged (never upscaled).
+
+    Used for models that resize to a fixed square input anyway: anything beyond their
+    input resolution is discarded, so it is cheaper to drop it once here.
+    """
+    width, height = image.size
+    scale = min_side / min(width, height)
+    if scale >= 1:
+        return image
+    new_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return image.resize(new_size, Image.Resampling.BICUBIC, reducing_gap=3.0)
+
+def resize_to_max_side(image: Image.Image, max_side: int) -> Image.Image:
+    """
+    Downscales an image so its longer side is at most max_side, keeping the aspect ratio.
+    Images that are already small enough are returned unchanged (never upscaled).
+    """
+    width, height = image.size
+    scale = max_side / max(width, height)
+    if scale >= 1:
+        return image
+    new_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return image.resize(new_size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+def encode_for_upload(image: Image.Image, original_bytes: bytes, max_side: int, quality: int, max_bytes: int) -> bytes:
+    """
+    Produces the bytes sent to the reverse-image-search upload.
+
+    The original bytes are reused when they are already small and within max_side;
+    otherwise the image is downscaled and re-encoded as JPEG.
+    """
+    if len(original_bytes) <= max_bytes and max(image.size) <= max_side:
+        return original_bytes
+    buffer = io.BytesIO()
+    resize_to_max_side(image, max_side).save(buffer, format="JPEG", quality=quality, optimize=True)
+    return buffer.getvalue()
@@ -1,41 +1,48 @@
 # src/vision/reverse_image_search.py
 import requests
-from serpapi import GoogleSearch
-from src.utils.config import SERPAPI_API_KEY, IMGBB_API_KEY
+from src.utils.config import SERPAPI_API_KEY, IMGBB_API_KEY, IMGBB_UPLOAD_URL, IMGBB_TIMEOUT_SECONDS
+from src.utils.serpapi_client import run_search
+from src.vision.image_input import ImageSource, load_image
+from src.utils.logging import get_logger, traced, external_call
 
-def _upload_image_to_imgbb(image_path: str) -> str | None:
+logger = get_logger("ReverseImageSearch")
+
+def _upload_image_to_imgbb(image: ImageSource) -> str | None:
     """
-    Uploads a local image to imgbb.com to get a public URL.
+    Uploads an image to imgbb.com to get a public URL. Large images are sent as a downscaled JPEG.
 
     Returns:
         The public URL of the image, or None if the upload fails.
     """
     if not IMGBB_API_KEY:
-        print("Error: IMGBB_API_KEY not found.")
+        logger.error("IMGBB_API_KEY not found.")
         return None
 
-    url = "https://api.imgbb.com/1/upload"
+    url = IMGBB_UPLOAD_URL
     try:
-        with open(image_path, "rb") as image_file:
-            payload = {
-                "key": IMGBB_API_KEY,
-            }
-            files = {"image": image_file}
-            response = requests.post(url, params=payload, files=files)
+        payload = {
+            "key": IMGBB_API_KEY,
+        }
+        files = {"image": load_image(image).upload_bytes}
+        with external_call("imgbb") as call:
+            response = requests.post(url, params=payload, files=files, timeout=IMGBB_TIMEOUT_SECONDS)
             response.raise_for_status()
-            
+
             result = response.json()
-            if result.get("success"):
-                # Return the direct URL of the uploaded image
-                return result["data"]["url"]
-            else:
-                print(f"Error uploading to imgbb: {result.get('error', {}).get('message')}")
-                return None
+            if not result.get("success"):
+                call["outcome"] = "error"
+        if result.get("success"):
+            # Return the direct URL of the uploaded image
+            return result["data"]["url"]
+        else:
+            logger.error(f"Error uploading to imgbb: {result.get('error', {}).get('message')}")
+            return None
     except Exception as e:
-        print(f"An exception occurred during image upload: {e}")
+        logger.error(f"An exception occurred during image upload: {e}")
         return None
 
-def find_image_source(image_path: str) -> dict:
+@traced("reverse_image_search")
+def find_image_source(image: ImageSource) -> dict:
     """
     Performs a reverse image search using Google Lens via SerpAPI.
     It first uploads the local image to get a public URL.
@@ -44,26 +51,24 @@ def find_image_source(image_path: str) -> dict:
         return {"error": "SERPAPI_API_KEY not found."}
 
     # Step 1: Upload the image to get a public URL
-    print("Uploading image for temporary URL...")
-    public_image_url = _upload_image_to_imgbb(image_path)
+    logger.info("Uploading image for temporary URL...")
+    public_image_url = _upload_image_to_imgbb(image)
 
     if not public_image_url:
         return {"error": "Failed to upload image to get a public URL."}
     
-    print(f"Image URL: {public_image_url}")
+    logger.info(f"Image URL: {public_image_url}")
 
     # Step 2: Use the public URL for the Google Lens search
     # We can now use the library wrapper as it's designed for URLs.
     params = {
         "engine": "google_lens",
-        "url": public_image_url,
-        "api_key": SERPAPI_API_KEY
+        "url": public_image_url
     }
 
     try:
-        print("Performing reverse image search...")
-        search = GoogleSearch(params)
-        results = search.get_dict()
+        logger.info("Performing reverse image search...")
+        results = run_search(params)
         
         visual_matches = results.get("visual_matches", [])
         